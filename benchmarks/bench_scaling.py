@@ -0,0 +1,206 @@
+"""Scaling benchmarks for every scheduler and the Gantt/table rendering paths.
+
+    python benchmarks/bench_scaling.py -o bench.json
+    python benchmarks/bench_scaling.py --sizes 10 1000 100000 --compare bench.json
+
+Workloads come from scheduler.generate with a fixed seed, so two runs of the
+same tree time identical inputs. Each case reports the best of --repeats runs.
+With --compare, cases that got slower than the baseline by more than
+--threshold are listed and the exit status is 1.
+"""
+import argparse
+import importlib.util
+import json
+import math
+import os
+import platform
+import sys
+import time
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from scheduler import core, smp  # noqa: E402
+from scheduler.generate import DISTRIBUTIONS, generate_workload  # noqa: E402
+
+SIZES = (10, 100, 1000, 10_000, 100_000, 1_000_000)
+
+# below this the timer noise dominates, so --compare ignores the case
+NOISE_FLOOR = 1e-3
+
+
+def load_app_module(filename):
+    """Import one of the GUI scripts by path (one of them has a space in its name)."""
+    spec = importlib.util.spec_from_file_location(os.path.splitext(filename)[0].replace(' ', ''),
+                                                  os.path.join(ROOT, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def engine_cases():
+    cases = {
+        'schedule_fcfs': lambda w: lambda: core.schedule_fcfs(w.tasks, w.burst_times, w.arrival_times),
+        'schedule_sjf': lambda w: lambda: core.schedule_sjf(w.tasks, w.burst_times, w.arrival_times),
+        'run_sjf': lambda w: lambda: core.simulate_shortest_first(w.burst_times, w.arrival_times, preemptive=False),
+        'run_srtf': lambda w: lambda: core.simulate_srtf(w.burst_times, w.arrival_times),
+        'run_fcfs[smp16]': lambda w: lambda: smp.simulate_fcfs_smp(w.burst_times, w.arrival_times, cores=16),
+        'run_srtf[smp16]': lambda w: lambda: smp.simulate_srtf_smp(w.burst_times, w.arrival_times, cores=16),
+        'calculate_waiting_and_turnaround_times':
+            lambda w: lambda: core.calculate_waiting_and_turnaround_times(w.burst_times),
+    }
+    try:
+        import numpy as np
+        from scheduler import vectorized
+    except ImportError:
+        return cases
+
+    def as_arrays(w):
+        return np.asarray(w.burst_times), np.asarray(w.arrival_times)
+
+    def numpy_case(fn):
+        def make(w):
+            bursts, arrivals = as_arrays(w)
+            return lambda: fn(bursts, arrivals)
+        return make
+
+    cases.update({
+        'schedule_fcfs[numpy]': numpy_case(vectorized.fcfs_arrays),
+        'schedule_sjf[numpy]': numpy_case(vectorized.sjf_arrays),
+        'calculate_waiting_and_turnaround_times[numpy]':
+            numpy_case(lambda bursts, arrivals: vectorized.calculate_waiting_and_turnaround_times(bursts)),
+    })
+    return cases
+
+
+def render_cases():
+    """Gantt and table paths of the SJF/SRTF window, or {} when their toolkits are missing."""
+    try:
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        app = load_app_module('sjf_srtf _combine.py')
+    except ImportError:
+        return {}
+
+    def gantt(w):
+        segments = core.simulate_srtf(w.burst_times, w.arrival_times)
+
+        def draw():
+            view = SimpleNamespace(tasks=w.tasks, profile=None)
+            app.SchedulerApp.plot_gantt_chart(view, segments, FigureCanvasAgg(Figure(figsize=(8, 4))))
+        return draw
+
+    cases = {'gantt': gantt}
+
+    try:
+        import tkinter as tk
+        from scheduler.vtable import VirtualTable
+        root = tk.Tk()
+    except Exception:
+        # no display: the Treeview path cannot be timed
+        return cases
+    root.withdraw()
+
+    def table(w):
+        segments = core.simulate_srtf(w.burst_times, w.arrival_times)
+        tree = VirtualTable(root, columns=('Task', 'Burst Time', 'Turnaround Time', 'Waiting Time'))
+        view = SimpleNamespace(tasks=w.tasks, burst_times=w.burst_times)
+
+        def fill():
+            app.SchedulerApp.update_table(view, segments, tree)
+            root.update_idletasks()
+        return fill
+
+    cases['table'] = table
+    return cases
+
+
+def time_call(fn, repeats):
+    best = math.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes, distributions, case_filter, repeats, max_render_jobs, seed):
+    cases = engine_cases()
+    render = render_cases()
+    cases.update(render)
+
+    results = []
+    for distribution in distributions:
+        for n in sizes:
+            workload = generate_workload(n, distribution, seed)
+            for name, make in cases.items():
+                if case_filter and not any(name.startswith(c) for c in case_filter):
+                    continue
+                if name in render and n > max_render_jobs:
+                    continue
+                seconds = time_call(make(workload), repeats)
+                results.append({'case': name, 'distribution': distribution, 'n': n, 'seconds': seconds})
+                print(f"{name:48} {distribution:12} {n:>9} {seconds * 1e3:12.3f} ms", flush=True)
+    return results
+
+
+def metadata(args):
+    meta = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'repeats': args.repeats,
+    }
+    try:
+        import numpy
+        meta['numpy'] = numpy.__version__
+    except ImportError:
+        pass
+    return meta
+
+
+def compare(results, baseline_path, threshold):
+    with open(baseline_path) as f:
+        baseline = {(r['case'], r['distribution'], r['n']): r['seconds'] for r in json.load(f)['results']}
+
+    regressions = []
+    for r in results:
+        old = baseline.get((r['case'], r['distribution'], r['n']))
+        if old is None or max(old, r['seconds']) < NOISE_FLOOR:
+            continue
+        if r['seconds'] > old * (1 + threshold):
+            regressions.append((r, old))
+
+    for r, old in regressions:
+        print(f"REGRESSION {r['case']} {r['distribution']} n={r['n']}: "
+              f"{old * 1e3:.3f} ms -> {r['seconds'] * 1e3:.3f} ms ({r['seconds'] / old:.2f}x)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    parser.add_argument('--distributions', nargs='+', choices=DISTRIBUTIONS, default=DISTRIBUTIONS)
+    parser.add_argument('--cases', nargs='+', help="only run cases whose name starts with one of these")
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--max-render-jobs', type=int, default=100_000,
+                        help="skip Gantt/table cases above this many jobs")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', default='bench_results.json')
+    parser.add_argument('--compare', metavar='BASELINE', help="earlier results file to check for regressions")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="relative slowdown reported as a regression (default 0.25)")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.distributions, args.cases, args.repeats, args.max_render_jobs, args.seed)
+    with open(args.output, 'w') as f:
+        json.dump({'meta': metadata(args), 'results': results}, f, indent=2)
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,27 @@
+"""Headless scheduling core: engines, workloads and batch CLI.
+
+Importing this package never loads tkinter or matplotlib.
+"""
+from .core import (
+    ALGORITHMS,
+    SegmentList,
+    calculate_finish_times,
+    calculate_waiting_and_turnaround_times,
+    run_in_order,
+    schedule_rows,
+    simulate_fcfs,
+    simulate_mlfq,
+    simulate_predicted,
+    simulate_priority,
+    simulate_round_robin,
+    simulate_shortest_first,
+    simulate_sjf,
+    simulate_srtf,
+    summarize,
+    task_metrics,
+    task_times,
+)
+# schedule_fcfs/schedule_sjf go through the shared result cache
+from .cache import ResultCache, run_sjf, run_srtf, schedule_fcfs, schedule_sjf
+from .smp import CoreSegmentList, core_utilization, simulate_smp
+from .workload import Workload, load_workload, parse_ints, parse_names, parse_task_bursts
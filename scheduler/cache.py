@@ -0,0 +1,226 @@
+"""Content-addressed cache of schedules.
+
+A schedule is keyed by a BLAKE2 digest of CACHE_VERSION, the engine name, its
+parameters and the raw bytes of the burst and arrival columns, so the same
+workload hits the cache whichever window, script or backend asks for it. The
+in-memory tier is an LRU bounded by the size of the cached SegmentLists. With
+a directory (passed to configure() or set in $SCHEDULER_CACHE_DIR) schedules
+are also written to disk and survive across sessions.
+
+Cached SegmentLists are shared between callers and must not be modified.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+from array import array
+from collections import OrderedDict
+
+from .core import SegmentList, schedule_rows, simulate_fcfs, simulate_shortest_first, simulate_sjf
+from .smp import CoreSegmentList
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+CACHE_DIR_ENV = 'SCHEDULER_CACHE_DIR'
+
+ITEM_BYTES = array('q').itemsize
+
+# three int64 columns per segment, four for multi-core schedules
+SEGMENT_BYTES = 3 * ITEM_BYTES
+CORE_SEGMENT_BYTES = 4 * ITEM_BYTES
+
+# part of every key; bump it when an engine's output changes so disk entries from older code are missed
+CACHE_VERSION = 1
+
+
+def column_bytes(values):
+    if values is None:
+        return b''
+    if isinstance(values, memoryview) and values.format == 'q':
+        # mapped trace column: hashed in place
+        return values
+    if hasattr(values, 'astype'):
+        # NumPy array: same bytes as the equivalent list
+        return values.astype('int64', copy=False).tobytes()
+    try:
+        return array('q', values).tobytes()
+    except (TypeError, OverflowError):
+        return repr(list(values)).encode()
+
+
+def entry_bytes(segments):
+    return len(segments) * (CORE_SEGMENT_BYTES if isinstance(segments, CoreSegmentList) else SEGMENT_BYTES)
+
+
+def cache_key(engine, burst_times, arrival_times=None, params=None):
+    digest = hashlib.blake2b(digest_size=20)
+    # per-job parameters such as priorities are hashed like the time columns
+    scalars = sorted((k, v) for k, v in (params or {}).items() if isinstance(v, (int, float, str, tuple, type(None))))
+    columns = sorted(k for k, v in (params or {}).items() if not isinstance(v, (int, float, str, tuple, type(None))))
+    digest.update(f"{CACHE_VERSION}\0{engine}\0{scalars!r}\0{columns!r}\0{len(burst_times)}\0".encode())
+    for name in columns:
+        digest.update(column_bytes(params[name]))
+    digest.update(column_bytes(burst_times))
+    # arrival times of None and all zeros are distinct workloads
+    digest.update(b'\0' if arrival_times is None else b'\1')
+    digest.update(column_bytes(arrival_times))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """LRU of SegmentLists bounded by max_bytes, with an optional on-disk tier."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, directory=None):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        with self.lock:
+            segments = self.entries.get(key)
+            if segments is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return segments
+        segments = self.load(key)
+        with self.lock:
+            if segments is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.remember(key, segments)
+        return segments
+
+    def put(self, key, segments):
+        with self.lock:
+            self.remember(key, segments)
+        self.store(key, segments)
+
+    def remember(self, key, segments):
+        size = entry_bytes(segments)
+        if size > self.max_bytes:
+            return
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.nbytes -= entry_bytes(old)
+        self.entries[key] = segments
+        self.nbytes += size
+        while self.nbytes > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.nbytes -= entry_bytes(evicted)
+
+    def clear(self):
+        """Empty the in-memory tier; files on disk are kept."""
+        with self.lock:
+            self.entries.clear()
+            self.nbytes = 0
+
+    def fetch(self, engine, compute, burst_times, arrival_times=None, params=None):
+        """Cached result for (engine, params, workload), calling compute() on a miss."""
+        key = cache_key(engine, burst_times, arrival_times, params)
+        segments = self.get(key)
+        if segments is None:
+            segments = compute()
+            self.put(key, segments)
+        return segments
+
+    def path(self, key, suffix='.seg'):
+        return os.path.join(self.directory, key[:2], key + suffix)
+
+    def load(self, key):
+        # the disk tier is best effort: unreadable or truncated files are misses
+        if not self.directory:
+            return None
+        # multi-core schedules carry a fourth column, the core of each segment
+        for suffix, cls, count in (('.seg', SegmentList, 3), ('.cseg', CoreSegmentList, 4)):
+            try:
+                with open(self.path(key, suffix), 'rb') as f:
+                    data = f.read()
+            except OSError:
+                continue
+            if len(data) % (count * ITEM_BYTES):
+                return None
+            width = len(data) // count
+            columns = [array('q') for _ in range(count)]
+            for i, column in enumerate(columns):
+                column.frombytes(data[i * width:(i + 1) * width])
+            return cls.from_columns(*columns)
+        return None
+
+    def store(self, key, segments):
+        if not self.directory:
+            return
+        columns = [segments.tasks, segments.starts, segments.ends]
+        if isinstance(segments, CoreSegmentList):
+            columns.append(segments.cores)
+            path = self.path(key, '.cseg')
+        else:
+            path = self.path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                for column in columns:
+                    f.write(column.tobytes())
+            # readers never see a partly written file
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+
+default_cache = ResultCache(directory=os.environ.get(CACHE_DIR_ENV) or None)
+
+
+def configure(max_bytes=DEFAULT_MAX_BYTES, directory=None):
+    """Replace the shared cache; max_bytes=0 keeps nothing in memory."""
+    global default_cache
+    default_cache = ResultCache(max_bytes, directory)
+    return default_cache
+
+
+def cached(engine, simulate):
+    """Wrap simulate(burst_times, arrival_times=None, **params) so it goes through the shared cache."""
+    def run(burst_times, arrival_times=None, progress=None, **params):
+        if progress is not None:
+            compute = lambda: simulate(burst_times, arrival_times, progress=progress, **params)
+        else:
+            compute = lambda: simulate(burst_times, arrival_times, **params)
+        return default_cache.fetch(engine, compute, burst_times, arrival_times, params)
+    run.__name__ = f"cached_{engine}"
+    # lets inspect.signature (and so the sweep's parameter filter) see the engine's own parameters
+    run.__wrapped__ = simulate
+    return run
+
+
+def schedule_fcfs(tasks, burst_times, arrival_times=None):
+    segments = default_cache.fetch('fcfs', lambda: simulate_fcfs(burst_times, arrival_times),
+                                   burst_times, arrival_times)
+    return schedule_rows(tasks, burst_times, segments)
+
+
+def schedule_sjf(tasks, burst_times, arrival_times=None):
+    segments = default_cache.fetch('sjf', lambda: simulate_sjf(burst_times, arrival_times),
+                                   burst_times, arrival_times)
+    return schedule_rows(tasks, burst_times, segments)
+
+
+def run_sjf(burst_times, arrival_times=None, progress=None):
+    """Non-preemptive shortest-job-first; progress is only reported on a cache miss."""
+    return default_cache.fetch(
+        'shortest_first', lambda: simulate_shortest_first(burst_times, arrival_times, False, progress),
+        burst_times, arrival_times, {'preemptive': False})
+
+
+def run_srtf(burst_times, arrival_times=None, progress=None):
+    """Shortest-remaining-time-first; progress is only reported on a cache miss."""
+    # same key as cached('srtf', simulate_srtf), which the batch CLI uses
+    return default_cache.fetch(
+        'srtf', lambda: simulate_shortest_first(burst_times, arrival_times, True, progress),
+        burst_times, arrival_times)
@@ -0,0 +1,187 @@
+"""Batch entry point: schedule workload files and write the results.
+
+    python -m scheduler jobs.csv more_jobs.json -a fcfs sjf srtf -o results
+"""
+import argparse
+import csv
+import inspect
+import json
+import os
+import sys
+
+from .cache import cached, configure
+from .core import ALGORITHMS, task_metrics, summarize
+from .profiling import HOOKS, Profile
+from .smp import ALGORITHMS as SMP_ALGORITHMS, CoreSegmentList, core_utilization
+from .workload import load_workload
+
+ENGINES = {**ALGORITHMS, **SMP_ALGORITHMS}
+
+
+def select_engines(backend):
+    """Engine table for a backend; 'auto' uses NumPy for FCFS/SJF when it is installed.
+
+    The predicted SJF/SRTF engines need NumPy for their predictor and are
+    added whenever it is installed, whatever the backend.
+    """
+    try:
+        from . import predict, vectorized
+    except ImportError:
+        if backend == 'numpy':
+            raise
+        return ENGINES
+    if backend == 'python':
+        return {**ENGINES, **predict.ALGORITHMS}
+    return {**ENGINES, **vectorized.ALGORITHMS, **predict.ALGORITHMS}
+
+
+def run_workload(workload, algorithm, engines=ENGINES, profile=None, **params):
+    if algorithm == 'priority' and workload.priorities is not None:
+        params.setdefault('priorities', workload.priorities)
+    if 'processes' in inspect.signature(engines[algorithm]).parameters:
+        # jobs with the same task name are one process's bursts
+        params.setdefault('processes', workload.tasks)
+    if profile is None:
+        profile = Profile(hook=False)
+    with profile.phase(f"schedule/{algorithm}"):
+        segments = engines[algorithm](workload.burst_times, workload.arrival_times, **params)
+    profile.count_schedule(segments, algorithm)
+    with profile.phase(f"metrics/{algorithm}"):
+        metrics = task_metrics(segments, workload.burst_times, workload.arrival_times)
+    return segments, metrics
+
+
+def write_json(path, workload, results, cores=None):
+    out = {}
+    for algorithm, (segments, metrics) in results.items():
+        out[algorithm] = {
+            'summary': summarize(metrics),
+            'segments': [[workload.tasks[i], start, end] for i, start, end in segments],
+            'tasks': [
+                dict(task=task, burst=workload.burst_times[i],
+                     **{column: values[i] for column, values in metrics.items()})
+                for i, task in enumerate(workload.tasks)
+            ],
+        }
+        if isinstance(segments, CoreSegmentList):
+            for row, core in zip(out[algorithm]['segments'], segments.cores):
+                row.append(core)
+            out[algorithm]['utilization'] = core_utilization(segments, cores)
+    with open(path, 'w') as f:
+        json.dump(out, f, indent=2)
+
+
+def write_csv(prefix, workload, results):
+    for algorithm, (segments, metrics) in results.items():
+        with open(f"{prefix}_{algorithm}_schedule.csv", 'w', newline='') as f:
+            writer = csv.writer(f)
+            if isinstance(segments, CoreSegmentList):
+                writer.writerow(['task', 'start', 'end', 'core'])
+                writer.writerows((workload.tasks[i], start, end, core)
+                                 for (i, start, end), core in zip(segments, segments.cores))
+            else:
+                writer.writerow(['task', 'start', 'end'])
+                writer.writerows((workload.tasks[i], start, end) for i, start, end in segments)
+
+        columns = list(metrics)
+        with open(f"{prefix}_{algorithm}_metrics.csv", 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['task', 'burst'] + columns)
+            for i, task in enumerate(workload.tasks):
+                writer.writerow([task, workload.burst_times[i]] + [metrics[c][i] for c in columns])
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m scheduler', description=__doc__.splitlines()[0])
+    parser.add_argument('workloads', nargs='+', help="workload files (.csv with task,arrival,burst columns or .json)")
+    parser.add_argument('-a', '--algorithms', nargs='+', choices=sorted(select_engines('auto')), default=sorted(ALGORITHMS))
+    parser.add_argument('-o', '--output-dir', default='.')
+    parser.add_argument('-f', '--format', choices=('json', 'csv'), default='json')
+    parser.add_argument('--backend', choices=('auto', 'python', 'numpy'), default='auto',
+                        help="engine implementation for FCFS/SJF (default: NumPy if installed)")
+    parser.add_argument('--cache-dir', help="keep schedules in this directory and reuse them on later runs")
+    parser.add_argument('--quantum', type=int, default=4, help="time slice for rr (default: 4)")
+    parser.add_argument('--quanta', type=int, nargs='+', default=[4, 8, 16],
+                        help="time slice of each mlfq level, highest priority first (default: 4 8 16)")
+    parser.add_argument('--boost', type=int, help="move every mlfq job back to the top level this often")
+    parser.add_argument('--aging', type=int, default=0,
+                        help="priority: waiting this long raises a job one level (default: no aging)")
+    parser.add_argument('--cores', type=int, default=2, help="number of cores for the *_smp algorithms (default: 2)")
+    parser.add_argument('--alpha', type=float, default=0.5,
+                        help="psjf/psrtf: weight of the last burst in the exponential average (default: 0.5)")
+    parser.add_argument('--tau0', type=float, help="psjf/psrtf: prediction for a process's first burst "
+                                                   "(default: mean burst)")
+    parser.add_argument('--profile-json', metavar='PATH',
+                        help="write the time spent loading, scheduling and writing each workload to PATH")
+    parser.add_argument('--profile', metavar='HOOK', help=f"also run a profiler ({' or '.join(HOOKS)}[:<ms>]); "
+                                                          "overrides $SCHEDULER_PROFILE")
+    return parser
+
+
+def algorithm_params(args):
+    """Command-line options for the engines that take them."""
+    return {
+        'rr': {'quantum': args.quantum},
+        'mlfq': {'quanta': tuple(args.quanta), 'boost': args.boost},
+        'priority': {'aging': args.aging},
+        **{name: {'cores': args.cores} for name in SMP_ALGORITHMS},
+        **{name: {'alpha': args.alpha, 'tau0': args.tau0} for name in ('psjf', 'psrtf')},
+    }
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.quantum < 1 or min(args.quanta) < 1:
+        parser.error("--quantum and --quanta must be positive")
+    if args.boost is not None and args.boost < 1:
+        parser.error("--boost must be positive")
+    if args.aging < 0:
+        parser.error("--aging must not be negative")
+    if not 0 <= args.alpha <= 1:
+        parser.error("--alpha must be between 0 and 1")
+    if args.cores < 1:
+        parser.error("--cores must be positive")
+    os.makedirs(args.output_dir, exist_ok=True)
+    engines = select_engines(args.backend)
+    if args.cache_dir:
+        # both backends give identical schedules, so cache entries are shared between them
+        configure(directory=args.cache_dir)
+        engines = {name: cached(name, engine) for name, engine in engines.items()}
+
+    status = 0
+    profiles = {}
+    for path in args.workloads:
+        profile = profiles[path] = Profile(args.profile)
+        try:
+            with profile.phase('load'):
+                workload = load_workload(path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"error: {path}: {e}", file=sys.stderr)
+            status = 1
+            continue
+
+        params = algorithm_params(args)
+        results = {algorithm: run_workload(workload, algorithm, engines, profile, **params.get(algorithm, {}))
+                   for algorithm in args.algorithms}
+        prefix = os.path.join(args.output_dir, os.path.splitext(os.path.basename(path))[0])
+        with profile.phase('write'):
+            if args.format == 'json':
+                write_json(prefix + '.json', workload, results, args.cores)
+            else:
+                write_csv(prefix, workload, results)
+        for algorithm, (segments, metrics) in results.items():
+            summary = summarize(metrics)
+            if isinstance(segments, CoreSegmentList):
+                utilization = core_utilization(segments, args.cores)
+                summary['utilization'] = sum(utilization) / len(utilization)
+            print(f"{path} {algorithm}: " + ", ".join(f"{k}={v:g}" for k, v in summary.items()))
+
+    for path, profile in profiles.items():
+        output = profile.finish(os.path.splitext(os.path.basename(path))[0])
+        if output:
+            print(f"profile written to {output}", file=sys.stderr)
+    if args.profile_json:
+        with open(args.profile_json, 'w') as f:
+            json.dump({path: profile.as_dict() for path, profile in profiles.items()}, f, indent=2)
+    return status
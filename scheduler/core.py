@@ -0,0 +1,425 @@
+"""Headless scheduling engines shared by the GUIs and the batch CLI.
+
+Nothing in this module imports tkinter or matplotlib. Every engine takes burst
+times (and optionally arrival times) indexed by task and returns a SegmentList
+of (task_index, start, end) runs.
+"""
+import heapq
+from array import array
+from collections import deque
+
+# engines that take a progress callback call it once per this many events
+PROGRESS_STEPS = 16384
+
+
+class SegmentList:
+    """Run-length-encoded schedule of (task, start, end) segments.
+
+    The three columns live in typed arrays, so a long schedule costs one entry
+    per context switch instead of one tuple per time unit. Appending a segment
+    that continues the previous one for the same task extends it in place.
+    """
+    __slots__ = ('tasks', 'starts', 'ends')
+
+    def __init__(self):
+        self.tasks = array('q')
+        self.starts = array('q')
+        self.ends = array('q')
+
+    @classmethod
+    def from_columns(cls, tasks, starts, ends):
+        """Build from ready-made columns without merging; NumPy int64 arrays are copied as raw bytes."""
+        segments = cls()
+        for column, values in ((segments.tasks, tasks), (segments.starts, starts), (segments.ends, ends)):
+            if hasattr(values, 'tobytes'):
+                column.frombytes(values.tobytes())
+            else:
+                column.extend(values)
+        return segments
+
+    def append(self, task, start, end):
+        if self.tasks and self.tasks[-1] == task and self.ends[-1] == start:
+            self.ends[-1] = end
+        else:
+            self.tasks.append(task)
+            self.starts.append(start)
+            self.ends.append(end)
+
+    def __len__(self):
+        return len(self.tasks)
+
+    def __iter__(self):
+        return zip(self.tasks, self.starts, self.ends)
+
+    def __getitem__(self, i):
+        return self.tasks[i], self.starts[i], self.ends[i]
+
+
+def run_in_order(order, burst_times, arrival_times=None):
+    """Run tasks back to back in the given order, idling until each arrives."""
+    segments = SegmentList()
+    current_time = 0
+    for i in order:
+        if arrival_times is not None and current_time < arrival_times[i]:
+            current_time = arrival_times[i]
+        segments.append(i, current_time, current_time + burst_times[i])
+        current_time += burst_times[i]
+    return segments
+
+
+def simulate_fcfs(burst_times, arrival_times=None):
+    if arrival_times is None:
+        order = range(len(burst_times))
+    else:
+        order = sorted(range(len(burst_times)), key=arrival_times.__getitem__)
+    return run_in_order(order, burst_times, arrival_times)
+
+
+def simulate_sjf(burst_times, arrival_times=None):
+    """Non-preemptive SJF over a job set that is known up front.
+
+    Jobs are ordered on burst time alone and arrival times only insert idle
+    gaps, as in the original SJF window. simulate_shortest_first is the
+    arrival-aware variant.
+    """
+    order = sorted(range(len(burst_times)), key=burst_times.__getitem__)
+    return run_in_order(order, burst_times, arrival_times)
+
+
+def simulate_shortest_first(burst_times, arrival_times=None, preemptive=True, progress=None):
+    """Event-driven SJF/SRTF.
+
+    Returns a SegmentList of (task_index, start, end) runs. Time jumps straight
+    to the next arrival or completion instead of advancing one unit at a time;
+    ties are broken on the task index, so the result matches the old per-tick
+    loop. progress, if given, is called now and then with the fraction of jobs
+    that have arrived.
+    """
+    n = len(burst_times)
+    if arrival_times is None:
+        arrival_times = [0] * n
+    order = sorted(range(n), key=lambda i: (arrival_times[i], i))
+    ready = []
+    runs = SegmentList()
+    current_time = 0
+    next_arrival = 0
+    steps = 0
+
+    while next_arrival < n or ready:
+        steps += 1
+        if progress is not None and steps % PROGRESS_STEPS == 0:
+            progress(next_arrival / n)
+        if not ready:
+            current_time = max(current_time, arrival_times[order[next_arrival]])
+        while next_arrival < n and arrival_times[order[next_arrival]] <= current_time:
+            i = order[next_arrival]
+            heapq.heappush(ready, (burst_times[i], i))
+            next_arrival += 1
+
+        remaining, i = heapq.heappop(ready)
+        run = remaining
+        if preemptive and next_arrival < n:
+            run = min(remaining, arrival_times[order[next_arrival]] - current_time)
+        if run > 0:
+            runs.append(i, current_time, current_time + run)
+        current_time += run
+        if remaining > run:
+            heapq.heappush(ready, (remaining - run, i))
+
+    return runs
+
+
+def simulate_srtf(burst_times, arrival_times=None, progress=None):
+    return simulate_shortest_first(burst_times, arrival_times, preemptive=True, progress=progress)
+
+
+def simulate_predicted(burst_times, arrival_times=None, estimates=None, preemptive=False, progress=None):
+    """SJF/SRTF ordered on estimated instead of actual burst times.
+
+    A job's priority is its estimate minus the time it has run so far (never
+    below 0), but it runs for its actual burst time. Without estimates the
+    burst times are used, which gives simulate_shortest_first's schedule.
+    """
+    if estimates is None:
+        return simulate_shortest_first(burst_times, arrival_times, preemptive, progress)
+    n = len(burst_times)
+    if arrival_times is None:
+        arrival_times = [0] * n
+    order = sorted(range(n), key=lambda i: (arrival_times[i], i))
+    remaining = list(burst_times)
+    ready = []
+    runs = SegmentList()
+    current_time = 0
+    next_arrival = 0
+    steps = 0
+
+    while next_arrival < n or ready:
+        steps += 1
+        if progress is not None and steps % PROGRESS_STEPS == 0:
+            progress(next_arrival / n)
+        if not ready:
+            current_time = max(current_time, arrival_times[order[next_arrival]])
+        while next_arrival < n and arrival_times[order[next_arrival]] <= current_time:
+            i = order[next_arrival]
+            heapq.heappush(ready, (estimates[i], i))
+            next_arrival += 1
+
+        _, i = heapq.heappop(ready)
+        run = remaining[i]
+        if preemptive and next_arrival < n:
+            run = min(run, arrival_times[order[next_arrival]] - current_time)
+        if run > 0:
+            runs.append(i, current_time, current_time + run)
+        current_time += run
+        remaining[i] -= run
+        if remaining[i] > 0:
+            heapq.heappush(ready, (max(estimates[i] - (burst_times[i] - remaining[i]), 0), i))
+
+    return runs
+
+
+def arrival_order(burst_times, arrival_times):
+    n = len(burst_times)
+    if arrival_times is None:
+        return [0] * n, list(range(n))
+    return arrival_times, sorted(range(n), key=lambda i: (arrival_times[i], i))
+
+
+def simulate_round_robin(burst_times, arrival_times=None, quantum=4, progress=None):
+    """Round Robin: each job runs for at most `quantum` before going to the back of the queue.
+
+    Jobs that arrive during a slice are queued ahead of the job it preempts.
+    """
+    if not isinstance(quantum, int) or quantum < 1:
+        raise ValueError(f"quantum must be a positive integer, got {quantum!r}")
+    return simulate_mlfq(burst_times, arrival_times, quanta=(quantum,), progress=progress)
+
+
+def simulate_priority(burst_times, arrival_times=None, priorities=None, aging=0, progress=None):
+    """Preemptive priority scheduling; lower numbers run first, ties go to the lower task index.
+
+    With aging > 0 a waiting job's priority improves continuously, by one
+    level per `aging` time units in the ready queue. All waiting jobs age at
+    the same rate, so their order is fixed by priority * aging + time they
+    started waiting. A job that starts running keeps the aged priority it had
+    at that moment for as long as it runs; only when it is preempted does it
+    go back to its base priority and start aging again from then. The engine
+    only wakes up at arrivals, completions and the moment a waiting job
+    overtakes the running one.
+    """
+    if aging < 0:
+        raise ValueError(f"aging must not be negative, got {aging}")
+    n = len(burst_times)
+    arrival_times, order = arrival_order(burst_times, arrival_times)
+    if priorities is None:
+        priorities = [0] * n
+    # keys and effective priorities are in units of 1 / scale priority levels
+    scale = aging or 1
+    clock = 1 if aging else 0
+    remaining = list(burst_times)
+    ready = []
+    runs = SegmentList()
+    current = None
+    current_time = 0
+    next_arrival = 0
+    steps = 0
+
+    while next_arrival < n or ready or current is not None:
+        steps += 1
+        if progress is not None and steps % PROGRESS_STEPS == 0:
+            progress(next_arrival / n)
+        if current is None and not ready:
+            current_time = max(current_time, arrival_times[order[next_arrival]])
+        while next_arrival < n and arrival_times[order[next_arrival]] <= current_time:
+            i = order[next_arrival]
+            heapq.heappush(ready, (priorities[i] * scale + arrival_times[i] * clock, i))
+            next_arrival += 1
+
+        if current is not None and ready and ready[0][0] - current_time * clock < effective:
+            heapq.heappush(ready, (priorities[current] * scale + current_time * clock, current))
+            current = None
+        if current is None:
+            key, current = heapq.heappop(ready)
+            effective = key - current_time * clock
+
+        stop = current_time + remaining[current]
+        if next_arrival < n:
+            stop = min(stop, arrival_times[order[next_arrival]])
+        if aging and ready:
+            # first time the best waiting job is strictly ahead of the running one
+            stop = min(stop, ready[0][0] - effective + 1)
+        if stop > current_time:
+            runs.append(current, current_time, stop)
+            remaining[current] -= stop - current_time
+            current_time = stop
+        if remaining[current] == 0:
+            current = None
+
+    return runs
+
+
+def simulate_mlfq(burst_times, arrival_times=None, quanta=(4, 8, 16), boost=None, progress=None):
+    """Multi-level feedback queue.
+
+    Level k is a Round Robin queue with quantum quanta[k]; new jobs enter
+    level 0 and a job that has used up its level's quantum, over however many
+    turns, moves down one level (the last level keeps it). A job only runs
+    when every higher level is empty and is preempted as soon as a job
+    arrives at level 0. With boost, every job goes back to level 0 each
+    `boost` time units.
+    """
+    if not quanta or not all(isinstance(q, int) and q > 0 for q in quanta):
+        raise ValueError(f"quanta must be positive integers, got {quanta!r}")
+    if boost is not None and (not isinstance(boost, int) or boost < 1):
+        raise ValueError(f"boost must be a positive integer, got {boost!r}")
+    n = len(burst_times)
+    arrival_times, order = arrival_order(burst_times, arrival_times)
+    levels = [deque() for _ in quanta]
+    level = [0] * n
+    used = [0] * n
+    remaining = list(burst_times)
+    runs = SegmentList()
+    current = None
+    current_time = 0
+    next_arrival = 0
+    next_boost = boost
+    waiting = 0
+    steps = 0
+
+    while next_arrival < n or current is not None or waiting:
+        steps += 1
+        if progress is not None and steps % PROGRESS_STEPS == 0:
+            progress(next_arrival / n)
+        if current is None and not waiting:
+            current_time = max(current_time, arrival_times[order[next_arrival]])
+        while next_arrival < n and arrival_times[order[next_arrival]] <= current_time:
+            levels[0].append(order[next_arrival])
+            next_arrival += 1
+            waiting += 1
+        if next_boost is not None and current_time >= next_boost:
+            next_boost += boost * ((current_time - next_boost) // boost + 1)
+            for queue in levels[1:]:
+                levels[0].extend(queue)
+                queue.clear()
+            for i in levels[0]:
+                level[i] = used[i] = 0
+            if current is not None:
+                level[current] = used[current] = 0
+
+        top = 0
+        while waiting and not levels[top]:
+            top += 1
+        if current is not None and waiting and top < level[current]:
+            levels[level[current]].append(current)
+            waiting += 1
+            current = None
+        if current is None:
+            current = levels[top].popleft()
+            waiting -= 1
+
+        k = level[current]
+        stop = current_time + min(remaining[current], quanta[k] - used[current])
+        if next_arrival < n and k > 0:
+            stop = min(stop, arrival_times[order[next_arrival]])
+        if next_boost is not None:
+            stop = min(stop, max(next_boost, current_time + 1))
+        if stop > current_time:
+            runs.append(current, current_time, stop)
+            remaining[current] -= stop - current_time
+            used[current] += stop - current_time
+            current_time = stop
+        if remaining[current] == 0:
+            current = None
+        elif used[current] >= quanta[k]:
+            # arrivals during the slice queue ahead of the job it preempts
+            while next_arrival < n and arrival_times[order[next_arrival]] <= current_time:
+                levels[0].append(order[next_arrival])
+                next_arrival += 1
+                waiting += 1
+            used[current] = 0
+            level[current] = min(k + 1, len(quanta) - 1)
+            levels[level[current]].append(current)
+            waiting += 1
+            current = None
+
+    return runs
+
+
+ALGORITHMS = {
+    'fcfs': simulate_fcfs,
+    'sjf': simulate_sjf,
+    'srtf': simulate_srtf,
+    'rr': simulate_round_robin,
+    'priority': simulate_priority,
+    'mlfq': simulate_mlfq,
+}
+
+
+def schedule_rows(tasks, burst_times, segments):
+    return [(tasks[i], burst_times[i], start, end) for i, start, end in segments]
+
+
+def schedule_fcfs(tasks, burst_times, arrival_times=None):
+    return schedule_rows(tasks, burst_times, simulate_fcfs(burst_times, arrival_times))
+
+
+def schedule_sjf(tasks, burst_times, arrival_times=None):
+    return schedule_rows(tasks, burst_times, simulate_sjf(burst_times, arrival_times))
+
+
+def calculate_finish_times(durations):
+    finish_times = [0]
+    for duration in durations:
+        finish_times.append(finish_times[-1] + duration)
+    return finish_times[1:]
+
+
+def calculate_waiting_and_turnaround_times(durations):
+    if not durations:
+        return [], []
+    waiting_times = [0]
+    turnaround_times = [durations[0]]
+    for i in range(1, len(durations)):
+        waiting_times.append(turnaround_times[i - 1])
+        turnaround_times.append(waiting_times[i] + durations[i])
+    return waiting_times, turnaround_times
+
+
+def task_times(segments, n):
+    """First start and finish time of each of the n tasks in a schedule."""
+    first_starts = [None] * n
+    finish_times = [None] * n
+    for i, start, end in segments:
+        if first_starts[i] is None:
+            first_starts[i] = start
+        finish_times[i] = end
+    return first_starts, finish_times
+
+
+def task_metrics(segments, burst_times, arrival_times=None):
+    """Per-task start, finish, waiting, response and turnaround columns."""
+    n = len(burst_times)
+    if arrival_times is None:
+        arrival_times = [0] * n
+    first_starts, finish_times = task_times(segments, n)
+    turnaround_times = [finish_times[i] - arrival_times[i] for i in range(n)]
+    return {
+        'start': first_starts,
+        'finish': finish_times,
+        'waiting': [turnaround_times[i] - burst_times[i] for i in range(n)],
+        'response': [first_starts[i] - arrival_times[i] for i in range(n)],
+        'turnaround': turnaround_times,
+    }
+
+
+def summarize(metrics):
+    n = len(metrics['finish'])
+    if n == 0:
+        return {'jobs': 0}
+    return {
+        'jobs': n,
+        'makespan': max(metrics['finish']),
+        'mean_waiting': sum(metrics['waiting']) / n,
+        'mean_response': sum(metrics['response']) / n,
+        'mean_turnaround': sum(metrics['turnaround']) / n,
+    }
@@ -0,0 +1,207 @@
+"""Headless Gantt and metrics export: render charts to PNG/SVG/PDF on a process pool.
+
+    python -m scheduler.export jobs.csv --generated pareto:100000 --seeds 20 \\
+        -a fcfs sjf srtf_smp -p cores=8 -f png pdf -o charts
+
+For every workload and algorithm this writes <workload>_<algorithm>_gantt.<fmt>,
+and for every workload a <workload>_metrics.<fmt> table with one row per
+algorithm. Workloads are given as files or gen:<distribution>:<jobs>:<seed>
+specs as in scheduler.sweep, and each worker schedules its own workload, so
+only file names and summary rows cross process boundaries.
+
+Rendering uses matplotlib's Agg canvas directly, so no display or Tk root is
+needed. Each worker creates its two figures once and clears them between
+charts, and the Gantt bars go through the decimating GanttRenderer, so the
+size of a chart (and of an SVG or PDF) is bounded by its pixel size rather
+than by the length of the timeline.
+
+Unlike the rest of the package this module needs matplotlib and NumPy.
+"""
+import argparse
+import inspect
+import os
+import sys
+from multiprocessing import Pool
+
+from .cli import run_workload, select_engines
+from .core import summarize
+from .generate import DISTRIBUTIONS
+from .smp import CoreSegmentList, core_utilization
+from .sweep import check_params, parse_value, resolve_workload
+
+FORMATS = ('png', 'svg', 'pdf')
+
+FIGSIZE = (12, 5)
+DPI = 100
+
+# height of a metrics table row in inches
+TABLE_ROW_HEIGHT = 0.3
+
+_engines = None
+_figures = None
+
+
+def spec_name(spec):
+    """File name stem for a workload spec."""
+    if spec.startswith(('gen:', 'hist:')):
+        return spec.replace(':', '_')
+    return os.path.splitext(os.path.basename(spec))[0]
+
+
+def init_worker(backend, figsize=FIGSIZE, dpi=DPI):
+    """Select the engines and create the figures this worker reuses for every chart."""
+    global _engines, _figures
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    _engines = select_engines(backend)
+    _figures = {}
+    for kind in ('gantt', 'table'):
+        figure = Figure(figsize=figsize, dpi=dpi)
+        FigureCanvasAgg(figure)
+        figure.add_subplot(111)
+        _figures[kind] = figure
+
+
+def save(figure, prefix, formats):
+    paths = []
+    for fmt in formats:
+        paths.append(f"{prefix}.{fmt}")
+        # dpi='figure' keeps the resolution the Gantt bars were decimated for
+        figure.savefig(paths[-1], format=fmt, dpi='figure')
+    return paths
+
+
+def render_gantt(job):
+    """Schedule one workload with one algorithm and save its Gantt chart; returns a result row."""
+    from .gantt import plot_gantt
+
+    spec, algorithm, params, output_dir, formats = job
+    result = {'workload': spec, 'algorithm': algorithm}
+    try:
+        workload = resolve_workload(spec)
+        accepted = inspect.signature(_engines[algorithm]).parameters
+        params = check_params(_engines[algorithm], params)
+        segments, metrics = run_workload(workload, algorithm, _engines, **params)
+    except (OSError, ValueError, KeyError) as e:
+        return dict(result, error=str(e))
+
+    summary = summarize(metrics)
+    cores = None
+    if isinstance(segments, CoreSegmentList):
+        cores = segments.cores
+        utilization = core_utilization(segments, params.get('cores', accepted['cores'].default))
+        summary['utilization'] = sum(utilization) / len(utilization)
+    del metrics
+
+    figure = _figures['gantt']
+    ax = figure.axes[0]
+    ax.clear()
+    renderer = plot_gantt(ax, workload.tasks, segments, f"{spec_name(spec)} {algorithm}", cores=cores)
+    prefix = os.path.join(output_dir, f"{spec_name(spec)}_{algorithm}_gantt")
+    result['files'] = save(figure, prefix, formats)
+    # drop the bars before the next chart instead of keeping them until it replaces them
+    renderer.disconnect()
+    ax.clear()
+    result['summary'] = summary
+    return result
+
+
+def render_table(job):
+    """Save the metrics table of one workload, one row per algorithm; returns the files written."""
+    spec, rows, output_dir, formats = job
+    columns = list(dict.fromkeys(column for _, summary in rows for column in summary))
+
+    figure = _figures['table']
+    figure.set_size_inches(figure.get_figwidth(), TABLE_ROW_HEIGHT * (len(rows) + 3))
+    ax = figure.axes[0]
+    ax.clear()
+    ax.axis('off')
+    ax.set_title(spec_name(spec))
+    cells = [[f"{summary[c]:g}" if c in summary else '' for c in columns] for _, summary in rows]
+    ax.table(cellText=cells, rowLabels=[algorithm for algorithm, _ in rows], colLabels=columns, loc='center')
+    paths = save(figure, os.path.join(output_dir, f"{spec_name(spec)}_metrics"), formats)
+    ax.clear()
+    return paths
+
+
+def export(specs, algorithms, params, output_dir, formats=('png',), processes=None, backend='auto',
+           figsize=FIGSIZE, dpi=DPI, progress=None):
+    """Render every chart and table; returns the result rows of the Gantt charts."""
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = [(spec, algorithm, params, output_dir, tuple(formats)) for spec in specs for algorithm in algorithms]
+    total = len(jobs) + len(specs)
+    results = []
+    summaries = {spec: [] for spec in specs}
+
+    with Pool(processes, initializer=init_worker, initargs=(backend, figsize, dpi)) as pool:
+        # a workload's charts go to the same worker so its workload cache hits
+        for result in pool.imap_unordered(render_gantt, jobs, chunksize=max(1, len(algorithms))):
+            results.append(result)
+            if 'error' not in result:
+                summaries[result['workload']].append((result['algorithm'], result['summary']))
+            if progress:
+                progress(len(results), total)
+
+        tables = [(spec, sorted(rows, key=lambda row: algorithms.index(row[0])), output_dir, tuple(formats))
+                  for spec, rows in summaries.items() if rows]
+        for done, _ in enumerate(pool.imap_unordered(render_table, tables), len(results) + 1):
+            if progress:
+                progress(done, total)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m scheduler.export', description=__doc__.splitlines()[0])
+    parser.add_argument('workloads', nargs='*', help="workload files or gen:<distribution>:<jobs>:<seed> specs")
+    parser.add_argument('--generated', nargs='+', default=[], metavar='DIST:JOBS',
+                        help=f"generated workloads, one per seed ({', '.join(DISTRIBUTIONS)})")
+    parser.add_argument('--seeds', type=int, default=1, help="number of seeds per --generated entry")
+    parser.add_argument('-a', '--algorithms', nargs='+', default=['fcfs', 'sjf', 'srtf'])
+    parser.add_argument('-p', '--param', action='append', metavar='NAME=VALUE',
+                        help="engine parameter, passed to the engines that take it; repeat for several")
+    parser.add_argument('-f', '--formats', nargs='+', choices=FORMATS, default=['png'])
+    parser.add_argument('-o', '--output-dir', default='.')
+    parser.add_argument('-j', '--processes', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--backend', choices=('auto', 'python', 'numpy'), default='auto')
+    parser.add_argument('--size', type=float, nargs=2, default=FIGSIZE, metavar=('WIDTH', 'HEIGHT'),
+                        help=f"chart size in inches (default: {FIGSIZE[0]} {FIGSIZE[1]})")
+    parser.add_argument('--dpi', type=int, default=DPI)
+    args = parser.parse_args(argv)
+
+    specs = list(args.workloads)
+    for entry in args.generated:
+        distribution, jobs = entry.split(':')
+        specs.extend(f"gen:{distribution}:{jobs}:{seed}" for seed in range(args.seeds))
+    if not specs:
+        parser.error("no workloads given")
+    engines = select_engines(args.backend)
+    unknown = set(args.algorithms) - set(engines)
+    if unknown:
+        parser.error(f"unknown algorithms: {', '.join(sorted(unknown))}")
+    params = {}
+    for arg in args.param or ():
+        name, _, value = arg.partition('=')
+        params[name] = parse_value(value)
+    for algorithm in args.algorithms:
+        try:
+            check_params(engines[algorithm], params)
+        except ValueError as e:
+            parser.error(f"{algorithm}: {e}")
+
+    def progress(finished, total):
+        print(f"\r{finished}/{total}", end='', file=sys.stderr, flush=True)
+
+    results = export(specs, args.algorithms, params, args.output_dir, args.formats, args.processes,
+                     args.backend, tuple(args.size), args.dpi, progress)
+    print(file=sys.stderr)
+
+    errors = [r for r in results if 'error' in r]
+    for r in errors:
+        print(f"error: {r['workload']} {r['algorithm']}: {r['error']}", file=sys.stderr)
+    print(f"{sum(len(r['files']) for r in results if 'files' in r)} charts written to {args.output_dir}")
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
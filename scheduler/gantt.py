@@ -0,0 +1,204 @@
+"""Batched Gantt rendering with level-of-detail decimation.
+
+Every timeline is drawn as a single PolyCollection instead of one barh call
+per bar. Each task keeps the same colour across runs and windows (it is picked
+from the task name), and whenever the view changes the bars are rebuilt for the
+visible window only: bars closer together than one pixel on the same row are
+merged, and when there are more rows than vertical pixels neighbouring rows
+share a lane. The number of polygons is therefore bounded by the size of the
+axes, not by the length of the schedule.
+
+Unlike the rest of the package this module needs matplotlib and NumPy.
+"""
+import math
+import zlib
+
+import matplotlib
+import numpy as np
+from matplotlib.collections import PolyCollection
+from matplotlib.ticker import FuncFormatter, MaxNLocator
+
+from .vectorized import segment_columns
+
+PALETTE = np.array(matplotlib.colormaps['tab20'].colors)
+
+BAR_HEIGHT = 0.8
+
+# up to this many rows every task name gets a tick label
+MAX_ROW_LABELS = 40
+
+
+def task_color(name):
+    return tuple(PALETTE[zlib.crc32(str(name).encode()) % len(PALETTE)])
+
+
+def row_colors(names):
+    return np.array([task_color(name) for name in names]).reshape(-1, 3)
+
+
+class GanttRenderer:
+    """Decimating Gantt chart of a SegmentList.
+
+    By default there is one row per task name. With row_per_segment=True every
+    segment gets its own row in schedule order, which suits the non-preemptive
+    schedules and lets patch() replace a range of rows after an incremental
+    re-schedule. Given the core column of a multi-core schedule, there is one
+    lane per core instead and each bar takes its task's colour.
+    """
+
+    def __init__(self, ax, tasks, segments, title='Gantt Chart', row_per_segment=False, cores=None, profile=None):
+        self.ax = ax
+        # a scheduler.profiling.Profile that counts the patches drawn, if given
+        self.profile = profile
+        self.row_per_segment = row_per_segment and cores is None
+        seg_tasks, starts, ends = segment_columns(segments)
+        # bars are coloured by row, except on core lanes where they are coloured by task
+        colour_keys = None
+
+        if cores is not None:
+            rows = np.frombuffer(cores, dtype=np.int64) if not hasattr(cores, 'dtype') else np.asarray(cores)
+            self.row_names = [f"CPU {core}" for core in range(int(rows.max()) + 1 if len(rows) else 0)]
+            order = np.lexsort((starts, rows))
+            self.rows = rows[order]
+            self.starts = starts[order]
+            self.ends = ends[order]
+            colour_keys = seg_tasks[order]
+        elif row_per_segment:
+            self.row_names = np.asarray(tasks, dtype=object)[seg_tasks]
+            self.rows = np.arange(len(seg_tasks))
+            self.starts = starts.copy()
+            self.ends = ends.copy()
+        else:
+            # one row per task name, in order of first appearance in the schedule
+            first = np.unique(seg_tasks, return_index=True)
+            row_of_name = {}
+            task_rows = np.zeros(len(tasks), dtype=np.int64)
+            for task in first[0][np.argsort(first[1], kind='stable')]:
+                task_rows[task] = row_of_name.setdefault(tasks[task], len(row_of_name))
+            self.row_names = list(row_of_name)
+
+            rows = task_rows[seg_tasks]
+            order = np.lexsort((starts, rows))
+            self.rows = rows[order]
+            self.starts = starts[order]
+            self.ends = ends[order]
+        if colour_keys is None:
+            self.row_colors = row_colors(self.row_names)
+            self.colour_keys = self.rows
+        else:
+            self.row_colors = row_colors(tasks)
+            self.colour_keys = colour_keys
+
+        self.collection = PolyCollection(np.empty((0, 4, 2)), linewidths=0)
+        ax.add_collection(self.collection)
+        if len(self.starts):
+            ax.set_xlim(self.starts.min(), max(self.ends.max(), self.starts.min() + 1))
+        ax.set_ylim(-0.5, max(len(self.row_names), 1) - 0.5)
+        if len(self.row_names) <= MAX_ROW_LABELS:
+            ax.set_yticks(range(len(self.row_names)), list(self.row_names))
+        else:
+            ax.yaxis.set_major_locator(MaxNLocator(integer=True))
+            ax.yaxis.set_major_formatter(FuncFormatter(self.row_label))
+        ax.set_xlabel('Time')
+        ax.set_title(title)
+
+        ax.callbacks.connect('xlim_changed', self.on_view_changed)
+        ax.callbacks.connect('ylim_changed', self.on_view_changed)
+        self.resize_cid = None
+        if ax.figure.canvas is not None:
+            self.resize_cid = ax.figure.canvas.mpl_connect('resize_event', self.on_view_changed)
+        self.refresh()
+
+    def disconnect(self):
+        """Stop following resizes of the figure, so a reused figure does not keep the renderer alive."""
+        if self.resize_cid is not None:
+            self.ax.figure.canvas.mpl_disconnect(self.resize_cid)
+            self.resize_cid = None
+
+    def patch(self, first, starts, ends, names=None):
+        """Replace the bars of rows first, first + 1, ... and redraw only what is visible.
+
+        Only for renderers built with row_per_segment=True. The x range grows
+        with the schedule when the whole timeline was in view.
+        """
+        if not self.row_per_segment:
+            raise ValueError("patch() needs a renderer built with row_per_segment=True")
+        stop = first + len(starts)
+        x0, x1 = self.ax.get_xlim()
+        showing_all = len(self.ends) and x1 >= self.ends.max()
+
+        self.starts[first:stop] = starts
+        self.ends[first:stop] = ends
+        if names is not None:
+            self.row_names[first:stop] = names
+            self.row_colors[first:stop] = row_colors(names)
+            if len(self.row_names) <= MAX_ROW_LABELS:
+                self.ax.set_yticks(range(len(self.row_names)), list(self.row_names))
+
+        if showing_all and self.ends.max() != x1:
+            # set_xlim triggers a refresh through the xlim_changed callback
+            self.ax.set_xlim(x0, max(self.ends.max(), x0 + 1))
+        else:
+            self.refresh()
+
+    def row_label(self, value, pos=None):
+        row = int(round(value))
+        return self.row_names[row] if 0 <= row < len(self.row_names) else ''
+
+    def on_view_changed(self, *args):
+        self.refresh()
+
+    def visible_bars(self):
+        """Merged bars for the current view as (rows, starts, ends, colour_keys, rows_per_lane)."""
+        x0, x1 = sorted(self.ax.get_xlim())
+        y0, y1 = sorted(self.ax.get_ylim())
+        bbox = self.ax.get_window_extent()
+        time_per_px = (x1 - x0) / max(bbox.width, 1)
+        rows_per_lane = max(1, math.ceil((y1 - y0) / max(bbox.height, 1)))
+
+        visible = ((self.ends >= x0) & (self.starts <= x1)
+                   & (self.rows >= math.floor(y0)) & (self.rows <= math.ceil(y1)))
+        rows = self.rows[visible]
+        starts = self.starts[visible]
+        ends = self.ends[visible]
+        keys = self.colour_keys[visible]
+        if not len(rows):
+            return rows, starts, ends, keys, rows_per_lane
+
+        lanes = rows // rows_per_lane
+        if rows_per_lane > 1:
+            order = np.lexsort((starts, lanes))
+            lanes, starts, ends, keys = lanes[order], starts[order], ends[order], keys[order]
+
+        # running end of each lane: offsetting every lane past the previous one
+        # lets a single cumulative max restart at lane boundaries
+        base = starts.min()
+        span = ends.max() - base + 1
+        running_end = np.maximum.accumulate(lanes * span + (ends - base)) - lanes * span + base
+
+        # a bar opens a new group unless it starts within a pixel of its lane's running end
+        new_group = np.ones(len(lanes), dtype=bool)
+        new_group[1:] = (lanes[1:] != lanes[:-1]) | (starts[1:] - running_end[:-1] >= time_per_px)
+        begins = np.flatnonzero(new_group)
+        return (lanes[begins] * rows_per_lane, starts[begins], np.maximum.reduceat(ends, begins),
+                keys[begins], rows_per_lane)
+
+    def refresh(self):
+        lane_rows, starts, ends, colour_keys, rows_per_lane = self.visible_bars()
+        bottom = lane_rows - BAR_HEIGHT / 2
+        top = lane_rows + (rows_per_lane - 1) + BAR_HEIGHT / 2
+
+        verts = np.empty((len(starts), 4, 2))
+        verts[:, 0, 0] = verts[:, 1, 0] = starts
+        verts[:, 2, 0] = verts[:, 3, 0] = ends
+        verts[:, 0, 1] = verts[:, 3, 1] = bottom
+        verts[:, 1, 1] = verts[:, 2, 1] = top
+        self.collection.set_verts(verts)
+        self.collection.set_facecolor(self.row_colors[colour_keys])
+        if self.profile is not None:
+            self.profile.count('patches drawn', len(starts))
+
+
+def plot_gantt(ax, tasks, segments, title='Gantt Chart', row_per_segment=False, cores=None, profile=None):
+    """Draw a schedule on ax and keep it decimated as the view changes."""
+    return GanttRenderer(ax, tasks, segments, title, row_per_segment, cores, profile)
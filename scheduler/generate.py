@@ -0,0 +1,126 @@
+"""Seeded synthetic workload generator.
+
+    python -m scheduler.generate 100000 -d pareto --seed 7 -o jobs.csv
+    python -m scheduler.generate 100000 --processes 200 -d pareto -o histories.csv
+
+Arrivals follow a Poisson process scaled so the offered load is `load` (busy
+fraction of one CPU); the distribution picks the burst shape, and 'bursty'
+packs arrivals into clusters separated by long idle gaps. With --processes the
+jobs are successive CPU bursts of that many processes, for burst prediction.
+"""
+import argparse
+import itertools
+import random
+
+from .workload import Workload, save_workload
+
+DISTRIBUTIONS = ('uniform', 'exponential', 'pareto', 'bursty')
+
+PARETO_SHAPE = 1.5
+
+
+def burst_sampler(rng, distribution, mean_burst):
+    if distribution == 'uniform':
+        return lambda: rng.randint(1, 2 * mean_burst - 1)
+    if distribution == 'pareto':
+        # paretovariate(a) has mean a / (a - 1); rescale to mean_burst
+        scale = mean_burst * (PARETO_SHAPE - 1) / PARETO_SHAPE
+        return lambda: max(1, round(scale * rng.paretovariate(PARETO_SHAPE)))
+    if distribution in ('exponential', 'bursty'):
+        return lambda: max(1, round(rng.expovariate(1 / mean_burst)))
+    raise ValueError(f"unknown distribution '{distribution}', expected one of {', '.join(DISTRIBUTIONS)}")
+
+
+def generate_workload(n, distribution='uniform', seed=0, mean_burst=10, load=0.9, cluster_size=50):
+    rng = random.Random(seed)
+    next_burst = burst_sampler(rng, distribution, mean_burst)
+    burst_times = [next_burst() for _ in range(n)]
+
+    mean_gap = mean_burst / load
+    arrival_times = []
+    current_time = 0.0
+    for i in range(n):
+        if distribution == 'bursty':
+            # whole clusters arrive at once; the gap before each keeps the same average load
+            if i % cluster_size == 0:
+                current_time += rng.expovariate(1 / (mean_gap * cluster_size))
+        else:
+            current_time += rng.expovariate(1 / mean_gap)
+        arrival_times.append(int(current_time))
+
+    tasks = [f"T{i + 1}" for i in range(n)]
+    return Workload(tasks, burst_times, arrival_times)
+
+
+def generate_histories(n, processes=100, distribution='exponential', seed=0, mean_burst=10, load=0.9,
+                       phase_change=0.1):
+    """Workload of n CPU bursts from a fixed set of processes, each with its own burst history.
+
+    The bursts of one process share its task name (P1, P2, ...). Each process
+    has a current mean burst drawn from the distribution and switches to a new
+    one with probability phase_change after every burst, so its recent bursts
+    say something about its next one; single bursts are exponential around the
+    mean. Arrivals are a Poisson process at the given load, each going to a
+    process picked at random.
+    """
+    rng = random.Random(seed)
+    next_mean = burst_sampler(rng, distribution, mean_burst)
+    means = [next_mean() for _ in range(processes)]
+
+    tasks = []
+    burst_times = []
+    arrival_times = []
+    mean_gap = mean_burst / load
+    current_time = 0.0
+    for _ in range(n):
+        current_time += rng.expovariate(1 / mean_gap)
+        process = rng.randrange(processes)
+        if rng.random() < phase_change:
+            means[process] = next_mean()
+        tasks.append(f"P{process + 1}")
+        burst_times.append(max(1, round(rng.expovariate(1 / means[process]))))
+        arrival_times.append(int(current_time))
+    return Workload(tasks, burst_times, arrival_times)
+
+
+def generate_jobs(distribution='uniform', seed=0, mean_burst=10, load=0.9, cluster_size=50):
+    """Endless (task, arrival, burst) stream with the same shape as generate_workload.
+
+    Bursts and gaps are drawn job by job, so the sequence differs from
+    generate_workload for the same seed.
+    """
+    rng = random.Random(seed)
+    next_burst = burst_sampler(rng, distribution, mean_burst)
+    mean_gap = mean_burst / load
+    current_time = 0.0
+    for i in itertools.count():
+        if distribution == 'bursty':
+            if i % cluster_size == 0:
+                current_time += rng.expovariate(1 / (mean_gap * cluster_size))
+        else:
+            current_time += rng.expovariate(1 / mean_gap)
+        yield f"T{i + 1}", int(current_time), next_burst()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m scheduler.generate', description=__doc__.splitlines()[0])
+    parser.add_argument('jobs', type=int)
+    parser.add_argument('-d', '--distribution', choices=DISTRIBUTIONS, default='uniform')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--mean-burst', type=int, default=10)
+    parser.add_argument('--load', type=float, default=0.9)
+    parser.add_argument('--processes', type=int,
+                        help="spread the jobs over this many processes with burst histories (see generate_histories)")
+    parser.add_argument('-o', '--output', required=True, help="output .csv or .json file")
+    args = parser.parse_args(argv)
+
+    if args.processes:
+        workload = generate_histories(args.jobs, args.processes, args.distribution, args.seed, args.mean_burst,
+                                      args.load)
+    else:
+        workload = generate_workload(args.jobs, args.distribution, args.seed, args.mean_burst, args.load)
+    save_workload(workload, args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,413 @@
+"""Tolerant, chunked import of large SWF and CSV traces.
+
+    python -m scheduler.importer trace.swf -o trace.trace
+
+SWF is the Standard Workload Format of the Parallel Workloads Archive: ';'
+header comments followed by one job per line with 18 whitespace-separated
+fields, -1 meaning unknown. A job maps onto the schedulers as
+
+    task      job number (field 1)
+    arrival   submit time (field 2)
+    burst     run time (field 4)
+    priority  queue number (field 15)
+
+Jobs with an unknown or zero run time (cancelled before they ran) are skipped
+and counted. CSV traces are plain comma-separated lines (no quoting) under a
+task,arrival,burst[,priority] header, as written by scheduler.workload; rows
+with a burst below 1 or a negative arrival are skipped and counted the same
+way.
+
+Files are read in blocks of whole lines, so memory stays proportional to the
+block size plus the int64 result columns. With NumPy each SWF block is
+tokenized and its four used fields converted to integers with array
+operations. Malformed lines are reported and dropped instead of aborting the
+import.
+"""
+import argparse
+import sys
+from array import array
+
+from .trace import ColumnarWorkload
+from .workload import save_workload
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+CHUNK_BYTES = 1 << 22
+
+# malformed lines after this many are counted but not kept
+MAX_REPORTED = 20
+
+SWF_FIELDS = 18
+SWF_JOB, SWF_SUBMIT, SWF_RUN, SWF_QUEUE = 0, 1, 3, 14
+
+COMMA_TO_SPACE = bytes.maketrans(b',', b' ')
+
+# longest integer that always fits in an int64
+MAX_DIGITS = 18
+
+
+class ImportReport:
+    """Counts of an import, plus the first MAX_REPORTED malformed lines as (line, reason)."""
+
+    def __init__(self, path=''):
+        self.path = path
+        self.jobs = 0
+        self.skipped = 0
+        self.malformed = 0
+        self.errors = []
+
+    def error(self, line, reason):
+        self.malformed += 1
+        if len(self.errors) < MAX_REPORTED:
+            self.errors.append((line, reason))
+
+    def print(self, file=sys.stderr):
+        for line, reason in self.errors:
+            print(f"{self.path}:{line}: {reason}", file=file)
+        if self.malformed > len(self.errors):
+            print(f"{self.path}: ... {self.malformed - len(self.errors)} more malformed lines", file=file)
+        if self.malformed or self.skipped:
+            print(f"{self.path}: imported {self.jobs} jobs, skipped {self.skipped} with no run time or a negative arrival, "
+                  f"dropped {self.malformed} malformed lines", file=file)
+
+
+def read_chunks(f, chunk_bytes=CHUNK_BYTES):
+    """Yield (first_line_number, data) blocks of whole lines from a binary file."""
+    line = 1
+    rest = b''
+    while True:
+        block = f.read(chunk_bytes)
+        if not block:
+            if rest:
+                yield line, rest
+            return
+        block = rest + block
+        cut = block.rfind(b'\n') + 1
+        if not cut:
+            rest = block
+            continue
+        rest = block[cut:]
+        yield line, block[:cut]
+        line += block.count(b'\n', 0, cut)
+
+
+def swf_int(field):
+    # the same integers parse_fields accepts: an optional minus sign and at most MAX_DIGITS digits
+    digits = field[1:] if field.startswith(b'-') else field
+    if not digits.isdigit() or len(digits) > MAX_DIGITS:
+        raise ValueError("job number, submit time, run time and queue must be integers")
+    return int(field)
+
+
+def swf_job(fields):
+    """(job, submit, run, queue) from the split fields of one SWF line; ValueError if unusable."""
+    if len(fields) != SWF_FIELDS:
+        raise ValueError(f"expected {SWF_FIELDS} fields, got {len(fields)}")
+    return tuple(swf_int(fields[i]) for i in (SWF_JOB, SWF_SUBMIT, SWF_RUN, SWF_QUEUE))
+
+
+def parse_swf_lines(data, first_line, report):
+    """Per-line SWF parser: returns (jobs, arrivals, bursts, queues) int64 arrays."""
+    columns = tuple(array('q') for _ in range(4))
+    for number, line in enumerate(data.split(b'\n'), first_line):
+        fields = line.split()
+        if not fields or fields[0].startswith(b';'):
+            continue
+        try:
+            job = swf_job(fields)
+        except ValueError as e:
+            report.error(number, str(e))
+            continue
+        if job[2] <= 0 or job[1] < 0:
+            report.skipped += 1
+            continue
+        for column, value in zip(columns, job):
+            column.append(value)
+    report.jobs += len(columns[0])
+    return columns
+
+
+def parse_fields(b, starts):
+    """Integers in the tokens starting at byte offsets `starts`, and a flag for non-integers.
+
+    The tokens are folded with Horner's rule one character position at a
+    time until every token has ended, so the work is proportional to the
+    number of tokens times the longest token, not to the size of the block.
+    b must end in whitespace.
+    """
+    negative = b[starts] == 45
+    values = np.zeros(len(starts), dtype=np.int64)
+    bad = np.zeros(len(starts), dtype=bool)
+    active = np.ones(len(starts), dtype=bool)
+    digit_count = np.zeros(len(starts), dtype=np.int64)
+    for k in range(MAX_DIGITS + 2):
+        chars = b[starts + k]
+        active &= chars > 32
+        if not active.any():
+            break
+        digits = chars - 48
+        is_digit = active & (digits <= 9)
+        stray = active & ~is_digit
+        if k == 0:
+            stray &= ~negative
+        bad |= stray
+        digit_count += is_digit
+        values = np.where(is_digit, values * 10 + digits, values)
+    # too long for an int64 (more than MAX_DIGITS digits may have wrapped), or a lone minus sign
+    bad |= active | (digit_count > MAX_DIGITS) | (negative & (b[starts + 1] <= 32))
+    return np.where(negative, -values, values), bad
+
+
+def split_tokens(data):
+    """Tokens of whitespace-separated data: (bytes, non-space mask, token starts, first token and token count per line)."""
+    b = np.frombuffer(data, dtype=np.uint8)
+    text = b > 32
+    token_start = np.empty_like(text)
+    token_start[0] = text[0]
+    np.greater(text[1:], text[:-1], out=token_start[1:])
+    starts = np.flatnonzero(token_start)
+    tokens_before = np.searchsorted(starts, np.flatnonzero(b == 10))
+    per_line = np.diff(tokens_before, prepend=0)
+    return b, text, starts, tokens_before - per_line, per_line
+
+
+def parse_swf_chunk(data, first_line, report):
+    """Vectorized SWF parser with the same results and error reports as parse_swf_lines."""
+    # header comments only appear at the top of the file
+    while data.startswith(b';'):
+        data = data[data.find(b'\n') + 1 or len(data):]
+        first_line += 1
+    if np is None or b';' in data:
+        return parse_swf_lines(data, first_line, report)
+    # trailing newlines end the last line and stop parse_fields from reading past the data
+    data += b'\n' * (MAX_DIGITS + 2)
+
+    b, text, starts, first_token, per_line = split_tokens(data)
+    line = np.flatnonzero(per_line)
+    first_token = first_token[line]
+    complete = per_line[line] == SWF_FIELDS
+    # one field at a time, so each stops at its own longest value
+    first_token = first_token[complete]
+    values = np.empty((len(first_token), 4), dtype=np.int64)
+    integers = np.ones(len(first_token), dtype=bool)
+    for i, field in enumerate((SWF_JOB, SWF_SUBMIT, SWF_RUN, SWF_QUEUE)):
+        values[:, i], bad = parse_fields(b, starts[first_token + field])
+        integers &= ~bad
+
+    if not complete.all() or not integers.all():
+        # report in line order, as parse_swf_lines does
+        reasons = np.zeros(len(line), dtype=np.int8)
+        reasons[~complete] = 1
+        reasons[np.flatnonzero(complete)[~integers]] = 2
+        for i in np.flatnonzero(reasons):
+            if reasons[i] == 1:
+                report.error(int(first_line + line[i]), f"expected {SWF_FIELDS} fields, got {per_line[line[i]]}")
+            else:
+                report.error(int(first_line + line[i]), "job number, submit time, run time and queue must be integers")
+        values = values[integers]
+
+    jobs, submits, runs, queues = values.T
+    keep = (runs > 0) & (submits >= 0)
+    report.skipped += len(keep) - int(keep.sum())
+    report.jobs += int(keep.sum())
+    return jobs[keep], submits[keep], runs[keep], queues[keep]
+
+
+def csv_int(field):
+    # int() takes any length, but the columns are int64; parse_fields draws the same line
+    value = int(field)
+    if len(field.strip().lstrip(b'+-')) > MAX_DIGITS:
+        raise ValueError(f"integers must have at most {MAX_DIGITS} digits")
+    return value
+
+
+def parse_csv_lines(data, first_line, report, columns):
+    """Per-line CSV parser given the header's (task, arrival, burst, priority) column positions."""
+    task_col, arrival_col, burst_col, priority_col = columns
+    width = max(c for c in columns if c is not None) + 1
+    tasks, arrivals, bursts, priorities = [], array('q'), array('q'), array('q')
+    for number, line in enumerate(data.split(b'\n'), first_line):
+        line = line.rstrip(b'\r')
+        if not line:
+            continue
+        fields = line.split(b',')
+        try:
+            if len(fields) < width:
+                raise ValueError(f"expected at least {width} fields, got {len(fields)}")
+            burst = csv_int(fields[burst_col])
+            arrival = csv_int(fields[arrival_col]) if arrival_col is not None else 0
+            priority = csv_int(fields[priority_col]) if priority_col is not None else 0
+            # a name that is not UTF-8 raises UnicodeDecodeError, a ValueError
+            task = fields[task_col].strip().decode() if task_col is not None else f"T{report.jobs + len(tasks) + 1}"
+        except ValueError as e:
+            report.error(number, str(e))
+            continue
+        if burst <= 0 or arrival < 0:
+            report.skipped += 1
+            continue
+        tasks.append(task)
+        arrivals.append(arrival)
+        bursts.append(burst)
+        priorities.append(priority)
+    report.jobs += len(tasks)
+    return tasks, arrivals, bursts, priorities
+
+
+def parse_csv_chunk(data, first_line, report, columns, width):
+    """Vectorized CSV parser for blocks where every line has `width` plain fields.
+
+    Anything else (quotes, empty or extra fields, non-integer times) sends the
+    block to parse_csv_lines, which reports the offending lines.
+    """
+    if np is None or b'"' in data:
+        return parse_csv_lines(data, first_line, report, columns)
+    fields = data.translate(COMMA_TO_SPACE) + b'\n' * (MAX_DIGITS + 2)
+    b, text, starts, first_token, per_line = split_tokens(fields)
+    first_token = first_token[per_line != 0]
+    if (per_line[per_line != 0] != width).any():
+        return parse_csv_lines(data, first_line, report, columns)
+
+    task_col, *numeric = columns
+    values = []
+    for col in numeric:
+        if col is None:
+            values.append(np.zeros(len(first_token), dtype=np.int64))
+            continue
+        column, bad = parse_fields(b, starts[first_token + col])
+        if bad.any():
+            return parse_csv_lines(data, first_line, report, columns)
+        values.append(column)
+
+    if task_col is None:
+        tasks = [f"T{report.jobs + i + 1}" for i in range(len(first_token))]
+    else:
+        ends = np.flatnonzero(text[:-1] > text[1:]) + 1
+        token = first_token + task_col
+        # byte offsets are character offsets in ASCII, so slice one decoded string
+        names = fields.decode('ascii') if fields.isascii() else fields
+        tasks = [names[start:end] for start, end in zip(starts[token].tolist(), ends[token].tolist())]
+        if names is fields:
+            try:
+                tasks = [str(name, 'utf-8') for name in tasks]
+            except UnicodeDecodeError:
+                return parse_csv_lines(data, first_line, report, columns)
+
+    arrivals, bursts, priorities = values
+    keep = (bursts > 0) & (arrivals >= 0)
+    if not keep.all():
+        report.skipped += len(keep) - int(keep.sum())
+        tasks = [task for task, kept in zip(tasks, keep.tolist()) if kept]
+        arrivals, bursts, priorities = arrivals[keep], bursts[keep], priorities[keep]
+    report.jobs += len(tasks)
+    return tasks, arrivals, bursts, priorities
+
+
+def csv_columns(header):
+    """Positions of the task, arrival, burst and priority columns, and the number of columns."""
+    names = [name.strip().decode() for name in header.rstrip(b'\r\n').split(b',')]
+    if 'burst' not in names:
+        raise ValueError("expected a header with at least a 'burst' column")
+    return tuple(names.index(name) if name in names else None for name in ('task', 'arrival', 'burst', 'priority')), len(names)
+
+
+def iter_chunks(path, report=None, chunk_bytes=CHUNK_BYTES):
+    """Yield (tasks, arrivals, bursts, priorities) column chunks of an SWF or CSV trace.
+
+    SWF chunks carry job numbers as tasks. Malformed lines go to report.
+    """
+    if report is None:
+        report = ImportReport(path)
+    swf = path.lower().endswith('.swf')
+    with open(path, 'rb') as f:
+        if swf:
+            for first_line, data in read_chunks(f, chunk_bytes):
+                yield parse_swf_chunk(data, first_line, report)
+            return
+        columns, width = csv_columns(f.readline())
+        for first_line, data in read_chunks(f, chunk_bytes):
+            yield parse_csv_chunk(data, first_line + 1, report, columns, width)
+
+
+def iter_jobs(path, report=None):
+    """(task, arrival, burst) triples of a trace, for scheduler.stream."""
+    for tasks, arrivals, bursts, _ in iter_chunks(path, report):
+        yield from zip(map(str, tasks), arrivals.tolist(), bursts.tolist())
+
+
+def extend(column, values):
+    if hasattr(values, 'dtype'):
+        # NumPy chunk: append the raw int64 bytes
+        column.frombytes(values.astype(np.int64, copy=False).tobytes())
+    else:
+        column.extend(values)
+
+
+class JobNumbers:
+    """Name table of an SWF import: the job number of each row, as text."""
+
+    def __init__(self, numbers):
+        self.numbers = numbers
+
+    def __len__(self):
+        return len(self.numbers)
+
+    def __getitem__(self, i):
+        return str(self.numbers[i])
+
+    def __iter__(self):
+        return map(str, self.numbers)
+
+
+def import_trace(path, report=None, chunk_bytes=CHUNK_BYTES):
+    """Read a whole SWF or CSV trace into a ColumnarWorkload."""
+    columns = [array('q') for _ in range(4)]
+    index = {}
+    ids = array('q')
+    swf = path.lower().endswith('.swf')
+    for chunk in iter_chunks(path, report, chunk_bytes):
+        if swf:
+            extend(columns[0], chunk[0])
+        else:
+            ids.fromlist([index.setdefault(task, len(index)) for task in chunk[0]])
+        for column, values in zip(columns[1:], chunk[1:]):
+            extend(column, values)
+    if swf:
+        ids = array('q', range(len(columns[0])))
+        names = JobNumbers(columns[0])
+    else:
+        names = list(index)
+    return ColumnarWorkload(ids, names, columns[2], columns[1], columns[3])
+
+
+def load_swf(path):
+    """load_workload entry for .swf files; malformed lines are reported on stderr."""
+    report = ImportReport(path)
+    workload = import_trace(path, report)
+    report.print()
+    return workload
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m scheduler.importer', description=__doc__.splitlines()[0])
+    parser.add_argument('trace', help=".swf or .csv trace")
+    parser.add_argument('-o', '--output', help="write the jobs as .trace, .csv or .json")
+    args = parser.parse_args(argv)
+
+    report = ImportReport(args.trace)
+    try:
+        workload = import_trace(args.trace, report)
+    except (OSError, ValueError) as e:
+        print(f"error: {args.trace}: {e}", file=sys.stderr)
+        return 1
+    report.print()
+    if args.output:
+        save_workload(workload, args.output)
+    print(f"{args.trace}: {report.jobs} jobs")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
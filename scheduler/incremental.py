@@ -0,0 +1,159 @@
+"""Incremental re-scheduling of FCFS and SJF after a single job changes.
+
+Both policies run jobs back to back in a sorted order, so editing one job only
+moves that job within the order (a delete and a re-insert found by binary
+search) and shifts the start and finish times from the first affected position
+onward. Everything before that position is kept from the previous result. The
+suffix is recomputed with the same cumulative-sum / running-max formulation as
+scheduler.vectorized, so patched and fresh schedules are identical.
+"""
+import numpy as np
+
+from .core import SegmentList
+from .vectorized import fcfs_order, run_in_order, sjf_order
+
+POLICIES = ('fcfs', 'sjf')
+
+
+class IncrementalSchedule:
+    def __init__(self, burst_times, arrival_times=None, policy='sjf'):
+        if policy not in POLICIES:
+            raise ValueError(f"incremental scheduling supports {', '.join(POLICIES)}, not '{policy}'")
+        self.policy = policy
+        self.bursts = np.array(burst_times, dtype=np.int64)
+        self.arrivals = None if arrival_times is None else np.array(arrival_times, dtype=np.int64)
+
+        order_of = sjf_order if policy == 'sjf' else fcfs_order
+        self.order = np.asarray(order_of(self.bursts, self.arrivals), dtype=np.int64)
+        keys = self.sort_keys()
+        # sort keys in schedule order; None when the order is just the input order
+        self.sorted_keys = None if keys is None else keys[self.order]
+        self.position = np.empty_like(self.order)
+        self.position[self.order] = np.arange(len(self.order))
+
+        self.starts, self.finishes = run_in_order(self.order, self.bursts, self.arrivals)
+
+    def __len__(self):
+        return len(self.bursts)
+
+    def sort_keys(self):
+        if self.policy == 'sjf':
+            return self.bursts
+        return self.arrivals
+
+    def copy(self):
+        other = object.__new__(type(self))
+        other.policy = self.policy
+        for name in ('bursts', 'arrivals', 'order', 'sorted_keys', 'position', 'starts', 'finishes'):
+            value = getattr(self, name)
+            setattr(other, name, None if value is None else value.copy())
+        return other
+
+    def update(self, task, burst_time=None, arrival_time=None):
+        """Change one job and patch the schedule.
+
+        Returns the slice of schedule positions whose job or times changed;
+        order, starts and finishes outside it are untouched.
+        """
+        if burst_time is not None:
+            self.bursts[task] = burst_time
+        if arrival_time is not None:
+            if self.arrivals is None:
+                raise ValueError("this schedule has no arrival times")
+            self.arrivals[task] = arrival_time
+
+        old_pos = int(self.position[task])
+        first = last = old_pos
+        keys = self.sort_keys()
+        if keys is not None:
+            key = keys[task]
+            # The arrays are still sorted with the job's stale key at old_pos, so a
+            # binary search on (key, task) finds its slot; ties keep input order,
+            # as in the stable sort that built the schedule.
+            lo = np.searchsorted(self.sorted_keys, key, 'left')
+            hi = np.searchsorted(self.sorted_keys, key, 'right')
+            new_pos = int(lo + np.searchsorted(self.order[lo:hi], task))
+            if new_pos > old_pos:
+                new_pos -= 1
+            self.move(old_pos, new_pos, task, key)
+            first, last = min(old_pos, new_pos), max(old_pos, new_pos)
+
+        # the moved window is rescheduled; after it every job shifts by the same amount
+        # unless an arrival gap absorbs the shift, so only then is the tail recomputed
+        start_time = self.finishes[first - 1] if first > 0 else 0
+        starts, finishes = run_in_order(self.order[first:last + 1], self.bursts, self.arrivals, start_time)
+        shift = finishes[-1] - self.finishes[last]
+        self.starts[first:last + 1] = starts
+        self.finishes[first:last + 1] = finishes
+
+        stop = last + 1
+        if shift and stop < len(self.order):
+            if self.arrivals is None:
+                self.starts[stop:] += shift
+                self.finishes[stop:] += shift
+                stop = len(self.order)
+            else:
+                starts, finishes = run_in_order(self.order[stop:], self.bursts, self.arrivals, finishes[-1])
+                moved = np.flatnonzero(finishes != self.finishes[stop:])
+                self.starts[stop:] = starts
+                self.finishes[stop:] = finishes
+                if len(moved):
+                    stop += int(moved[-1]) + 1
+        return slice(first, stop)
+
+    def move(self, old_pos, new_pos, task, key):
+        """Shift the jobs between old_pos and new_pos by one slot and put task at new_pos."""
+        if new_pos > old_pos:
+            window = slice(old_pos, new_pos + 1)
+            self.order[old_pos:new_pos] = self.order[old_pos + 1:new_pos + 1]
+            self.sorted_keys[old_pos:new_pos] = self.sorted_keys[old_pos + 1:new_pos + 1]
+        elif new_pos < old_pos:
+            window = slice(new_pos, old_pos + 1)
+            self.order[new_pos + 1:old_pos + 1] = self.order[new_pos:old_pos].copy()
+            self.sorted_keys[new_pos + 1:old_pos + 1] = self.sorted_keys[new_pos:old_pos].copy()
+        else:
+            window = slice(old_pos, old_pos + 1)
+        self.order[new_pos] = task
+        self.sorted_keys[new_pos] = key
+        self.position[self.order[window]] = np.arange(window.start, window.stop)
+
+    def task_times(self):
+        """Per-task start and finish arrays (a scatter, so O(N) per call)."""
+        task_starts = np.empty_like(self.starts)
+        task_starts[self.order] = self.starts
+        return task_starts, task_starts + self.bursts
+
+    def segments(self):
+        return SegmentList.from_columns(self.order, self.starts, self.finishes)
+
+
+# above this many edited jobs a fresh schedule is cheaper than patching
+MAX_EDITS = 64
+
+
+def reschedule(previous, burst_times, arrival_times=None, policy='sjf'):
+    """Schedule a workload, patching `previous` when only a few jobs changed.
+
+    Returns (schedule, changed). changed is the slice of schedule positions to
+    redraw, or None when the schedule had to be built from scratch. previous
+    itself is never modified, so it is safe to call from a worker thread.
+    """
+    bursts = np.asarray(burst_times, dtype=np.int64)
+    arrivals = None if arrival_times is None else np.asarray(arrival_times, dtype=np.int64)
+    if (previous is None or previous.policy != policy or len(previous) != len(bursts)
+            or (arrivals is None) != (previous.arrivals is None)):
+        return IncrementalSchedule(bursts, arrivals, policy), None
+
+    edited = bursts != previous.bursts
+    if arrivals is not None:
+        edited |= arrivals != previous.arrivals
+    edited = np.flatnonzero(edited)
+    if len(edited) > MAX_EDITS:
+        return IncrementalSchedule(bursts, arrivals, policy), None
+
+    schedule = previous.copy()
+    first, stop = len(schedule), 0
+    for task in edited:
+        changed = schedule.update(task, bursts[task], None if arrivals is None else arrivals[task])
+        first, stop = min(first, changed.start), max(stop, changed.stop)
+    return schedule, slice(first, max(first, stop))
@@ -0,0 +1,128 @@
+"""One window that opens the scheduler GUIs, importing each only when it is picked.
+
+    python -m scheduler.launcher
+    python -m scheduler.launcher compare
+    python -m scheduler.launcher --list
+    python -m scheduler.launcher --cold-start
+
+The GUI scripts in the repository root are loaded by path the first time they
+are opened, and each one imports matplotlib only when it draws its first chart
+(see scheduler.tkcanvas), so the launcher window appears without paying for
+either. --cold-start imports the launcher and every app in a fresh interpreter
+and reports the time taken and whether matplotlib got loaded on the way.
+
+Unlike the rest of the package this module needs tkinter to open a window;
+--list and --cold-start work without a display.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# name: (script in the repository root, application class, description)
+APPS = {
+    'sjf': ('sjf.py', 'SJFApp', "SJF with arrival times"),
+    'gantt': ('srtf.py', 'GanttChartApp', "Gantt chart with waiting and turnaround table"),
+    'fcfs-sjf': ('sjf_fcfs_combine.py', 'SchedulerApp', "FCFS and SJF side by side"),
+    'compare': ('sjf_srtf _combine.py', 'SchedulerApp', "Compare two algorithms on one workload"),
+}
+
+# run in a fresh interpreter by --cold-start; prints the import time and whether matplotlib was loaded
+COLD_START = """\
+import json, sys, time
+start = time.perf_counter()
+from scheduler.launcher import load_app
+if {name!r}:
+    load_app({name!r})
+print(json.dumps({{'seconds': time.perf_counter() - start, 'matplotlib': 'matplotlib' in sys.modules}}))
+"""
+
+
+def load_app(name):
+    """Import the script of app `name` (once) and return its application class."""
+    filename, class_name, _ = APPS[name]
+    module_name = 'scheduler_app_' + name.replace('-', '_')
+    module = sys.modules.get(module_name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(module_name, os.path.join(ROOT, filename))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        sys.modules[module_name] = module
+    return getattr(module, class_name)
+
+
+def cold_start(name=None):
+    """Import time (in-process and whole interpreter) of the launcher plus app `name` in a fresh process."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get('PYTHONPATH')])))
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, '-c', COLD_START.format(name=name or '')], env=env,
+                         capture_output=True, text=True, check=True).stdout
+    wall = time.perf_counter() - start
+    return dict(json.loads(out), wall=wall)
+
+
+class Launcher:
+    def __init__(self, root):
+        import tkinter as tk
+        from tkinter import ttk
+
+        self.root = root
+        self.root.title("Schedulers")
+        self.apps = []
+
+        self.main_frame = ttk.Frame(self.root, padding="10")
+        self.main_frame.grid(column=0, row=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+        for row, (name, (_, _, description)) in enumerate(APPS.items()):
+            ttk.Button(self.main_frame, text=name, width=12,
+                       command=lambda name=name: self.open(name)).grid(column=0, row=row, pady=2, padx=5)
+            ttk.Label(self.main_frame, text=description).grid(column=1, row=row, pady=2, padx=5, sticky=tk.W)
+
+    def open(self, name):
+        import tkinter as tk
+
+        window = tk.Toplevel(self.root)
+        self.apps.append(load_app(name)(window))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m scheduler.launcher', description=__doc__.splitlines()[0])
+    parser.add_argument('app', nargs='?', choices=list(APPS), help="open this app directly")
+    parser.add_argument('--list', action='store_true', help="list the apps and exit")
+    parser.add_argument('--cold-start', action='store_true',
+                        help="time importing the launcher and each app in a fresh interpreter")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        targets = {name: f"{filename}:{class_name}" for name, (filename, class_name, _) in APPS.items()}
+        width = max(map(len, targets))
+        target_width = max(map(len, targets.values()))
+        for name, (_, _, description) in APPS.items():
+            print(f"{name:<{width}}  {targets[name]:<{target_width}}  {description}")
+        return 0
+
+    if args.cold_start:
+        for name in [None] + ([args.app] if args.app else list(APPS)):
+            result = cold_start(name)
+            print(f"{name or 'launcher':<10} import {result['seconds'] * 1000:7.1f} ms  "
+                  f"process {result['wall'] * 1000:7.1f} ms  matplotlib {'loaded' if result['matplotlib'] else 'not loaded'}")
+        return 0
+
+    import tkinter as tk
+
+    root = tk.Tk()
+    if args.app:
+        app = load_app(args.app)(root)
+    else:
+        app = Launcher(root)
+    root.mainloop()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,226 @@
+"""Distributions of per-job metrics: tail percentiles, bounded slowdown, utilization and throughput.
+
+    python -m scheduler.metrics jobs.csv --generated pareto:100000 -a fcfs sjf srtf rr
+    python -m scheduler.metrics jobs.csv -a srtf srtf_smp -p cores=4 --plot-dir plots --log
+
+task_arrays turns a schedule into NumPy columns of waiting, response and
+turnaround time and bounded slowdown, max(1, turnaround / max(burst, tau)),
+which keeps very short jobs from dominating the mean. describe_schedule
+reduces them to mean, p50, p95, p99 and max (nearest-rank, as in
+scheduler.sweep) plus CPU utilization and throughput over the span from the
+first arrival to the last completion. plot_comparison draws the histogram and
+CDF of each metric with one line per algorithm, on shared bins.
+
+Unlike the rest of the package this module needs NumPy; the plotting
+functions also need matplotlib, which they import when called.
+"""
+import argparse
+import inspect
+import os
+import sys
+
+import numpy as np
+
+from .cli import run_workload, select_engines
+from .generate import DISTRIBUTIONS
+from .sweep import QUANTILES, parse_value, print_table, resolve_workload
+from .vectorized import segment_columns, task_times
+
+METRICS = ('waiting', 'response', 'turnaround', 'slowdown')
+
+STATS = ('mean',) + tuple(f"p{round(q * 100)}" for q in QUANTILES) + ('max',)
+
+# jobs shorter than this count as this long in the bounded slowdown
+SLOWDOWN_THRESHOLD = 10
+
+# points per CDF line; the curve is sampled at evenly spaced quantiles
+CDF_POINTS = 1000
+
+
+def task_arrays(segments, burst_times, arrival_times=None, tau=SLOWDOWN_THRESHOLD):
+    """Per-task start, finish, waiting, response, turnaround and bounded slowdown columns."""
+    bursts = np.asarray(burst_times, dtype=np.int64)
+    arrivals = np.zeros_like(bursts) if arrival_times is None else np.asarray(arrival_times, dtype=np.int64)
+    first_starts, finishes = task_times(segments, len(bursts))
+    turnaround = finishes - arrivals
+    return {
+        'start': first_starts,
+        'finish': finishes,
+        'waiting': turnaround - bursts,
+        'response': first_starts - arrivals,
+        'turnaround': turnaround,
+        'slowdown': np.maximum(1.0, turnaround / np.maximum(bursts, tau)),
+    }
+
+
+def describe(values):
+    """Mean, nearest-rank p50/p95/p99 and max of an array."""
+    values = np.asarray(values)
+    n = len(values)
+    if not n:
+        return dict.fromkeys(STATS, 0)
+    ranks = np.minimum(n - 1, (np.array(QUANTILES) * n).astype(np.int64))
+    # a partial sort around the ranks is enough, and linear in n
+    percentiles = np.partition(values, ranks)[ranks]
+    return dict(zip(STATS, [values.mean(), *percentiles, values.max()]))
+
+
+def describe_schedule(segments, burst_times, arrival_times=None, cores=1, tau=SLOWDOWN_THRESHOLD):
+    """Distribution of every metric in METRICS plus jobs, makespan, utilization and throughput."""
+    arrays = task_arrays(segments, burst_times, arrival_times, tau)
+    n = len(arrays['finish'])
+    if not n:
+        return {'jobs': 0}
+    _, starts, ends = segment_columns(segments)
+    first_arrival = 0 if arrival_times is None else min(arrival_times)
+    span = max(int(arrays['finish'].max()) - first_arrival, 1)
+    out = {
+        'jobs': n,
+        'makespan': int(arrays['finish'].max()),
+        'utilization': int((ends - starts).sum()) / (cores * span),
+        'throughput': n / span,
+    }
+    for metric in METRICS:
+        out[metric] = {stat: float(value) for stat, value in describe(arrays[metric]).items()}
+    return out
+
+
+def format_summary(summary, metrics=('waiting', 'turnaround')):
+    """One line for a status bar or label."""
+    if not summary.get('jobs'):
+        return ''
+    parts = [f"{metric} mean {s['mean']:.4g} p95 {s['p95']:.4g} p99 {s['p99']:.4g} max {s['max']:.4g}"
+             for metric, s in ((metric, summary[metric]) for metric in metrics)]
+    parts.append(f"utilization {summary['utilization']:.0%}")
+    parts.append(f"throughput {summary['throughput']:.4g}/tick")
+    return '  |  '.join(parts)
+
+
+def bin_edges(columns, bins=50, log=False):
+    """Bin edges shared by every algorithm, so the histograms line up."""
+    values = np.concatenate([np.asarray(c, dtype=float) for c in columns])
+    if log:
+        # log bins start at the smallest positive value; zeros fall in the first bin
+        low = values[values > 0].min(initial=1.0)
+        high = max(values.max(), low * 10)
+        edges = np.geomspace(low, high, bins + 1)
+        edges[0] = min(edges[0], values.min())
+        return edges
+    return np.histogram_bin_edges(values, bins)
+
+
+def plot_histograms(ax, arrays, metric='waiting', bins=50, log=False):
+    """Histogram of one metric per algorithm; arrays maps algorithm name to task_arrays()."""
+    edges = bin_edges([a[metric] for a in arrays.values()], bins, log)
+    for name, a in arrays.items():
+        counts, _ = np.histogram(a[metric], edges)
+        ax.stairs(counts / max(len(a[metric]), 1), edges, label=name)
+    if log:
+        ax.set_xscale('symlog' if edges[0] <= 0 else 'log')
+    ax.set_xlabel(metric)
+    ax.set_ylabel('fraction of jobs')
+    ax.legend()
+
+
+def plot_cdfs(ax, arrays, metric='waiting', log=False):
+    """Empirical CDF of one metric per algorithm, sampled at CDF_POINTS quantiles."""
+    levels = np.linspace(0, 1, CDF_POINTS)
+    for name, a in arrays.items():
+        if len(a[metric]):
+            ax.plot(np.quantile(a[metric], levels, method='inverted_cdf'), levels, drawstyle='steps-post', label=name)
+    if log:
+        ax.set_xscale('symlog')
+    ax.set_xlabel(metric)
+    ax.set_ylabel('fraction of jobs')
+    ax.legend()
+
+
+def plot_comparison(figure, arrays, metrics=METRICS, bins=50, log=False):
+    """Histogram and CDF of each metric, one row per metric, algorithms overlaid."""
+    figure.clear()
+    axes = figure.subplots(len(metrics), 2, squeeze=False)
+    for (hist_ax, cdf_ax), metric in zip(axes, metrics):
+        plot_histograms(hist_ax, arrays, metric, bins, log)
+        plot_cdfs(cdf_ax, arrays, metric, log)
+    return axes
+
+
+def main(argv=None):
+    from .export import spec_name
+
+    parser = argparse.ArgumentParser(prog='python -m scheduler.metrics', description=__doc__.splitlines()[0])
+    parser.add_argument('workloads', nargs='*', help="workload files or gen:<distribution>:<jobs>:<seed> specs")
+    parser.add_argument('--generated', nargs='+', default=[], metavar='DIST:JOBS',
+                        help=f"generated workloads, one per seed ({', '.join(DISTRIBUTIONS)})")
+    parser.add_argument('--seeds', type=int, default=1, help="number of seeds per --generated entry")
+    parser.add_argument('-a', '--algorithms', nargs='+', default=['fcfs', 'sjf', 'srtf'])
+    parser.add_argument('-p', '--param', action='append', metavar='NAME=VALUE',
+                        help="engine parameter, passed to the engines that take it; repeat for several")
+    parser.add_argument('--backend', choices=('auto', 'python', 'numpy'), default='auto')
+    parser.add_argument('--tau', type=int, default=SLOWDOWN_THRESHOLD,
+                        help=f"bounded slowdown threshold (default: {SLOWDOWN_THRESHOLD})")
+    parser.add_argument('--plot-dir', help="write <workload>_distributions.<fmt> comparison plots here")
+    parser.add_argument('-f', '--format', choices=('png', 'svg', 'pdf'), default='png')
+    parser.add_argument('--bins', type=int, default=50)
+    parser.add_argument('--log', action='store_true', help="logarithmic bins and x axes")
+    args = parser.parse_args(argv)
+
+    specs = list(args.workloads)
+    for entry in args.generated:
+        distribution, jobs = entry.split(':')
+        specs.extend(f"gen:{distribution}:{jobs}:{seed}" for seed in range(args.seeds))
+    if not specs:
+        parser.error("no workloads given")
+    engines = select_engines(args.backend)
+    unknown = set(args.algorithms) - set(engines)
+    if unknown:
+        parser.error(f"unknown algorithms: {', '.join(sorted(unknown))}")
+    params = {}
+    for arg in args.param or ():
+        name, _, value = arg.partition('=')
+        params[name] = parse_value(value)
+
+    status = 0
+    for spec in specs:
+        try:
+            workload = resolve_workload(spec)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"error: {spec}: {e}", file=sys.stderr)
+            status = 1
+            continue
+        rows = []
+        arrays = {}
+        for algorithm in args.algorithms:
+            accepted = inspect.signature(engines[algorithm]).parameters
+            engine_params = {k: v for k, v in params.items() if k in accepted}
+            segments, _ = run_workload(workload, algorithm, engines, **engine_params)
+            cores = engine_params.get('cores', accepted['cores'].default) if 'cores' in accepted else 1
+            summary = describe_schedule(segments, workload.burst_times, workload.arrival_times, cores, args.tau)
+            arrays[algorithm] = task_arrays(segments, workload.burst_times, workload.arrival_times, args.tau)
+            row = {'algorithm': algorithm}
+            for key, value in summary.items():
+                if isinstance(value, dict):
+                    row.update({f"{key}_{stat}": v for stat, v in value.items()})
+                else:
+                    row[key] = value
+            rows.append(row)
+        print(spec)
+        print_table(rows)
+
+        if args.plot_dir:
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            from matplotlib.figure import Figure
+
+            os.makedirs(args.plot_dir, exist_ok=True)
+            figure = Figure(figsize=(12, 3 * len(METRICS)), layout='constrained')
+            FigureCanvasAgg(figure)
+            plot_comparison(figure, arrays, bins=args.bins, log=args.log)
+            figure.suptitle(spec_name(spec))
+            path = os.path.join(args.plot_dir, f"{spec_name(spec)}_distributions.{args.format}")
+            figure.savefig(path, format=args.format)
+            print(f"plot written to {path}")
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""Predictive SJF/SRTF: order jobs on burst times estimated from each process's history.
+
+    python -m scheduler.predict hist:exponential:100000:0:200 --alphas 0 0.25 0.5 0.75 1
+    python -m scheduler.sweep hist:pareto:100000:0:200 -a psjf psrtf -p alpha=0.2,0.5,0.8
+
+A real scheduler does not know a burst before it runs. Jobs with the same task
+name are taken to be successive CPU bursts of one process (see
+generate_histories), in arrival order, and each is predicted by exponential
+averaging over the earlier ones:
+
+    tau(n + 1) = alpha * t(n) + (1 - alpha) * tau(n)
+
+with tau(0) = tau0 (default: the mean burst of the workload). The recurrence
+runs once per history position, vectorized over every process that has a
+burst at that position and over several alphas at once. This assumes a
+process's earlier bursts have run by the time its next one arrives, as they
+must for a process that alternates CPU and I/O bursts.
+
+psjf and psrtf schedule on the predictions (core.simulate_predicted) and run
+the actual bursts. python -m scheduler.predict sweeps alpha and reports the
+waiting time each setting loses against oracle SJF/SRTF, which sorts on the
+true bursts.
+
+Unlike the rest of the package this module needs NumPy.
+"""
+import argparse
+import sys
+
+import numpy as np
+
+from .core import simulate_fcfs, simulate_predicted, simulate_shortest_first
+from .metrics import describe, task_arrays
+from .sweep import print_table, resolve_workload
+
+ALPHAS = (0.0, 0.125, 0.25, 0.5, 0.75, 1.0)
+
+
+def exponential_average(processes, burst_times, arrival_times=None, alpha=0.5, tau0=None):
+    """Predicted burst of every job from the earlier bursts of its process.
+
+    processes gives each job's process (any hashable labels, such as task
+    names). With a sequence of alphas the result has one row per alpha.
+    Every alpha must be in [0, 1]; outside it the recurrence extrapolates
+    instead of averaging.
+    """
+    bursts = np.asarray(burst_times, dtype=float)
+    n = len(bursts)
+    alphas = np.atleast_1d(np.asarray(alpha, dtype=float))[:, None]
+    if not ((alphas >= 0) & (alphas <= 1)).all():
+        raise ValueError(f"alpha must be between 0 and 1, got {alpha}")
+    if tau0 is None:
+        tau0 = bursts.mean() if n else 0.0
+    _, ids = np.unique(np.asarray(processes), return_inverse=True)
+    arrivals = np.zeros(n, dtype=np.int64) if arrival_times is None else np.asarray(arrival_times)
+
+    # each process's jobs in arrival order, processes one after another
+    order = np.lexsort((np.arange(n), arrivals, ids.ravel()))
+    sorted_ids = ids.ravel()[order]
+    firsts = np.flatnonzero(np.r_[True, sorted_ids[1:] != sorted_ids[:-1]]) if n else np.empty(0, dtype=np.int64)
+    lengths = np.diff(np.r_[firsts, n])
+    # longest histories first, so the processes with a burst at position k are a prefix
+    firsts = firsts[np.argsort(-lengths, kind='stable')]
+    alive = np.bincount(lengths, minlength=1)[::-1].cumsum()[::-1]
+
+    sorted_bursts = bursts[order]
+    tau = np.empty((len(alphas), n))
+    tau[:, firsts] = tau0
+    for k in range(1, len(alive) - 1):
+        previous = firsts[:alive[k + 1]] + (k - 1)
+        tau[:, previous + 1] = alphas * sorted_bursts[previous] + (1 - alphas) * tau[:, previous]
+
+    out = np.empty_like(tau)
+    out[:, order] = tau
+    return out if np.ndim(alpha) else out[0]
+
+
+def simulate_psjf(burst_times, arrival_times=None, processes=None, alpha=0.5, tau0=None, progress=None):
+    """Non-preemptive SJF on predicted bursts; without processes every job is its own process."""
+    if processes is None:
+        processes = np.arange(len(burst_times))
+    estimates = exponential_average(processes, burst_times, arrival_times, alpha, tau0)
+    return simulate_predicted(burst_times, arrival_times, estimates.tolist(), False, progress)
+
+
+def simulate_psrtf(burst_times, arrival_times=None, processes=None, alpha=0.5, tau0=None, progress=None):
+    """SRTF on predicted bursts minus the time already run."""
+    if processes is None:
+        processes = np.arange(len(burst_times))
+    estimates = exponential_average(processes, burst_times, arrival_times, alpha, tau0)
+    return simulate_predicted(burst_times, arrival_times, estimates.tolist(), True, progress)
+
+
+ALGORITHMS = {
+    'psjf': simulate_psjf,
+    'psrtf': simulate_psrtf,
+}
+
+
+def waiting_stats(segments, workload):
+    waiting = task_arrays(segments, workload.burst_times, workload.arrival_times)['waiting']
+    return describe(waiting)
+
+
+def alpha_sweep(workload, alphas=ALPHAS, preemptive=False, tau0=None):
+    """Waiting time of predicted SJF (or SRTF) for each alpha, and what it loses against the oracle.
+
+    Returns one row per alpha plus 'oracle' and 'fcfs' reference rows.
+    """
+    bursts, arrivals = workload.burst_times, workload.arrival_times
+    oracle = waiting_stats(simulate_shortest_first(bursts, arrivals, preemptive), workload)
+    rows = [dict(alpha='oracle', **oracle, prediction_error=0.0, loss=0.0, loss_pct=0.0)]
+
+    # every alpha's predictions in one batched pass
+    estimates = exponential_average(workload.tasks, bursts, arrivals, list(alphas), tau0)
+    actual = np.asarray(bursts, dtype=float)
+    for alpha, row in zip(alphas, estimates):
+        stats = waiting_stats(simulate_predicted(bursts, arrivals, row.tolist(), preemptive), workload)
+        rows.append(dict(alpha=alpha, **stats, prediction_error=float(np.abs(row - actual).mean())))
+
+    fcfs = waiting_stats(simulate_fcfs(bursts, arrivals), workload)
+    rows.append(dict(alpha='fcfs', **fcfs, prediction_error=float('nan')))
+    for row in rows[1:]:
+        row['loss'] = row['mean'] - oracle['mean']
+        row['loss_pct'] = 100 * row['loss'] / oracle['mean'] if oracle['mean'] else 0.0
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m scheduler.predict', description=__doc__.splitlines()[0])
+    parser.add_argument('workloads', nargs='+',
+                        help="workload files or hist:<distribution>:<jobs>:<seed>:<processes> specs")
+    parser.add_argument('--alphas', type=float, nargs='+', default=list(ALPHAS))
+    parser.add_argument('--tau0', type=float, help="prediction for a process's first burst (default: mean burst)")
+    parser.add_argument('--preemptive', action='store_true', help="compare predicted SRTF with SRTF instead of SJF")
+    args = parser.parse_args(argv)
+    if not all(0 <= alpha <= 1 for alpha in args.alphas):
+        parser.error("--alphas must be between 0 and 1")
+
+    status = 0
+    for spec in args.workloads:
+        try:
+            workload = resolve_workload(spec)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"error: {spec}: {e}", file=sys.stderr)
+            status = 1
+            continue
+        print(f"{spec}: {'SRTF' if args.preemptive else 'SJF'} waiting time, predicted vs oracle")
+        print_table(alpha_sweep(workload, args.alphas, args.preemptive, args.tau0))
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""Per-phase timings and event counts for one run, plus an optional profiler hook.
+
+    SCHEDULER_PROFILE=cprofile python sjf.py
+    SCHEDULER_PROFILE=sample:2 python -m scheduler jobs.csv -a srtf --profile-json profile.json
+
+A Profile adds up the wall time of named phases (parse, schedule, table,
+draw, ...) and counts events: simulated ticks and context switches from the
+schedule, table rows and Gantt patches from the widgets that render them. The
+GUIs show profile.status() in their status bar; the batch CLI writes
+profile.as_dict() as JSON.
+
+Setting $SCHEDULER_PROFILE (or passing hook=) also runs a profiler during the
+phases: 'cprofile' collects cProfile statistics into a .prof file (read it with
+python -m pstats or snakeviz), 'sample' or 'sample:<ms>' records the stack of
+the profiled thread every few milliseconds into a .folded file of collapsed
+stacks for flamegraph tools. Files go to $SCHEDULER_PROFILE_DIR (default: the
+current directory) when the run finishes.
+"""
+import cProfile
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+PROFILE_ENV = 'SCHEDULER_PROFILE'
+PROFILE_DIR_ENV = 'SCHEDULER_PROFILE_DIR'
+
+HOOKS = ('cprofile', 'sample')
+
+# default interval of the sampling profiler, in milliseconds
+SAMPLE_MS = 5
+
+
+def schedule_counts(segments):
+    """Simulated ticks (first start to last finish) and context switches of a schedule."""
+    if not len(segments):
+        return 0, 0
+    ticks = max(segments.ends) - min(segments.starts)
+    # every segment after the first on a core starts with a switch to its task
+    lanes = len(set(segments.cores)) if hasattr(segments, 'cores') else 1
+    return ticks, len(segments) - lanes
+
+
+class Sampler:
+    """Collapsed stacks of one thread, sampled from a background thread."""
+
+    def __init__(self, interval_ms=SAMPLE_MS):
+        self.interval = interval_ms / 1000
+        self.stacks = Counter()
+        self.target = None
+        self.stop_event = None
+        self.thread = None
+
+    def enable(self):
+        self.target = threading.get_ident()
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def disable(self):
+        self.stop_event.set()
+        self.thread.join()
+
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.target)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def dump(self, path):
+        with open(path, 'w') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def make_profiler(hook):
+    """Profiler for a hook spec ('cprofile', 'sample' or 'sample:<ms>') and its file suffix."""
+    name, _, arg = hook.partition(':')
+    if name == 'cprofile':
+        return cProfile.Profile(), '.prof'
+    if name == 'sample':
+        return Sampler(float(arg) if arg else SAMPLE_MS), '.folded'
+    raise ValueError(f"unknown profiler '{hook}', expected one of {', '.join(HOOKS)}")
+
+
+class Profile:
+    """Wall time per phase and event counts for one run.
+
+    hook is a profiler spec as in $SCHEDULER_PROFILE, which it defaults to;
+    hook=False runs no profiler whatever the environment says.
+    """
+
+    def __init__(self, hook=None):
+        if hook is None:
+            hook = os.environ.get(PROFILE_ENV) or None
+        self.phases = {}
+        self.counts = {}
+        self.hook = hook
+        self.profiler, self.suffix = make_profiler(hook) if hook else (None, None)
+        self.output = None
+
+    @contextmanager
+    def phase(self, name):
+        """Time the body as phase `name`; a phase that repeats adds up."""
+        if self.profiler is not None:
+            self.profiler.enable()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+            if self.profiler is not None:
+                self.profiler.disable()
+
+    def count(self, name, n=1):
+        self.counts[name] = self.counts.get(name, 0) + n
+
+    def count_schedule(self, segments, label=None):
+        """Add a schedule's ticks and context switches, under 'ticks/<label>' etc. if labelled."""
+        ticks, switches = schedule_counts(segments)
+        suffix = f"/{label}" if label else ''
+        self.count('ticks' + suffix, ticks)
+        self.count('context switches' + suffix, switches)
+
+    def finish(self, prefix='scheduler'):
+        """Write the profiler's output, if any, and return its path."""
+        if self.profiler is None or self.output is not None:
+            return self.output
+        directory = os.environ.get(PROFILE_DIR_ENV) or '.'
+        self.output = os.path.join(directory, f"{prefix}-{os.getpid()}-{time.strftime('%Y%m%d-%H%M%S')}{self.suffix}")
+        if isinstance(self.profiler, Sampler):
+            self.profiler.dump(self.output)
+        else:
+            self.profiler.dump_stats(self.output)
+        return self.output
+
+    def as_dict(self):
+        out = {'phases': dict(self.phases), 'counts': dict(self.counts)}
+        if self.output:
+            out['profile'] = self.output
+        return out
+
+    def status(self):
+        """One line for a status bar: phase times in ms, then the counts."""
+        parts = [f"{name} {seconds * 1000:.1f} ms" for name, seconds in self.phases.items()]
+        parts += [f"{n:,} {name}" for name, n in self.counts.items()]
+        if self.output:
+            parts.append(f"profile: {self.output}")
+        return '  |  '.join(parts)
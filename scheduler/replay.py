@@ -0,0 +1,260 @@
+"""Animated replay of a schedule on top of a Gantt chart, drawn with blitting.
+
+The chart itself is drawn once and kept as a bitmap; every frame restores that
+bitmap and draws only the animated artists over it: the time cursor and an
+outline around the jobs running at that instant. The running jobs and the ready
+queue are described in text, refreshed when they change but at most TEXT_HZ
+times a second while playing. Given on_state, the text goes to that callback (a
+Tk label, say); otherwise it is drawn in a box on the axes, which is slow to
+render, so the box is kept in a second saved bitmap between changes. The state
+at time t comes from binary searches over the segment columns, and the ready
+queue (arrived, unfinished, not running; ordered by arrival or by remaining
+time) is only recomputed when t crosses a segment boundary or an arrival, so a
+frame in between costs a few binary searches whatever the length of the
+schedule.
+
+Replay does not own a clock: a GUI calls step() with the wall time since the
+previous frame, or seek() to scrub. Clicking or dragging on the axes seeks as
+well. When the axes show only part of the timeline, the view pages forward
+(one full redraw) whenever the cursor leaves it.
+
+Unlike the rest of the package this module needs matplotlib and NumPy.
+"""
+import math
+import time
+
+import numpy as np
+from matplotlib.collections import PolyCollection
+
+from .gantt import BAR_HEIGHT
+from .vectorized import segment_columns, task_times
+
+# how many ready jobs the text box names
+MAX_LISTED = 8
+
+# above this many cores the text box gives a count instead of naming every core's job
+MAX_CORES_LISTED = 8
+
+# how often the text box may be re-rendered while playing
+TEXT_HZ = 10
+
+
+class Replay:
+    """Blitted time cursor, running-job outline and ready queue over a GanttRenderer's axes.
+
+    The renderer must have one row per task name or, given cores, one lane
+    per core. queue_order is 'arrival' (FCFS order) or 'remaining' (the order SRTF
+    would pick from).
+    """
+
+    def __init__(self, renderer, tasks, segments, burst_times, arrival_times=None, cores=None,
+                 queue_order='arrival', speed=None, on_state=None):
+        self.renderer = renderer
+        self.ax = renderer.ax
+        self.canvas = self.ax.figure.canvas
+        self.tasks = tasks
+        self.queue_order = queue_order
+        self.on_state = on_state
+        self.multi_core = cores is not None
+
+        seg_tasks, starts, ends = segment_columns(segments)
+        n = len(burst_times)
+        self.bursts = np.asarray(burst_times, dtype=np.int64)
+        self.arrivals = np.zeros(n, dtype=np.int64) if arrival_times is None else np.asarray(arrival_times,
+                                                                                               dtype=np.int64)
+        _, self.finishes = task_times(segments, n)
+        self.sorted_arrivals = np.sort(self.arrivals)
+
+        # segments per lane (core, or a single lane) in start order, for "who runs at t"
+        lanes = np.zeros(len(seg_tasks), dtype=np.int64) if cores is None else np.asarray(cores, dtype=np.int64)
+        order = np.lexsort((starts, lanes))
+        self.lane_starts = starts[order]
+        self.lane_ends = ends[order]
+        self.lane_tasks = seg_tasks[order]
+        lane_ids = lanes[order]
+        self.lane_bounds = np.searchsorted(lane_ids, np.arange(int(lane_ids.max()) + 2 if len(lane_ids) else 1))
+        # chart row of each task when there is one row per task name
+        self.task_rows = None if self.multi_core else self.row_of_task()
+
+        # per-task segments in start order with running totals, for remaining time at t
+        self.base = int(starts.min()) if len(starts) else 0
+        self.stride = (int(ends.max()) if len(ends) else 0) - self.base + 1
+        order = np.lexsort((starts, seg_tasks))
+        self.task_keys = seg_tasks[order] * self.stride + (starts[order] - self.base)
+        self.done_before = np.concatenate(([0], np.cumsum(ends[order] - starts[order])))
+        self.task_first = np.searchsorted(seg_tasks[order], np.arange(n))
+
+        self.start_time = int(min(self.arrivals.min(initial=self.base), self.base))
+        self.end_time = int(ends.max()) if len(ends) else self.start_time
+        self.time = float(self.start_time)
+        # simulated ticks per second of wall time; by default the whole schedule takes 30 s
+        self.speed = speed or max((self.end_time - self.start_time) / 30, 1)
+        self.playing = False
+
+        self.cursor = self.ax.axvline(self.time, color='black', linewidth=1, animated=True)
+        self.outline = PolyCollection(np.empty((0, 4, 2)), facecolors='none', edgecolors='black', linewidths=1.5,
+                                      animated=True)
+        self.ax.add_collection(self.outline)
+        self.info = self.ax.text(0.01, 0.98, '', transform=self.ax.transAxes, va='top', ha='left', fontsize=8,
+                                 family='monospace', animated=True,
+                                 bbox=dict(facecolor='white', alpha=0.85, edgecolor='none'),
+                                 visible=on_state is None)
+        self.state_key = None
+        self.text_time = 0.0
+        self.background = None
+        # the background with the text box drawn over it
+        self.layer = None
+        self.cids = [
+            self.canvas.mpl_connect('draw_event', self.on_draw),
+            self.canvas.mpl_connect('button_press_event', self.on_mouse),
+            self.canvas.mpl_connect('motion_notify_event', self.on_mouse),
+        ]
+
+    def row_of_task(self):
+        # the renderer's rows follow first appearance, so map names the same way
+        names = {name: row for row, name in enumerate(self.renderer.row_names)}
+        return np.array([names.get(name, -1) for name in self.tasks], dtype=np.int64)
+
+    def disconnect(self):
+        for cid in self.cids:
+            self.canvas.mpl_disconnect(cid)
+        self.cids = []
+
+    def running(self, t):
+        """(lane, task, start, end) of every job running at t."""
+        out = []
+        for lane in range(len(self.lane_bounds) - 1):
+            lo, hi = self.lane_bounds[lane], self.lane_bounds[lane + 1]
+            i = lo + np.searchsorted(self.lane_starts[lo:hi], t, side='right') - 1
+            if i >= lo and self.lane_ends[i] > t:
+                out.append((lane, int(self.lane_tasks[i]), int(self.lane_starts[i]), int(self.lane_ends[i])))
+        return out
+
+    def remaining(self, tasks, t):
+        """Burst time left at t for tasks that are not running at t."""
+        # index of each task's first segment starting at or after t; everything before it has finished
+        stop = np.searchsorted(self.task_keys, tasks * self.stride + (math.ceil(t) - self.base))
+        return self.bursts[tasks] - (self.done_before[stop] - self.done_before[self.task_first[tasks]])
+
+    def ready(self, t, running_tasks):
+        """Ready jobs at t in queue order, at most MAX_LISTED of them, and how many there are."""
+        waiting = (self.arrivals <= t) & (self.finishes > t)
+        waiting[running_tasks] = False
+        ready = np.flatnonzero(waiting)
+        if self.queue_order == 'remaining':
+            keys = self.remaining(ready, t)
+        else:
+            keys = self.arrivals[ready]
+        if len(ready) > MAX_LISTED:
+            # only the first few are shown, so a partial sort will do
+            first = np.argpartition(keys, MAX_LISTED)[:MAX_LISTED]
+            ready, keys = ready[first], keys[first]
+        order = np.lexsort((ready, keys))
+        return ready[order], keys[order], int(waiting.sum())
+
+    def describe(self, t, running):
+        """Text box contents: running jobs and the ready queue."""
+        lines = [f"at t = {math.floor(t)}"]
+        if self.multi_core and len(self.lane_bounds) - 1 > MAX_CORES_LISTED:
+            lines.append(f"running on {len(running)} of {len(self.lane_bounds) - 1} cores")
+        else:
+            for lane, task, start, end in running:
+                where = f"CPU {lane}: " if self.multi_core else "running: "
+                lines.append(f"{where}{self.tasks[task]} [{start}, {end})")
+            if not running:
+                lines.append("idle")
+        ready, keys, count = self.ready(t, [task for _, task, _, _ in running])
+        label = 'remaining' if self.queue_order == 'remaining' else 'arrived'
+        lines.append(f"ready ({count}): " + ', '.join(f"{self.tasks[i]} ({label} {k})" for i, k in zip(ready, keys))
+                     + (' ...' if count > len(ready) else ''))
+        return '\n'.join(lines)
+
+    def on_draw(self, event):
+        # a full redraw (first show, resize, paging) leaves a fresh bitmap of the chart
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self.layer = None
+        self.state_key = None
+        self.move_artists()
+        self.draw_animated()
+
+    def draw_animated(self):
+        if self.layer is None:
+            self.ax.draw_artist(self.info)
+            self.layer = self.canvas.copy_from_bbox(self.ax.bbox)
+        for artist in (self.outline, self.cursor):
+            self.ax.draw_artist(artist)
+
+    def update(self):
+        """Move the animated artists to self.time and blit them over the saved chart."""
+        t = self.time
+        x0, x1 = self.ax.get_xlim()
+        if not x0 <= t <= x1 and x1 - x0 < self.end_time - self.start_time:
+            # page the view so the cursor is back in it; the draw_event takes it from there
+            width = x1 - x0
+            self.ax.set_xlim(t - 0.05 * width, t + 0.95 * width)
+            self.background = None
+        if self.background is None:
+            # frames wait for the full redraw instead of blitting over a stale bitmap
+            self.canvas.draw_idle()
+            return
+
+        self.move_artists()
+        self.canvas.restore_region(self.background if self.layer is None else self.layer)
+        self.draw_animated()
+        self.canvas.blit(self.ax.bbox)
+
+    def move_artists(self):
+        t = self.time
+        self.cursor.set_xdata([t, t])
+        running = self.running(t)
+        # the running segments and the number of arrivals only change at event boundaries
+        key = (tuple((task, start) for _, task, start, _ in running),
+               int(np.searchsorted(self.sorted_arrivals, t, side='right')))
+        if key != self.state_key:
+            self.outline.set_verts(self.outline_verts(running))
+            now = time.perf_counter()
+            # while playing fast the text would change every frame; nobody can read it that quickly
+            if not self.playing or now - self.text_time >= 1 / TEXT_HZ:
+                self.state_key = key
+                self.text_time = now
+                text = self.describe(t, running)
+                if self.on_state is not None:
+                    self.on_state(text)
+                else:
+                    self.info.set_text(text)
+                    self.layer = None
+
+    def outline_verts(self, running):
+        verts = np.empty((len(running), 4, 2))
+        for k, (lane, task, start, end) in enumerate(running):
+            row = lane if self.multi_core else self.task_rows[task]
+            verts[k] = [(start, row - BAR_HEIGHT / 2), (start, row + BAR_HEIGHT / 2),
+                        (end, row + BAR_HEIGHT / 2), (end, row - BAR_HEIGHT / 2)]
+        return verts
+
+    def seek(self, t):
+        self.time = float(min(max(t, self.start_time), self.end_time))
+        self.update()
+
+    def step(self, seconds):
+        """Advance by `seconds` of wall time if playing; returns whether it still is."""
+        if self.playing:
+            self.time = min(self.time + self.speed * seconds, self.end_time)
+            if self.time >= self.end_time:
+                self.playing = False
+            self.update()
+        return self.playing
+
+    def play(self):
+        if self.time >= self.end_time:
+            self.time = float(self.start_time)
+        self.playing = True
+
+    def pause(self):
+        self.playing = False
+
+    def on_mouse(self, event):
+        # click or drag on the chart to scrub; toolbar modes keep their own meaning
+        if event.inaxes is self.ax and event.button == 1 and event.xdata is not None:
+            if getattr(self.canvas.toolbar, 'mode', '') == '':
+                self.seek(event.xdata)
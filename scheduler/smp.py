@@ -0,0 +1,270 @@
+"""FCFS, SJF and SRTF on k identical cores.
+
+    python -m scheduler jobs.csv -a fcfs_smp sjf_smp srtf_smp --cores 16 -o results
+    python -m scheduler.sweep jobs.csv -a srtf_smp -p cores=1,2,4,8,16,32,64
+
+Like simulate_shortest_first, the engine jumps from one arrival or completion
+to the next. Busy cores sit in a heap keyed on the time they become free, idle
+cores in a heap of core numbers (lowest first), so an event costs O(log k)
+whatever the number of cores. A job can be pinned to one core with `affinity`:
+pinned jobs wait in that core's own ready queue, and a core that comes free
+takes the better of its own queue and the shared one. With one core each policy
+makes the same choices as simulate_fcfs, simulate_shortest_first and
+simulate_srtf.
+
+Schedules come back as a CoreSegmentList, a SegmentList with a core column, so
+task_metrics, the result cache and plot_gantt take them unchanged;
+plot_gantt(..., cores=schedule.cores) draws one lane per core instead of one
+row per task.
+"""
+import heapq
+from array import array
+
+from .core import PROGRESS_STEPS, SegmentList, arrival_order
+
+POLICIES = ('fcfs', 'sjf', 'srtf')
+
+
+class CoreSegmentList(SegmentList):
+    """SegmentList whose segments also record the core they ran on.
+
+    Segments are appended as they end, so they are in time order for each
+    task (and each core) but not overall.
+    """
+    __slots__ = ('cores',)
+
+    def __init__(self):
+        super().__init__()
+        self.cores = array('q')
+
+    @classmethod
+    def from_columns(cls, tasks, starts, ends, cores=None):
+        segments = super().from_columns(tasks, starts, ends)
+        if cores is None:
+            segments.cores.frombytes(bytes(len(segments) * segments.cores.itemsize))
+        elif hasattr(cores, 'tobytes'):
+            segments.cores.frombytes(cores.tobytes())
+        else:
+            segments.cores.extend(cores)
+        return segments
+
+    def append(self, task, start, end, core=0):
+        if self.tasks and self.tasks[-1] == task and self.ends[-1] == start and self.cores[-1] == core:
+            self.ends[-1] = end
+        else:
+            self.tasks.append(task)
+            self.starts.append(start)
+            self.ends.append(end)
+            self.cores.append(core)
+
+    def core_count(self):
+        return max(self.cores) + 1 if self.cores else 0
+
+    def lanes(self, cores=None):
+        """One SegmentList per core, each in time order."""
+        if cores is None:
+            cores = self.core_count()
+        lanes = [SegmentList() for _ in range(cores)]
+        for task, start, end, core in zip(self.tasks, self.starts, self.ends, self.cores):
+            lanes[core].append(task, start, end)
+        return lanes
+
+
+def simulate_smp(burst_times, arrival_times=None, cores=2, policy='fcfs', affinity=None, progress=None):
+    """Schedule jobs on `cores` identical cores; see the module docstring.
+
+    affinity, if given, holds one entry per job: a core number pins the job
+    to that core, -1 (or None) lets it run anywhere. Under SRTF the running
+    jobs are always the best ones available to their cores: an arrival
+    preempts the running job with the most remaining time (or, if pinned, the
+    job on its own core) when it is shorter, and preempted jobs may resume
+    on any core they are allowed on. progress, if given, is called now and
+    then with the fraction of jobs that have arrived.
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"unknown policy '{policy}', expected one of {', '.join(POLICIES)}")
+    if cores < 1:
+        raise ValueError("need at least one core")
+    n = len(burst_times)
+    arrival_times, order = arrival_order(burst_times, arrival_times)
+    if affinity is not None:
+        if len(affinity) != n:
+            raise ValueError("Number of tasks and affinities must be the same.")
+        affinity = [-1 if core is None else core for core in affinity]
+        if any(core >= cores for core in affinity):
+            raise ValueError(f"affinity names a core beyond the {cores} available")
+    preemptive = policy == 'srtf'
+    # ready entries are (key, task); FCFS keys on arrival, SJF/SRTF on remaining time
+    fcfs = policy == 'fcfs'
+
+    remaining = list(burst_times)
+    shared = []
+    pinned = [[] for _ in range(cores)] if affinity is not None else None
+    running = [-1] * cores
+    started = [0] * cores
+    free_at = [0] * cores
+    busy = []          # (free time, core); stale entries are skipped
+    longest = []       # (-free time, -task, core) for SRTF preemption; stale entries are skipped
+    idle = list(range(cores))
+    is_idle = [True] * cores
+    runs = CoreSegmentList()
+    next_arrival = 0
+    steps = 0
+
+    def key(i):
+        return (arrival_times[i], i) if fcfs else (remaining[i], i)
+
+    def queue_of(i):
+        if pinned is None or affinity[i] < 0:
+            return shared
+        return pinned[affinity[i]]
+
+    def start(core, i, t):
+        running[core] = i
+        started[core] = t
+        is_idle[core] = False
+        end = t + remaining[i]
+        free_at[core] = end
+        heapq.heappush(busy, (end, core))
+        if preemptive:
+            heapq.heappush(longest, (-end, -i, core))
+
+    def stop(core, t):
+        """Take the running job off core at time t and record its segment."""
+        i = running[core]
+        if t > started[core]:
+            runs.append(i, started[core], t, core)
+        remaining[i] = free_at[core] - t
+        running[core] = -1
+        return i
+
+    def make_idle(core):
+        is_idle[core] = True
+        heapq.heappush(idle, core)
+
+    def best_for(core):
+        """Pop the best ready job core may run, or return -1."""
+        own = pinned[core] if pinned is not None else None
+        if own and (not shared or own[0] < shared[0]):
+            return heapq.heappop(own)[1]
+        if shared:
+            return heapq.heappop(shared)[1]
+        return -1
+
+    def dispatch(core, t):
+        # zero-length jobs finish on the spot and leave the core free for the next one;
+        # like simulate_fcfs (and unlike simulate_shortest_first) FCFS still records them
+        while True:
+            i = best_for(core)
+            if i < 0:
+                return False
+            if remaining[i] > 0:
+                start(core, i, t)
+                return True
+            if fcfs:
+                runs.append(i, t, t, core)
+
+    def fill_idle(t, woken):
+        # cores that just came free or just got pinned work pick first, in core order
+        for core in sorted(woken):
+            if is_idle[core]:
+                dispatch(core, t)
+        while shared and idle:
+            core = heapq.heappop(idle)
+            if is_idle[core] and not dispatch(core, t):
+                # only zero-length jobs were left
+                heapq.heappush(idle, core)
+        # drop the stale heads left by cores that started work above
+        while idle and not is_idle[idle[0]]:
+            heapq.heappop(idle)
+
+    while next_arrival < n or busy:
+        steps += 1
+        if progress is not None and steps % PROGRESS_STEPS == 0:
+            progress(next_arrival / n)
+        t = busy[0][0] if busy else arrival_times[order[next_arrival]]
+        if next_arrival < n:
+            t = min(t, arrival_times[order[next_arrival]])
+
+        woken = []
+        while busy and busy[0][0] <= t:
+            end, core = heapq.heappop(busy)
+            if running[core] < 0 or free_at[core] != end:
+                continue
+            stop(core, t)
+            make_idle(core)
+            woken.append(core)
+
+        while next_arrival < n and arrival_times[order[next_arrival]] <= t:
+            i = order[next_arrival]
+            next_arrival += 1
+            heapq.heappush(queue_of(i), key(i))
+            if pinned is not None and affinity[i] >= 0:
+                woken.append(affinity[i])
+        fill_idle(t, woken)
+
+        if not preemptive:
+            continue
+        if pinned is not None:
+            # pinned arrivals against the job on their own core
+            moved = False
+            for core in set(woken):
+                own = pinned[core]
+                if own and running[core] >= 0 and own[0] < (free_at[core] - t, running[core]):
+                    j = heapq.heappop(own)[1]
+                    i = stop(core, t)
+                    start(core, j, t)
+                    heapq.heappush(queue_of(i), key(i))
+                    moved = True
+            if moved:
+                # an unpinned job pushed off its core may fit on one that is idle
+                fill_idle(t, ())
+        # the shortest shared job against the one with the most remaining time
+        while shared:
+            while longest and (running[longest[0][2]] != -longest[0][1]
+                               or free_at[longest[0][2]] != -longest[0][0]):
+                heapq.heappop(longest)
+            if not longest:
+                break
+            end, i, core = longest[0]
+            if not shared[0] < (-end - t, -i):
+                break
+            heapq.heappop(longest)
+            j = heapq.heappop(shared)[1]
+            i = stop(core, t)
+            start(core, j, t)
+            # it had the most remaining time of all running jobs, so it preempts nothing in turn
+            heapq.heappush(queue_of(i), key(i))
+
+    return runs
+
+
+def simulate_fcfs_smp(burst_times, arrival_times=None, cores=2, affinity=None, progress=None):
+    return simulate_smp(burst_times, arrival_times, cores, 'fcfs', affinity, progress)
+
+
+def simulate_sjf_smp(burst_times, arrival_times=None, cores=2, affinity=None, progress=None):
+    return simulate_smp(burst_times, arrival_times, cores, 'sjf', affinity, progress)
+
+
+def simulate_srtf_smp(burst_times, arrival_times=None, cores=2, affinity=None, progress=None):
+    return simulate_smp(burst_times, arrival_times, cores, 'srtf', affinity, progress)
+
+
+ALGORITHMS = {
+    'fcfs_smp': simulate_fcfs_smp,
+    'sjf_smp': simulate_sjf_smp,
+    'srtf_smp': simulate_srtf_smp,
+}
+
+
+def core_utilization(segments, cores=None, makespan=None):
+    """Busy fraction of each core between time 0 and makespan (default: the last finish)."""
+    if cores is None:
+        cores = segments.core_count()
+    busy = [0] * cores
+    for start, end, core in zip(segments.starts, segments.ends, segments.cores):
+        busy[core] += end - start
+    if makespan is None:
+        makespan = max(segments.ends, default=0)
+    return [b / makespan if makespan else 0.0 for b in busy]
@@ -0,0 +1,275 @@
+"""Online scheduling of an unbounded job stream with constant-memory statistics.
+
+    python -m scheduler.stream jobs.csv -a srtf --interval 10000
+    tail -f trace.csv | python -m scheduler.stream - -a sjf
+    python -m scheduler.stream --generate pareto --limit 10000000 -a fcfs
+    python -m scheduler.stream trace.swf -a sjf
+
+Jobs are (task, arrival, burst) triples in non-decreasing arrival order. They
+are pulled from the source one at a time, only when the scheduler needs to know
+what arrives next, and each job is forgotten as soon as it completes. Memory is
+therefore bounded by the number of jobs in the system, not the length of the
+stream. FCFS, SJF (non-preemptive, arrival-aware) and SRTF make the same
+choices as simulate_fcfs and simulate_shortest_first on the same jobs.
+
+Waiting, response and turnaround times are summarised with a running mean and
+a log-bucketed quantile sketch whose size depends on the range of the values,
+not on how many there are.
+"""
+import argparse
+import csv
+import heapq
+import itertools
+import json
+import math
+import sys
+import time
+
+from .generate import DISTRIBUTIONS, generate_jobs
+from .importer import ImportReport, iter_jobs
+
+POLICIES = ('fcfs', 'sjf', 'srtf')
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+# relative error of the quantile sketch
+SKETCH_ACCURACY = 0.01
+
+# seconds between polls of a followed file that has no new lines
+FOLLOW_POLL = 0.5
+
+
+class QuantileSketch:
+    """Quantiles of non-negative values to within a relative error, in bounded memory.
+
+    Values fall into buckets whose bounds grow geometrically by gamma, so any
+    value is reported as the midpoint of its bucket, at most `accuracy` away in
+    relative terms. Zeros (common for waiting times) have a bucket of their own.
+    """
+
+    def __init__(self, accuracy=SKETCH_ACCURACY):
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zeros = 0
+        self.count = 0
+
+    def add(self, value):
+        self.count += 1
+        if value <= 0:
+            self.zeros += 1
+            return
+        key = math.ceil(math.log(value) / self.log_gamma)
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+
+    def quantile(self, q):
+        """Nearest-rank quantile, like sweep.quantile on the exact values."""
+        if not self.count:
+            return 0
+        rank = min(self.count - 1, int(q * self.count))
+        seen = self.zeros
+        if rank < seen:
+            return 0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 0
+
+
+class RunningStats:
+    """Count, mean, max and sketched quantiles of a stream of values."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.max = 0
+        self.sketch = QuantileSketch()
+
+    def add(self, value):
+        self.count += 1
+        self.mean += (value - self.mean) / self.count
+        if value > self.max:
+            self.max = value
+        self.sketch.add(value)
+
+    def describe(self):
+        stats = {'mean': self.mean, 'max': self.max}
+        for q in QUANTILES:
+            stats[f"p{round(q * 100)}"] = self.sketch.quantile(q)
+        return stats
+
+
+def stream_schedule(jobs, policy='fcfs'):
+    """Schedule jobs online and yield (task, arrival, burst, first_start, finish) as each completes."""
+    if policy not in POLICIES:
+        raise ValueError(f"unknown policy '{policy}', expected one of {', '.join(POLICIES)}")
+    preemptive = policy == 'srtf'
+    jobs = iter(jobs)
+    sequence = itertools.count()
+    # ready heap entries: [key, seq, remaining, task, arrival, burst, first_start]
+    ready = []
+    pending = next(jobs, None)
+    last_arrival = None
+    current_time = 0
+
+    while pending is not None or ready:
+        if not ready:
+            current_time = max(current_time, pending[1])
+        while pending is not None and pending[1] <= current_time:
+            task, arrival, burst = pending
+            if last_arrival is not None and arrival < last_arrival:
+                raise ValueError(f"job '{task}' arrives at {arrival}, before the previous job ({last_arrival})")
+            last_arrival = arrival
+            seq = next(sequence)
+            key = seq if policy == 'fcfs' else burst
+            heapq.heappush(ready, [key, seq, burst, task, arrival, burst, None])
+            pending = next(jobs, None)
+
+        job = heapq.heappop(ready)
+        remaining = job[2]
+        run = remaining
+        if preemptive and pending is not None:
+            run = min(remaining, pending[1] - current_time)
+        if job[6] is None:
+            job[6] = current_time
+        current_time += run
+        if remaining > run:
+            job[0] = job[2] = remaining - run
+            heapq.heappush(ready, job)
+        else:
+            yield job[3], job[4], job[5], job[6], current_time
+
+
+def stream_metrics(jobs, policy='fcfs', interval=10000):
+    """Run stream_schedule and yield a summary every `interval` completed jobs and at the end."""
+    if interval < 1:
+        raise ValueError(f"interval must be positive, got {interval}")
+    waiting, response, turnaround = RunningStats(), RunningStats(), RunningStats()
+    busy = 0
+    clock = 0
+    completed = 0
+
+    def snapshot():
+        return {
+            'completed': completed,
+            'clock': clock,
+            'utilization': busy / clock if clock else 0.0,
+            'waiting': waiting.describe(),
+            'response': response.describe(),
+            'turnaround': turnaround.describe(),
+        }
+
+    for task, arrival, burst, first_start, finish in stream_schedule(jobs, policy):
+        completed += 1
+        busy += burst
+        clock = finish
+        turnaround.add(finish - arrival)
+        waiting.add(finish - arrival - burst)
+        response.add(first_start - arrival)
+        if completed % interval == 0:
+            yield snapshot()
+    if completed % interval:
+        yield snapshot()
+
+
+def follow(f, poll=FOLLOW_POLL):
+    """Yield complete lines from f, waiting for more at end of file like tail -f."""
+    partial = ''
+    while True:
+        line = f.readline()
+        if not line:
+            time.sleep(poll)
+            continue
+        partial += line
+        if partial.endswith('\n'):
+            yield partial
+            partial = ''
+
+
+def read_jobs(lines, report=None):
+    """Lazily parse task,arrival,burst CSV lines (header optional) into job triples.
+
+    Rows with a burst below 1 or a negative arrival are skipped, as
+    scheduler.importer does, and counted in report if one is given.
+    """
+    reader = csv.reader(lines)
+    for number, row in enumerate(reader, 1):
+        if not row or (number == 1 and 'burst' in row):
+            continue
+        try:
+            if len(row) == 2:
+                task, arrival, burst = f"T{number}", int(row[0]), int(row[1])
+            else:
+                task, arrival, burst = row[0], int(row[1]), int(row[2])
+        except (ValueError, IndexError):
+            raise ValueError(f"line {number}: expected task,arrival,burst, got {','.join(row)!r}")
+        if burst <= 0 or arrival < 0:
+            if report is not None:
+                report.skipped += 1
+            continue
+        if report is not None:
+            report.jobs += 1
+        yield task, arrival, burst
+
+
+def format_snapshot(snapshot):
+    parts = [f"jobs={snapshot['completed']}", f"clock={snapshot['clock']}",
+             f"util={snapshot['utilization']:.3f}"]
+    for metric in ('waiting', 'turnaround'):
+        stats = snapshot[metric]
+        parts.append(f"{metric} mean={stats['mean']:.2f} p50={stats['p50']:.1f} "
+                     f"p95={stats['p95']:.1f} p99={stats['p99']:.1f} max={stats['max']}")
+    return '  '.join(parts)
+
+
+def print_metrics(jobs, args):
+    if args.limit is not None:
+        jobs = itertools.islice(jobs, args.limit)
+    try:
+        for snapshot in stream_metrics(jobs, args.algorithm, args.interval):
+            print(json.dumps(snapshot) if args.json else format_snapshot(snapshot), flush=True)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m scheduler.stream', description=__doc__.splitlines()[0])
+    parser.add_argument('source', nargs='?', help="CSV file of task,arrival,burst lines, or - for stdin")
+    parser.add_argument('--generate', choices=DISTRIBUTIONS, help="schedule an endless generated stream instead")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-a', '--algorithm', choices=POLICIES, default='fcfs')
+    parser.add_argument('--interval', type=int, default=10000, help="report every this many completed jobs")
+    parser.add_argument('--limit', type=int, help="stop after this many jobs")
+    parser.add_argument('--follow', action='store_true', help="keep reading the file as it grows")
+    parser.add_argument('--json', action='store_true', help="print one JSON object per report")
+    args = parser.parse_args(argv)
+    if (args.source is None) == (args.generate is None):
+        parser.error("give either a source file or --generate")
+    if args.interval < 1:
+        parser.error("--interval must be positive")
+    if args.follow and args.source and args.source.lower().endswith('.swf'):
+        # SWF goes through scheduler.importer, which reads whole blocks and cannot wait for more
+        parser.error("--follow only works with CSV sources")
+
+    if args.generate:
+        return print_metrics(generate_jobs(args.generate, args.seed), args)
+    report = ImportReport(args.source)
+    if args.source == '-':
+        status = print_metrics(read_jobs(sys.stdin, report), args)
+    elif args.source.lower().endswith('.swf'):
+        status = print_metrics(iter_jobs(args.source, report), args)
+    else:
+        with open(args.source, newline='') as f:
+            status = print_metrics(read_jobs(follow(f) if args.follow else f, report), args)
+    if status == 0:
+        report.print()
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,261 @@
+"""Parameter sweep: run a (workload x algorithm x parameters) grid on a process pool.
+
+    python -m scheduler.sweep --generated pareto:10000 exponential:10000 --seeds 500 \\
+        -a fcfs sjf srtf -o sweep.jsonl
+
+Workers load or generate their own workload from its spec (a file path,
+gen:<distribution>:<jobs>:<seed> or, for jobs from processes with burst
+histories, hist:<distribution>:<jobs>:<seed>:<processes>) and send back only
+summary statistics, so nothing proportional to the schedule crosses process
+boundaries. Each result
+is appended to the --output JSON-lines file as it arrives; rerunning the same
+command skips every grid point that already completed in that file.
+"""
+import argparse
+import ast
+import functools
+import inspect
+import itertools
+import json
+import os
+import sys
+from multiprocessing import Pool
+
+from .cli import run_workload, select_engines
+from .generate import DISTRIBUTIONS, generate_histories, generate_workload
+from .workload import load_workload
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+_engines = None
+
+
+def quantile(sorted_values, q):
+    """Nearest-rank quantile of an already sorted list."""
+    if not sorted_values:
+        return 0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def describe(values):
+    values = sorted(values)
+    stats = {'mean': sum(values) / len(values) if values else 0, 'max': values[-1] if values else 0}
+    for q in QUANTILES:
+        stats[f"p{round(q * 100)}"] = quantile(values, q)
+    return stats
+
+
+@functools.lru_cache(maxsize=4)
+def resolve_workload(spec):
+    if spec.startswith('gen:'):
+        _, distribution, jobs, seed = (spec.split(':') + ['0'])[:4]
+        return generate_workload(int(jobs), distribution, int(seed))
+    if spec.startswith('hist:'):
+        # hist:<distribution>:<jobs>:<seed>:<processes>, jobs spread over processes with burst histories
+        _, distribution, jobs, *rest = spec.split(':')
+        seed = int(rest[0]) if rest else 0
+        processes = int(rest[1]) if len(rest) > 1 else 100
+        return generate_histories(int(jobs), processes, distribution, seed)
+    return load_workload(spec)
+
+
+def point_key(spec, algorithm, params):
+    return json.dumps([spec, algorithm, params], sort_keys=True)
+
+
+def init_worker(backend):
+    global _engines
+    _engines = select_engines(backend)
+
+
+def run_point(point):
+    spec, algorithm, params = point
+    try:
+        workload = resolve_workload(spec)
+        _, metrics = run_workload(workload, algorithm, _engines, **params)
+    except (OSError, ValueError, KeyError) as e:
+        return {'workload': spec, 'algorithm': algorithm, 'params': params, 'error': str(e)}
+    return {
+        'workload': spec,
+        'algorithm': algorithm,
+        'params': params,
+        'jobs': len(workload),
+        'makespan': max(metrics['finish'], default=0),
+        'waiting': describe(metrics['waiting']),
+        'turnaround': describe(metrics['turnaround']),
+    }
+
+
+def parse_value(text):
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return text
+
+
+def check_params(engine, params):
+    """The params the engine takes, converted to the type of each one's default; ValueError on a mismatch.
+
+    A single value for a tuple parameter becomes a one-element tuple, and an
+    int for a float parameter becomes a float. Parameters that default to
+    None are passed as given.
+    """
+    accepted = inspect.signature(engine).parameters
+    checked = {}
+    for name, value in params.items():
+        if name not in accepted:
+            continue
+        default = accepted[name].default
+        if isinstance(default, tuple):
+            value = tuple(value) if isinstance(value, (tuple, list)) else (value,)
+            if default and not all(same_kind(v, default[0]) for v in value):
+                raise ValueError(f"{name}={value!r}: expected values like {default!r}")
+        elif default is not None and default is not inspect.Parameter.empty:
+            if not same_kind(value, default):
+                raise ValueError(f"{name}={value!r}: expected {type(default).__name__}")
+            if isinstance(default, float):
+                value = float(value)
+        checked[name] = value
+    return checked
+
+
+def same_kind(value, default):
+    if isinstance(default, bool) or isinstance(value, bool):
+        return isinstance(value, bool) and isinstance(default, bool)
+    if isinstance(default, float):
+        return isinstance(value, (int, float))
+    return isinstance(value, type(default))
+
+
+def parameter_grid(param_args):
+    """Cartesian product of --param name=v1,v2 options as a list of dicts."""
+    names = []
+    choices = []
+    for arg in param_args or ():
+        name, _, values = arg.partition('=')
+        names.append(name)
+        choices.append([parse_value(v) for v in values.split(',')])
+    return [dict(zip(names, combo)) for combo in itertools.product(*choices)]
+
+
+def read_done(path):
+    done = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                try:
+                    result = json.loads(line)
+                except ValueError:
+                    # a line cut short by an interrupted run
+                    continue
+                if 'error' in result:
+                    # failed points are retried
+                    continue
+                done[point_key(result['workload'], result['algorithm'], result['params'])] = result
+    return done
+
+
+def aggregate(results):
+    """Mean of per-workload statistics, grouped by algorithm and parameters."""
+    groups = {}
+    for r in results:
+        if 'error' in r:
+            continue
+        groups.setdefault((r['algorithm'], json.dumps(r['params'], sort_keys=True)), []).append(r)
+
+    rows = []
+    for (algorithm, params), group in sorted(groups.items()):
+        row = {'algorithm': algorithm, 'params': params, 'workloads': len(group)}
+        for metric in ('waiting', 'turnaround'):
+            for stat in group[0][metric]:
+                row[f"{metric}_{stat}"] = sum(r[metric][stat] for r in group) / len(group)
+        rows.append(row)
+    return rows
+
+
+def print_table(rows, out=sys.stdout):
+    if not rows:
+        return
+    columns = list(rows[0])
+    print("  ".join(f"{c:>14}" for c in columns), file=out)
+    for row in rows:
+        print("  ".join(f"{row[c]:>14.3f}" if isinstance(row[c], float) else f"{row[c]!s:>14}" for c in columns),
+              file=out)
+
+
+def sweep(specs, algorithms, param_grid, output, processes=None, backend='auto', progress=None):
+    """Run every grid point not yet in `output`; returns all results, old and new."""
+    done = read_done(output)
+    engines = select_engines(backend)
+    points = []
+    seen = set(done)
+    for spec in specs:
+        for algorithm in algorithms:
+            # an engine only gets the swept parameters it takes, so it runs once per distinct setting
+            for params in param_grid:
+                params = check_params(engines[algorithm], params)
+                key = point_key(spec, algorithm, params)
+                if key not in seen:
+                    seen.add(key)
+                    points.append((spec, algorithm, params))
+    results = list(done.values())
+
+    # keep each workload's points together so a worker's workload cache hits
+    with open(output, 'a') as out, Pool(processes, initializer=init_worker, initargs=(backend,)) as pool:
+        for result in pool.imap_unordered(run_point, points, chunksize=max(1, len(algorithms) * len(param_grid))):
+            out.write(json.dumps(result) + '\n')
+            out.flush()
+            results.append(result)
+            if progress:
+                progress(len(results), len(done) + len(points))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m scheduler.sweep', description=__doc__.splitlines()[0])
+    parser.add_argument('workloads', nargs='*', help="workload files or gen:<distribution>:<jobs>:<seed> specs")
+    parser.add_argument('--generated', nargs='+', default=[], metavar='DIST:JOBS',
+                        help=f"generated workloads, one per seed ({', '.join(DISTRIBUTIONS)})")
+    parser.add_argument('--seeds', type=int, default=1, help="number of seeds per --generated entry")
+    parser.add_argument('-a', '--algorithms', nargs='+', default=['fcfs', 'sjf', 'srtf'])
+    parser.add_argument('-p', '--param', action='append', metavar='NAME=V1,V2',
+                        help="engine parameter values to sweep; repeat for a grid")
+    parser.add_argument('-j', '--processes', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--backend', choices=('auto', 'python', 'numpy'), default='auto')
+    parser.add_argument('-o', '--output', default='sweep.jsonl')
+    args = parser.parse_args(argv)
+
+    specs = list(args.workloads)
+    for entry in args.generated:
+        distribution, jobs = entry.split(':')
+        specs.extend(f"gen:{distribution}:{jobs}:{seed}" for seed in range(args.seeds))
+    if not specs:
+        parser.error("no workloads given")
+    engines = select_engines(args.backend)
+    unknown = set(args.algorithms) - set(engines)
+    if unknown:
+        parser.error(f"unknown algorithms: {', '.join(sorted(unknown))}")
+    grid = parameter_grid(args.param)
+    for algorithm in args.algorithms:
+        for params in grid:
+            try:
+                check_params(engines[algorithm], params)
+            except ValueError as e:
+                parser.error(f"{algorithm}: {e}")
+
+    def progress(finished, total):
+        print(f"\r{finished}/{total}", end='', file=sys.stderr, flush=True)
+
+    results = sweep(specs, args.algorithms, grid, args.output,
+                    args.processes, args.backend, progress)
+    print(file=sys.stderr)
+
+    errors = [r for r in results if 'error' in r]
+    for r in errors:
+        print(f"error: {r['workload']} {r['algorithm']}: {r['error']}", file=sys.stderr)
+    print_table(aggregate(results))
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""Matplotlib canvas for the Tk windows that imports matplotlib on first use.
+
+Importing matplotlib and its TkAgg backend takes most of a window's start-up
+time, so LazyCanvas holds an empty frame of the figure's size until something
+asks for its figure; only then is matplotlib imported and the real
+FigureCanvasTkAgg packed into the frame. It has the parts of the
+FigureCanvasTkAgg interface the windows use (figure, draw, draw_idle,
+get_tk_widget), and draw calls on a canvas that was never used do nothing.
+
+Unlike the rest of the package this module needs tkinter.
+"""
+import tkinter as tk
+from tkinter import ttk
+
+# matplotlib's default figure resolution, used to size the placeholder
+DPI = 100
+
+
+class LazyCanvas:
+    def __init__(self, master, figsize=(8, 4), **figure_kwargs):
+        self.figsize = figsize
+        self.figure_kwargs = figure_kwargs
+        self.canvas = None
+        self.frame = ttk.Frame(master, width=int(figsize[0] * DPI), height=int(figsize[1] * DPI))
+        # keep the placeholder at the figure's size so the layout does not jump on first draw
+        self.frame.pack_propagate(False)
+
+    @property
+    def loaded(self):
+        return self.canvas is not None
+
+    @property
+    def figure(self):
+        if self.canvas is None:
+            self.load()
+        return self.canvas.figure
+
+    def load(self):
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+
+        figure = Figure(figsize=self.figsize, dpi=DPI, **self.figure_kwargs)
+        figure.add_subplot(111)
+        self.canvas = FigureCanvasTkAgg(figure, master=self.frame)
+        self.canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        self.frame.pack_propagate(True)
+
+    def get_tk_widget(self):
+        return self.frame
+
+    def draw(self):
+        if self.canvas is not None:
+            self.canvas.draw()
+
+    def draw_idle(self):
+        if self.canvas is not None:
+            self.canvas.draw_idle()
@@ -0,0 +1,198 @@
+"""Tk window that replays a schedule: play/pause, speed, zoom window and a scrub bar.
+
+    python -m scheduler.tkreplay jobs.csv -a srtf
+    python -m scheduler.tkreplay gen:pareto:100000:0 -a srtf_smp -p cores=8
+
+The chart, cursor and ready queue come from scheduler.replay; this module adds
+the clock (root.after every FRAME_MS, advancing by the wall time actually
+elapsed, so a slow frame does not slow the replay down) and the controls.
+Dragging the scrub bar or clicking on the chart seeks; the speed is in
+simulated ticks per second of wall time; a zoom window narrower than the
+schedule makes the view page along with the cursor.
+
+Unlike the rest of the package this module needs tkinter and matplotlib.
+"""
+import argparse
+import inspect
+import math
+import sys
+import time
+import tkinter as tk
+from tkinter import ttk
+
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+
+from .gantt import plot_gantt
+from .replay import Replay
+
+# about 60 frames a second
+FRAME_MS = 16
+
+# algorithms whose ready queue is best shown shortest remaining time first
+REMAINING_ORDER = ('sjf', 'srtf', 'sjf_smp', 'srtf_smp')
+
+
+def steps(limit):
+    """1, 2, 5, 10, 20, 50, ... up to limit."""
+    values = []
+    scale = 1
+    while scale <= limit:
+        values.extend(v for v in (scale, 2 * scale, 5 * scale) if v <= limit)
+        scale *= 10
+    return values
+
+
+class ReplayWindow:
+    def __init__(self, root, tasks, segments, burst_times, arrival_times=None, cores=None, title='Replay',
+                 queue_order='arrival'):
+        self.root = root
+        self.root.title(title)
+
+        self.main_frame = ttk.Frame(self.root, padding="10")
+        self.main_frame.grid(column=0, row=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+        figure = Figure(figsize=(10, 5))
+        self.canvas = FigureCanvasTkAgg(figure, master=self.main_frame)
+        self.canvas.get_tk_widget().grid(column=0, row=0, pady=5)
+        self.renderer = plot_gantt(figure.add_subplot(111), tasks, segments, title, cores=cores)
+
+        # running jobs and ready queue; a Tk label redraws far faster than text on the canvas
+        self.state = ttk.Label(self.main_frame, font='TkFixedFont', anchor=tk.NW, justify=tk.LEFT, wraplength=900)
+        self.state.grid(column=0, row=1, sticky=(tk.W, tk.E), pady=5)
+
+        self.replay = Replay(self.renderer, tasks, segments, burst_times, arrival_times, cores, queue_order,
+                             on_state=self.show_state)
+        self.create_controls()
+        self.last_frame = None
+        self.frame_seconds = None
+        self.syncing = False
+        self.canvas.draw()
+
+    def create_controls(self):
+        controls = ttk.Frame(self.main_frame)
+        controls.grid(column=0, row=2, sticky=(tk.W, tk.E), pady=5)
+        replay = self.replay
+        span = replay.end_time - replay.start_time
+
+        self.play_button = ttk.Button(controls, text="Play", width=6, command=self.toggle)
+        self.play_button.pack(side=tk.LEFT, padx=5)
+
+        ttk.Label(controls, text="Ticks/s:").pack(side=tk.LEFT)
+        self.speed = ttk.Combobox(controls, values=steps(max(span, 1)), width=9)
+        self.speed.set(f"{replay.speed:g}")
+        self.speed.bind('<<ComboboxSelected>>', self.set_speed)
+        self.speed.bind('<Return>', self.set_speed)
+        self.speed.pack(side=tk.LEFT, padx=5)
+
+        ttk.Label(controls, text="Window:").pack(side=tk.LEFT)
+        self.window = ttk.Combobox(controls, values=['all'] + steps(max(span, 1)), width=9, state='readonly')
+        self.window.set('all')
+        self.window.bind('<<ComboboxSelected>>', self.set_window)
+        self.window.pack(side=tk.LEFT, padx=5)
+
+        self.scrub = ttk.Scale(controls, from_=replay.start_time, to=max(replay.end_time, replay.start_time + 1),
+                               length=400, command=self.on_scrub)
+        self.scrub.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
+
+        self.clock = ttk.Label(controls, width=24)
+        self.clock.pack(side=tk.LEFT, padx=5)
+
+    def show_state(self, text):
+        self.state.configure(text=text)
+
+    def set_speed(self, event=None):
+        try:
+            speed = float(self.speed.get())
+        except ValueError:
+            speed = 0
+        if speed > 0:
+            self.replay.speed = speed
+        else:
+            self.speed.set(f"{self.replay.speed:g}")
+
+    def set_window(self, event=None):
+        replay = self.replay
+        ax = self.renderer.ax
+        if self.window.get() == 'all':
+            ax.set_xlim(replay.start_time, max(replay.end_time, replay.start_time + 1))
+        else:
+            width = int(self.window.get())
+            ax.set_xlim(replay.time - 0.05 * width, replay.time + 0.95 * width)
+        self.canvas.draw_idle()
+
+    def on_scrub(self, value):
+        # the scale also calls back when tick() moves it
+        if not self.syncing:
+            self.replay.seek(float(value))
+            self.show_clock()
+
+    def toggle(self):
+        if self.replay.playing:
+            self.replay.pause()
+            self.play_button.configure(text="Play")
+            return
+        self.replay.play()
+        self.play_button.configure(text="Pause")
+        self.last_frame = time.perf_counter()
+        self.root.after(FRAME_MS, self.tick)
+
+    def tick(self):
+        now = time.perf_counter()
+        elapsed = now - self.last_frame
+        self.last_frame = now
+        # smoothed frame interval for the frame-rate readout
+        self.frame_seconds = elapsed if self.frame_seconds is None else 0.9 * self.frame_seconds + 0.1 * elapsed
+        playing = self.replay.step(elapsed)
+        self.syncing = True
+        self.scrub.set(self.replay.time)
+        self.syncing = False
+        self.show_clock()
+        if playing:
+            # aim for the next frame FRAME_MS after this one started, not after it finished
+            spent_ms = (time.perf_counter() - now) * 1000
+            self.root.after(max(1, int(FRAME_MS - spent_ms)), self.tick)
+        else:
+            self.play_button.configure(text="Play")
+
+    def show_clock(self):
+        text = f"t = {math.floor(self.replay.time)}"
+        if self.replay.playing and self.frame_seconds:
+            text += f"  {1 / self.frame_seconds:.0f} fps"
+        self.clock.configure(text=text)
+
+
+def main(argv=None):
+    from .cli import run_workload, select_engines
+    from .sweep import parse_value, resolve_workload
+
+    parser = argparse.ArgumentParser(prog='python -m scheduler.tkreplay', description=__doc__.splitlines()[0])
+    parser.add_argument('workload', help="workload file or gen:<distribution>:<jobs>:<seed> spec")
+    parser.add_argument('-a', '--algorithm', default='srtf')
+    parser.add_argument('-p', '--param', action='append', metavar='NAME=VALUE',
+                        help="engine parameter, passed if the engine takes it; repeat for several")
+    parser.add_argument('--backend', choices=('auto', 'python', 'numpy'), default='auto')
+    args = parser.parse_args(argv)
+
+    engines = select_engines(args.backend)
+    if args.algorithm not in engines:
+        parser.error(f"unknown algorithm: {args.algorithm}")
+    accepted = inspect.signature(engines[args.algorithm]).parameters
+    params = {}
+    for arg in args.param or ():
+        name, _, value = arg.partition('=')
+        if name in accepted:
+            params[name] = parse_value(value)
+
+    workload = resolve_workload(args.workload)
+    segments, _ = run_workload(workload, args.algorithm, engines, **params)
+    root = tk.Tk()
+    ReplayWindow(root, workload.tasks, segments, workload.burst_times, workload.arrival_times,
+                 getattr(segments, 'cores', None), f"{args.workload} {args.algorithm}",
+                 'remaining' if args.algorithm in REMAINING_ORDER else 'arrival')
+    root.mainloop()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
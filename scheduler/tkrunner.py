@@ -0,0 +1,156 @@
+"""Run scheduling work off the Tk mainloop.
+
+A job runs on a worker thread and reports progress through a callback. Results,
+errors and progress travel back over a queue that the mainloop drains with
+root.after, so no Tk call ever happens off the main thread. Only one job is
+live at a time: submitting a new one supersedes the running job, whose
+progress callback then raises Cancelled and whose late results are dropped.
+
+Unlike the rest of the package this module needs tkinter.
+"""
+import queue
+import threading
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+POLL_MS = 50
+
+
+class Cancelled(Exception):
+    """Raised from a job's progress callback once the job is cancelled or superseded."""
+
+
+class BackgroundRunner:
+    def __init__(self, root, on_progress=None, on_busy=None):
+        self.root = root
+        self.on_progress = on_progress
+        self.on_busy = on_busy
+        self.messages = queue.Queue()
+        self.generation = 0
+        self.cancel_event = None
+        self.callbacks = None
+        self.polling = False
+
+    @property
+    def busy(self):
+        return self.cancel_event is not None
+
+    def submit(self, fn, *args, on_done, on_error=None):
+        """Run fn(*args, progress=...) on a worker thread and pass its result to on_done."""
+        self.cancel()
+        self.generation += 1
+        generation = self.generation
+        cancel_event = threading.Event()
+        self.cancel_event = cancel_event
+        self.callbacks = (on_done, on_error)
+
+        def progress(fraction):
+            if cancel_event.is_set():
+                raise Cancelled()
+            self.messages.put((generation, 'progress', fraction))
+
+        def work():
+            try:
+                result = fn(*args, progress=progress)
+            except Cancelled:
+                return
+            except Exception as e:
+                self.messages.put((generation, 'error', e))
+                return
+            self.messages.put((generation, 'done', result))
+
+        threading.Thread(target=work, daemon=True).start()
+        self.set_busy(True)
+        if not self.polling:
+            self.polling = True
+            self.root.after(POLL_MS, self.poll)
+
+    def cancel(self):
+        if self.cancel_event is not None:
+            self.cancel_event.set()
+            self.cancel_event = None
+            self.set_busy(False)
+
+    def set_busy(self, busy):
+        if self.on_busy:
+            self.on_busy(busy)
+
+    def poll(self):
+        while True:
+            try:
+                generation, kind, payload = self.messages.get_nowait()
+            except queue.Empty:
+                break
+            if generation != self.generation or self.cancel_event is None:
+                # left over from a superseded or cancelled job
+                continue
+            if kind == 'progress':
+                if self.on_progress:
+                    self.on_progress(payload)
+                continue
+
+            on_done, on_error = self.callbacks
+            self.cancel_event = None
+            self.set_busy(False)
+            if kind == 'done':
+                on_done(payload)
+            elif on_error:
+                on_error(payload)
+            else:
+                self.root.report_callback_exception(type(payload), payload, payload.__traceback__)
+
+        if self.busy:
+            self.root.after(POLL_MS, self.poll)
+        else:
+            self.polling = False
+
+
+class RunControls(ttk.Frame):
+    """Generate button, Cancel button and progress bar driving a BackgroundRunner."""
+
+    def __init__(self, master, text, command, **kwargs):
+        super().__init__(master, **kwargs)
+        self.start_button = ttk.Button(self, text=text, command=command)
+        self.start_button.pack(side=tk.LEFT, padx=5)
+        self.cancel_button = ttk.Button(self, text="Cancel", command=self.cancel, state='disabled')
+        self.cancel_button.pack(side=tk.LEFT, padx=5)
+        self.progress = ttk.Progressbar(self, mode='determinate', maximum=1.0, length=150)
+        self.progress.pack(side=tk.LEFT, padx=5)
+        self.runner = BackgroundRunner(self.winfo_toplevel(), self.show_progress, self.show_busy)
+
+    def submit(self, fn, *args, on_done, on_error=None):
+        self.runner.submit(fn, *args, on_done=on_done, on_error=on_error or self.show_error)
+
+    def cancel(self):
+        self.runner.cancel()
+
+    def show_progress(self, fraction):
+        if str(self.progress['mode']) != 'determinate':
+            self.progress.stop()
+            self.progress.configure(mode='determinate')
+        self.progress['value'] = fraction
+
+    def show_busy(self, busy):
+        self.cancel_button.configure(state='normal' if busy else 'disabled')
+        self.progress.stop()
+        if busy:
+            # indeterminate until the job reports its first fraction
+            self.progress.configure(mode='indeterminate')
+            self.progress.start(POLL_MS)
+        else:
+            self.progress.configure(mode='determinate')
+            self.progress['value'] = 0
+
+    def show_error(self, error):
+        messagebox.showerror("Error", str(error))
+
+
+class StatusBar(ttk.Label):
+    """One line at the bottom of a window; shows the timings and counts of the last run."""
+
+    def __init__(self, master, **kwargs):
+        super().__init__(master, anchor=tk.W, relief=tk.SUNKEN, padding=(5, 2), **kwargs)
+
+    def show_profile(self, profile):
+        profile.finish()
+        self.configure(text=profile.status())
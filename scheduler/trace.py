@@ -0,0 +1,202 @@
+"""Columnar workloads and the memory-mappable binary trace format.
+
+    python -m scheduler.trace jobs.csv jobs.trace
+
+A ColumnarWorkload keeps each job as four int64 columns (task id, arrival,
+burst, priority) plus a table of distinct task names, instead of one Python
+str and two ints per job. A .trace file is those columns laid out back to
+back after a fixed header:
+
+    header      8s magic, u32 version, u32 flags, i64 jobs, i64 names
+    ids         i64[jobs]      index into the name table
+    bursts      i64[jobs]
+    arrivals    i64[jobs]      if flags & HAS_ARRIVALS
+    priorities  i64[jobs]      if flags & HAS_PRIORITIES
+    offsets     i64[names + 1] byte offsets into the name data
+    name data   UTF-8
+
+All integers are little-endian and every column starts on an 8-byte boundary,
+so open_trace() maps the file and hands out memoryviews over it: opening a
+trace takes the same time whatever its length, and the engines index the
+mapped columns directly (NumPy wraps them without copying).
+"""
+import argparse
+import mmap
+import struct
+import sys
+from array import array
+
+from .workload import Workload, load_workload, save_workload
+
+MAGIC = b'SCHEDTR\0'
+VERSION = 1
+HEADER = struct.Struct('<8sIIqq')
+
+HAS_ARRIVALS = 1
+HAS_PRIORITIES = 2
+
+ITEM = array('q').itemsize
+
+
+def int64_column(values):
+    """values as a buffer of native int64, without copying if it already is one."""
+    if isinstance(values, memoryview) and values.format == 'q':
+        return values
+    if isinstance(values, array) and values.typecode == 'q':
+        return values
+    if hasattr(values, 'astype'):
+        return values.astype('int64', copy=False)
+    return array('q', values)
+
+
+class NameTable:
+    """Read-only list of names stored as UTF-8 data plus byte offsets."""
+
+    def __init__(self, offsets, data):
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return str(self.data[self.offsets[i]:self.offsets[i + 1]], 'utf-8')
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+
+class TaskNames:
+    """Per-job task names looked up through the id column."""
+
+    def __init__(self, ids, names):
+        self.ids = ids
+        self.names = names
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.names[task_id] for task_id in self.ids[i]]
+        return self.names[self.ids[i]]
+
+    def __iter__(self):
+        names = self.names
+        return (names[task_id] for task_id in self.ids)
+
+
+class ColumnarWorkload(Workload):
+    """Workload backed by int64 columns and an interned name table.
+
+    Drop-in for Workload: tasks, burst_times and arrival_times behave like
+    sequences, so the engines, the CLI and the sweep accept either.
+    """
+    __slots__ = ('ids', 'names', 'buffer')
+
+    def __init__(self, ids, names, burst_times, arrival_times=None, priorities=None, buffer=None):
+        super().__init__(TaskNames(ids, names), burst_times, arrival_times, priorities)
+        self.ids = ids
+        self.names = names
+        # the mapping the columns live in, kept open as long as the workload is
+        self.buffer = buffer
+
+    @classmethod
+    def from_workload(cls, workload, priorities=None):
+        """Intern the task names of any workload and copy its times into int64 arrays."""
+        if isinstance(workload, ColumnarWorkload):
+            return workload
+        index = {}
+        ids = array('q', [index.setdefault(name, len(index)) for name in workload.tasks])
+        arrival_times = workload.arrival_times
+        if priorities is None:
+            priorities = workload.priorities
+        return cls(ids, list(index), int64_column(workload.burst_times),
+                   None if arrival_times is None else int64_column(arrival_times),
+                   None if priorities is None else int64_column(priorities))
+
+
+def save_trace(workload, path, priorities=None):
+    workload = ColumnarWorkload.from_workload(workload, priorities)
+    names = [name.encode() for name in workload.names]
+    offsets = array('q', [0])
+    for name in names:
+        offsets.append(offsets[-1] + len(name))
+
+    columns = [workload.ids, workload.burst_times]
+    flags = 0
+    if workload.arrival_times is not None:
+        flags |= HAS_ARRIVALS
+        columns.append(workload.arrival_times)
+    if workload.priorities is not None:
+        flags |= HAS_PRIORITIES
+        columns.append(workload.priorities)
+    columns.append(offsets)
+
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, flags, len(workload), len(names)))
+        for column in columns:
+            column = int64_column(column)
+            if sys.byteorder == 'big':
+                column = array('q', column)
+                column.byteswap()
+            f.write(column)
+        f.write(b''.join(names))
+
+
+def open_trace(path):
+    """Map a .trace file and return a ColumnarWorkload viewing it in place."""
+    with open(path, 'rb') as f:
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise ValueError("empty trace file")
+    view = memoryview(buffer)
+    if len(view) < HEADER.size:
+        raise ValueError("truncated trace header")
+    magic, version, flags, jobs, names = HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise ValueError("not a scheduler trace file")
+    if version != VERSION:
+        raise ValueError(f"unsupported trace version {version}")
+
+    offset = HEADER.size
+
+    def column(count):
+        nonlocal offset
+        end = offset + count * ITEM
+        if end > len(view):
+            raise ValueError("truncated trace file")
+        values = view[offset:end].cast('q')
+        offset = end
+        if sys.byteorder == 'big':
+            values = array('q', values)
+            values.byteswap()
+        return values
+
+    ids = column(jobs)
+    burst_times = column(jobs)
+    arrival_times = column(jobs) if flags & HAS_ARRIVALS else None
+    priorities = column(jobs) if flags & HAS_PRIORITIES else None
+    offsets = column(names + 1)
+    data = view[offset:offset + offsets[-1]]
+    if len(data) != offsets[-1]:
+        raise ValueError("truncated trace name table")
+    return ColumnarWorkload(ids, NameTable(offsets, data), burst_times, arrival_times, priorities, buffer)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m scheduler.trace', description="Convert between workload formats.")
+    parser.add_argument('input', help="workload file (.csv, .json or .trace)")
+    parser.add_argument('output', help="output file; the extension picks the format")
+    args = parser.parse_args(argv)
+    try:
+        save_workload(load_workload(args.input), args.output)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"error: {args.input}: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
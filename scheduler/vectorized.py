@@ -0,0 +1,127 @@
+"""NumPy backend for the non-preemptive schedulers.
+
+FCFS and SJF run jobs back to back in a fixed order, so their completion times
+are a cumulative sum over that order. With arrival times each job starts at
+max(previous finish, arrival), which unrolls to
+
+    finish[k] = cumsum[k] + max(0, max_{j <= k} (arrival[j] - cumsum[j - 1]))
+
+i.e. a running maximum over the idle gaps. Results match the Python engines in
+scheduler.core exactly, including the stable tie-breaking of sorted().
+"""
+import numpy as np
+
+from .core import SegmentList
+
+
+def segment_columns(segments):
+    """Zero-copy int64 views of a SegmentList's task, start and end columns."""
+    return (np.frombuffer(segments.tasks, dtype=np.int64),
+            np.frombuffer(segments.starts, dtype=np.int64),
+            np.frombuffer(segments.ends, dtype=np.int64))
+
+
+def task_times(segments, n):
+    """First start and finish time of each of the n tasks, like core.task_times."""
+    tasks, starts, ends = segment_columns(segments)
+    first_starts = np.zeros(n, dtype=np.int64)
+    finish_times = np.zeros(n, dtype=np.int64)
+    # with repeated indices the last write wins, so writing in reverse keeps the first start
+    first_starts[tasks[::-1]] = starts[::-1]
+    finish_times[tasks] = ends
+    return first_starts, finish_times
+
+
+def run_in_order(order, burst_times, arrival_times=None, start_time=0):
+    """Start and finish times, in schedule order, of jobs run back to back from start_time."""
+    bursts = np.asarray(burst_times)[order]
+    finish = np.cumsum(bursts)
+    if start_time:
+        finish += start_time
+    if arrival_times is not None:
+        idle = np.asarray(arrival_times)[order] - (finish - bursts)
+        np.maximum.accumulate(idle, out=idle)
+        np.maximum(idle, 0, out=idle)
+        finish += idle
+    return finish - bursts, finish
+
+
+def stable_argsort(keys):
+    """argsort(kind='stable'), narrowing small-range integer keys to 16 bits so NumPy radix-sorts them."""
+    keys = np.asarray(keys)
+    if np.all(keys[1:] >= keys[:-1]):
+        return np.arange(keys.size)
+    if keys.size and keys.dtype.kind in 'iu':
+        low = keys.min()
+        if keys.max() - low <= 0xFFFF:
+            keys = (keys - low).astype(np.uint16)
+    return np.argsort(keys, kind='stable')
+
+
+def fcfs_order(burst_times, arrival_times=None):
+    if arrival_times is None:
+        return np.arange(len(burst_times))
+    return stable_argsort(arrival_times)
+
+
+def sjf_order(burst_times, arrival_times=None):
+    return stable_argsort(burst_times)
+
+
+def schedule_arrays(order, burst_times, arrival_times=None):
+    """Per-task start, finish, waiting and turnaround arrays for a fixed order."""
+    bursts = np.asarray(burst_times)
+    start_sorted, _ = run_in_order(order, bursts, arrival_times)
+    start = np.empty_like(start_sorted)
+    start[order] = start_sorted
+    finish = start + bursts
+    if arrival_times is None:
+        waiting, turnaround = start, finish
+    else:
+        waiting = start - np.asarray(arrival_times)
+        turnaround = waiting + bursts
+    return {
+        'order': order,
+        'start': start,
+        'finish': finish,
+        'waiting': waiting,
+        'turnaround': turnaround,
+    }
+
+
+def fcfs_arrays(burst_times, arrival_times=None):
+    return schedule_arrays(fcfs_order(burst_times, arrival_times), burst_times, arrival_times)
+
+
+def sjf_arrays(burst_times, arrival_times=None):
+    return schedule_arrays(sjf_order(burst_times, arrival_times), burst_times, arrival_times)
+
+
+def to_segments(order, burst_times, arrival_times=None):
+    start, finish = run_in_order(order, burst_times, arrival_times)
+    return SegmentList.from_columns(
+        np.asarray(order, dtype=np.int64), start.astype(np.int64), finish.astype(np.int64))
+
+
+def simulate_fcfs(burst_times, arrival_times=None):
+    return to_segments(fcfs_order(burst_times, arrival_times), burst_times, arrival_times)
+
+
+def simulate_sjf(burst_times, arrival_times=None):
+    return to_segments(sjf_order(burst_times, arrival_times), burst_times, arrival_times)
+
+
+def calculate_finish_times(durations):
+    return np.cumsum(durations)
+
+
+def calculate_waiting_and_turnaround_times(durations):
+    durations = np.asarray(durations)
+    turnaround_times = np.cumsum(durations)
+    return turnaround_times - durations, turnaround_times
+
+
+ALGORITHMS = {
+    'fcfs': simulate_fcfs,
+    'sjf': simulate_sjf,
+}
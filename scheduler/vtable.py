@@ -0,0 +1,130 @@
+"""Virtual result table for the Tk windows.
+
+A drop-in replacement for a fully populated ttk.Treeview: the data stays in
+column arrays and only the rows that fit in the widget exist as Treeview
+items. Scrolling rewrites the values of those few items, and clicking a
+heading sorts by that column with a NumPy argsort over the whole column.
+
+Unlike the rest of the package this module needs tkinter and NumPy.
+"""
+import tkinter as tk
+from tkinter import ttk
+
+import numpy as np
+
+
+class VirtualTable(ttk.Frame):
+    def __init__(self, master, columns, height=10, **kwargs):
+        super().__init__(master, **kwargs)
+        self.columns = tuple(columns)
+        self.height = height
+        self.data = [np.empty(0) for _ in self.columns]
+        self.order = np.arange(0)
+        self.offset = 0
+        self.sort_column = None
+        self.descending = False
+        # a scheduler.profiling.Profile that counts the rows written, if set
+        self.profile = None
+
+        self.tree = ttk.Treeview(self, columns=self.columns, show='headings', height=height, selectmode='none')
+        for column in self.columns:
+            self.tree.heading(column, text=column, command=lambda c=column: self.toggle_sort(c))
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        self.tree.grid(column=0, row=0, sticky='nsew')
+        self.scrollbar.grid(column=1, row=0, sticky='ns')
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.tree.bind(sequence, self.on_wheel)
+
+    def __len__(self):
+        return len(self.order)
+
+    def set_data(self, columns):
+        """Show new data, given as one sequence per column."""
+        self.data = [np.asarray(values) for values in columns]
+        self.order = np.arange(len(self.data[0]) if self.data else 0)
+        self.offset = 0
+        if self.sort_column is not None:
+            self.sort_by(self.sort_column, self.descending)
+        else:
+            self.render()
+
+    def patch(self, first, columns):
+        """Overwrite rows first, first + 1, ... of the data; None leaves a column as is."""
+        for i, values in enumerate(columns):
+            if values is None:
+                continue
+            values = np.asarray(values)
+            column = self.data[i]
+            if values.dtype.kind == 'U' and column.dtype.kind == 'U' and values.itemsize > column.itemsize:
+                # widen fixed-width string columns so longer names are not truncated
+                column = self.data[i] = column.astype(values.dtype)
+            column[first:first + len(values)] = values
+        if self.sort_column is not None:
+            self.sort_by(self.sort_column, self.descending)
+        else:
+            self.render()
+
+    def clear(self):
+        self.set_data([np.empty(0) for _ in self.columns])
+
+    def sort_by(self, column, descending=False):
+        self.sort_column = column
+        self.descending = descending
+        keys = self.data[self.columns.index(column)]
+        self.order = np.argsort(keys, kind='stable')
+        if descending:
+            self.order = self.order[::-1]
+        self.offset = 0
+        self.render()
+
+    def toggle_sort(self, column):
+        self.sort_by(column, not self.descending if column == self.sort_column else False)
+
+    def visible_rows(self):
+        return min(self.height, len(self.order))
+
+    def render(self):
+        items = self.tree.get_children()
+        wanted = self.visible_rows()
+        if len(items) > wanted:
+            self.tree.delete(*items[wanted:])
+            items = items[:wanted]
+        for _ in range(wanted - len(items)):
+            self.tree.insert('', 'end')
+        items = self.tree.get_children()
+
+        rows = self.order[self.offset:self.offset + wanted]
+        values = [column[rows].tolist() for column in self.data]
+        for item, row_values in zip(items, zip(*values)):
+            self.tree.item(item, values=row_values)
+        if self.profile is not None:
+            self.profile.count('rows inserted', len(rows))
+
+        total = len(self.order)
+        if total:
+            self.scrollbar.set(self.offset / total, (self.offset + wanted) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def scroll_to(self, offset):
+        offset = max(0, min(int(offset), len(self.order) - self.visible_rows()))
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+
+    def yview(self, *args):
+        if args[0] == 'moveto':
+            self.scroll_to(float(args[1]) * len(self.order))
+        elif args[0] == 'scroll':
+            step = int(args[1]) * (self.visible_rows() if args[2] == 'pages' else 1)
+            self.scroll_to(self.offset + step)
+
+    def on_wheel(self, event):
+        if event.num == 4 or getattr(event, 'delta', 0) > 0:
+            self.scroll_to(self.offset - 3)
+        else:
+            self.scroll_to(self.offset + 3)
+        return 'break'
@@ -0,0 +1,152 @@
+"""Workload parsing and loading for the GUIs and the batch CLI."""
+import csv
+import json
+import os
+
+
+class Workload:
+    __slots__ = ('tasks', 'arrival_times', 'burst_times', 'priorities')
+
+    def __init__(self, tasks, burst_times, arrival_times=None, priorities=None):
+        if len(tasks) != len(burst_times):
+            raise ValueError("Number of tasks and burst times must be the same.")
+        if arrival_times is not None and len(arrival_times) != len(tasks):
+            raise ValueError("Number of tasks, arrival times, and burst times must be the same.")
+        if priorities is not None and len(priorities) != len(tasks):
+            raise ValueError("Number of tasks and priorities must be the same.")
+        self.tasks = tasks
+        self.burst_times = burst_times
+        self.arrival_times = arrival_times
+        self.priorities = priorities
+
+    def __len__(self):
+        return len(self.tasks)
+
+
+def parse_names(text):
+    return [name.strip() for name in text.split(',')]
+
+
+def parse_ints(text):
+    """Parse a comma-separated list of integers, raising ValueError on junk."""
+    return [int(value.strip()) for value in text.split(',')]
+
+
+def parse_task_bursts(text):
+    """Parse the 'T1:10, T2:8, T3:12' format into task names and burst times."""
+    tasks = []
+    burst_times = []
+    for pair in text.split(','):
+        task, burst_time = pair.strip().split(':')
+        tasks.append(task.strip())
+        burst_times.append(int(burst_time.strip()))
+    return tasks, burst_times
+
+
+def check_bursts(burst_times):
+    """Raise ValueError naming the first job with a burst time below 1; the engines give such jobs no segment."""
+    for number, burst in enumerate(burst_times, 1):
+        if burst <= 0:
+            raise ValueError(f"job {number}: burst time must be positive, got {burst}")
+
+
+def load_csv(path):
+    tasks = []
+    arrival_times = []
+    burst_times = []
+    priorities = []
+    with open(path, newline='') as f:
+        reader = csv.DictReader(f)
+        if reader.fieldnames is None or 'burst' not in reader.fieldnames:
+            raise ValueError("expected a header with at least a 'burst' column")
+        has_arrival = 'arrival' in reader.fieldnames
+        has_priority = 'priority' in reader.fieldnames
+        for row in reader:
+            tasks.append(row.get('task') or f"T{len(tasks) + 1}")
+            burst_times.append(int(row['burst']))
+            if burst_times[-1] <= 0:
+                raise ValueError(f"line {reader.line_num}: burst time must be positive, got {burst_times[-1]}")
+            if has_arrival:
+                arrival_times.append(int(row['arrival']))
+            if has_priority:
+                priorities.append(int(row['priority']))
+    return Workload(tasks, burst_times, arrival_times if has_arrival else None,
+                    priorities if has_priority else None)
+
+
+def load_json(path):
+    with open(path) as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        burst_times = [int(b) for b in data['burst_times']]
+        check_bursts(burst_times)
+        tasks = data.get('tasks') or [f"T{i + 1}" for i in range(len(burst_times))]
+        arrival_times = data.get('arrival_times')
+        if arrival_times is not None:
+            arrival_times = [int(a) for a in arrival_times]
+        priorities = data.get('priorities')
+        if priorities is not None:
+            priorities = [int(p) for p in priorities]
+        return Workload(tasks, burst_times, arrival_times, priorities)
+
+    tasks = []
+    arrival_times = []
+    burst_times = []
+    priorities = []
+    for job in data:
+        tasks.append(job.get('task') or f"T{len(tasks) + 1}")
+        arrival_times.append(int(job.get('arrival', 0)))
+        burst_times.append(int(job['burst']))
+        priorities.append(int(job.get('priority', 0)))
+    check_bursts(burst_times)
+    return Workload(tasks, burst_times, arrival_times, priorities)
+
+
+def load_trace(path):
+    # imported here because scheduler.trace builds on Workload
+    from .trace import open_trace
+    return open_trace(path)
+
+
+def load_swf(path):
+    from . import importer
+    return importer.load_swf(path)
+
+
+LOADERS = {
+    '.csv': load_csv,
+    '.json': load_json,
+    '.swf': load_swf,
+    '.trace': load_trace,
+}
+
+
+def load_workload(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in LOADERS:
+        raise ValueError(f"unsupported workload format '{ext}'")
+    return LOADERS[ext](path)
+
+
+def save_workload(workload, path):
+    if path.lower().endswith('.trace'):
+        from .trace import save_trace
+        save_trace(workload, path)
+        return
+    arrival_times = workload.arrival_times or [0] * len(workload)
+    if path.lower().endswith('.json'):
+        data = {'tasks': list(workload.tasks), 'arrival_times': list(arrival_times),
+                'burst_times': list(workload.burst_times)}
+        if workload.priorities is not None:
+            data['priorities'] = list(workload.priorities)
+        with open(path, 'w') as f:
+            json.dump(data, f)
+        return
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        if workload.priorities is None:
+            writer.writerow(['task', 'arrival', 'burst'])
+            writer.writerows(zip(workload.tasks, arrival_times, workload.burst_times))
+        else:
+            writer.writerow(['task', 'arrival', 'burst', 'priority'])
+            writer.writerows(zip(workload.tasks, arrival_times, workload.burst_times, workload.priorities))
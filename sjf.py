@@ -1,8 +1,39 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import random
+from tkinter import ttk
+import numpy as np
+
+from scheduler import parse_ints
+from scheduler.incremental import reschedule
+from scheduler.profiling import Profile
+from scheduler.tkcanvas import LazyCanvas
+from scheduler.tkrunner import RunControls, StatusBar
+from scheduler.vtable import VirtualTable
+
+
+def compute_schedule(tasks_text, arrival_times_text, burst_times_text, previous_tasks, previous, profile, progress):
+    # runs on the worker thread: no Tk calls here
+    with profile.phase('parse'):
+        tasks = tasks_text.split(',')
+        try:
+            arrival_times = parse_ints(arrival_times_text)
+            burst_times = parse_ints(burst_times_text)
+        except ValueError:
+            raise ValueError("Invalid input. Please enter numbers for arrival times and burst times.")
+
+    if not all(tasks) or not all(arrival_times) or not all(burst_times):
+        raise ValueError("All input fields must be non-empty.")
+
+    if len(tasks) != len(arrival_times) or len(tasks) != len(burst_times):
+        raise ValueError("Number of tasks, arrival times, and burst times must be the same.")
+
+    progress(0.5)
+    # with the same task names, edits to a few times only patch the previous schedule
+    if tasks != previous_tasks:
+        previous = None
+    with profile.phase('schedule'):
+        schedule, changed = reschedule(previous, burst_times, arrival_times, policy='sjf')
+    profile.count_schedule(schedule.segments())
+    return tasks, arrival_times, burst_times, schedule, changed
 
 class SJFApp:
     def __init__(self, root):
@@ -12,19 +43,26 @@ class SJFApp:
         self.tasks = []
         self.arrival_times = []
         self.burst_times = []
+        self.schedule = None
+        self.renderer = None
+        self.profile = None
 
         self.main_frame = ttk.Frame(self.root, padding="10")
         self.main_frame.grid(column=0, row=0, sticky=(tk.W, tk.E, tk.N, tk.S))
 
         self.create_input_widgets()
 
-        self.gantt_canvas = FigureCanvasTkAgg(self.create_gantt_chart(), master=self.main_frame)
+        self.gantt_canvas = self.create_gantt_chart()
         self.gantt_canvas.get_tk_widget().grid(column=0, row=3, columnspan=2, pady=10)
 
         self.create_table()
 
-        self.start_button = ttk.Button(self.main_frame, text="Generate Gantt Chart", command=self.generate_gantt_chart)
-        self.start_button.grid(column=0, row=4, columnspan=2, pady=10)
+        self.controls = RunControls(self.main_frame, text="Generate Gantt Chart", command=self.generate_gantt_chart)
+        self.controls.grid(column=0, row=4, columnspan=2, pady=10)
+        self.start_button = self.controls.start_button
+
+        self.status = StatusBar(self.main_frame)
+        self.status.grid(column=0, row=6, columnspan=2, sticky=(tk.W, tk.E))
 
     def create_input_widgets(self):
         ttk.Label(self.main_frame, text="Tasks (comma-separated):").grid(column=0, row=0, pady=5, padx=5, sticky=tk.W)
@@ -40,76 +78,59 @@ class SJFApp:
         self.burst_times_entry.grid(column=1, row=2, pady=5, padx=5, sticky=tk.W)
 
     def create_gantt_chart(self):
-        fig = Figure(figsize=(8, 4), tight_layout=True)
-        ax = fig.add_subplot(111)
-        return fig
+        # matplotlib is only imported once the first chart is drawn
+        return LazyCanvas(self.main_frame, figsize=(8, 4), tight_layout=True)
 
     def create_table(self):
-        self.tree = ttk.Treeview(self.main_frame, columns=('Task', 'Arrival Time', 'Burst Time', 'Start Time', 'Finish Time'), show='headings')
-        self.tree.heading('Task', text='Task')
-        self.tree.heading('Arrival Time', text='Arrival Time')
-        self.tree.heading('Burst Time', text='Burst Time')
-        self.tree.heading('Start Time', text='Start Time')
-        self.tree.heading('Finish Time', text='Finish Time')
+        self.tree = VirtualTable(self.main_frame, columns=('Task', 'Arrival Time', 'Burst Time', 'Start Time', 'Finish Time'))
         self.tree.grid(column=0, row=5, columnspan=2, pady=10)
 
     def generate_gantt_chart(self):
-        self.clear_gantt_chart()
-
-        tasks = self.tasks_entry.get().split(',')
-        arrival_times_str = self.arrival_times_entry.get().split(',')
-        burst_times_str = self.burst_times_entry.get().split(',')
-
-        try:
-            self.tasks = tasks
-            self.arrival_times = [int(time.strip()) for time in arrival_times_str]
-            self.burst_times = [int(time.strip()) for time in burst_times_str]
-        except ValueError:
-            messagebox.showerror("Error", "Invalid input. Please enter numbers for arrival times and burst times.")
-            return
-
-        if not all(self.tasks) or not all(self.arrival_times) or not all(self.burst_times):
-            messagebox.showerror("Error", "All input fields must be non-empty.")
-            return
-
-        if len(self.tasks) != len(self.arrival_times) or len(self.tasks) != len(self.burst_times):
-            messagebox.showerror("Error", "Number of tasks, arrival times, and burst times must be the same.")
-            return
-
-        sorted_tasks, sorted_arrival_times, sorted_burst_times = zip(*sorted(zip(self.tasks, self.arrival_times, self.burst_times), key=lambda x: x[2]))
-
-        self.plot_gantt_chart(sorted_tasks, sorted_arrival_times, sorted_burst_times)
-        self.update_table()
-
-    def plot_gantt_chart(self, sorted_tasks, sorted_arrival_times, sorted_burst_times):
-        current_time = 0
-        for task, arrival_time, burst_time in zip(sorted_tasks, sorted_arrival_times, sorted_burst_times):
-            if current_time < arrival_time:
-                current_time = arrival_time
-            self.gantt_canvas.figure.gca().barh(task, width=burst_time, left=current_time, color=self.get_random_color())
-            current_time += burst_time
-
-        self.gantt_canvas.figure.gca().set_xlabel('Time')
-        self.gantt_canvas.figure.gca().set_title('Gantt Chart')
+        # a click while a run is in flight supersedes that run
+        self.profile = Profile()
+        self.controls.submit(compute_schedule, self.tasks_entry.get(), self.arrival_times_entry.get(),
+                             self.burst_times_entry.get(), self.tasks, self.schedule, self.profile,
+                             on_done=self.show_schedule)
+
+    def show_schedule(self, result):
+        self.tasks, self.arrival_times, self.burst_times, self.schedule, changed = result
+        self.tree.profile = self.profile
+        if changed is None or self.renderer is None:
+            self.clear_gantt_chart()
+            with self.profile.phase('draw'):
+                self.plot_gantt_chart(self.schedule.segments())
+            with self.profile.phase('table'):
+                self.update_table()
+        elif changed.stop > changed.start:
+            self.renderer.profile = self.profile
+            with self.profile.phase('patch'):
+                self.patch_schedule(changed)
+        self.status.show_profile(self.profile)
+
+    def plot_gantt_chart(self, segments):
+        from scheduler.gantt import plot_gantt
+
+        self.renderer = plot_gantt(self.gantt_canvas.figure.gca(), self.tasks, segments, row_per_segment=True,
+                                   profile=self.profile)
         self.gantt_canvas.draw()
 
-    def get_random_color(self):
-        return "#{:06x}".format(random.randint(0, 0xFFFFFF))
+    def patch_schedule(self, changed):
+        # only the rows from the first moved job onward are rewritten
+        order = self.schedule.order[changed]
+        names = np.asarray(self.tasks, dtype=object)[order]
+        starts, finishes = self.schedule.starts[changed], self.schedule.finishes[changed]
+        self.renderer.patch(changed.start, starts, finishes, names)
+        self.gantt_canvas.draw_idle()
+        self.tree.patch(changed.start, [names.astype(str), np.asarray(self.arrival_times)[order],
+                                        np.asarray(self.burst_times)[order], starts, finishes])
 
     def clear_gantt_chart(self):
-        for patch in self.gantt_canvas.figure.gca().patches:
-            patch.remove()
+        self.gantt_canvas.figure.gca().clear()
 
     def update_table(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        current_time = 0
-        for i, task in enumerate(self.tasks):
-            start_time = max(current_time, self.arrival_times[i])
-            finish_time = start_time + self.burst_times[i]
-            self.tree.insert('', 'end', values=(task, self.arrival_times[i], self.burst_times[i], start_time, finish_time))
-            current_time = finish_time
+        tasks = self.schedule.order
+        self.tree.set_data([np.asarray(self.tasks)[tasks], np.asarray(self.arrival_times)[tasks],
+                            np.asarray(self.burst_times)[tasks], self.schedule.starts, self.schedule.finishes])
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -1,8 +1,38 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
-import random
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from tkinter import ttk
+import numpy as np
+
+from scheduler import parse_task_bursts
+from scheduler.incremental import reschedule
+from scheduler.profiling import Profile
+from scheduler.tkcanvas import LazyCanvas
+from scheduler.tkrunner import RunControls, StatusBar
+from scheduler.vtable import VirtualTable
+
+
+def compute_schedules(input_text, previous_tasks, previous, profile, progress):
+    # Runs on the worker thread, so errors are raised instead of shown
+    input_text = input_text.strip()
+    if not input_text:
+        raise ValueError("Please enter tasks and burst times.")
+
+    with profile.phase('parse'):
+        try:
+            tasks, burst_times = parse_task_bursts(input_text)
+        except ValueError:
+            raise ValueError("Invalid input format. Use 'Task: Burst Time' format (e.g., T1:10, T2:8).")
+
+    # Generate FCFS and SJF schedules, patching the previous ones if only burst times changed
+    if tasks != previous_tasks:
+        previous = {}
+    progress(0.0)
+    with profile.phase('schedule'):
+        fcfs = reschedule(previous.get('fcfs'), burst_times, policy='fcfs')
+        progress(0.5)
+        sjf = reschedule(previous.get('sjf'), burst_times, policy='sjf')
+    for schedule, _ in (fcfs, sjf):
+        profile.count_schedule(schedule.segments())
+    return tasks, burst_times, {'fcfs': fcfs, 'sjf': sjf}
 
 class SchedulerApp:
     def __init__(self, root):
@@ -11,6 +41,9 @@ class SchedulerApp:
 
         self.tasks = []
         self.burst_times = []
+        self.schedules = {}
+        self.renderers = {}
+        self.profile = None
 
         self.main_frame = ttk.Frame(self.root, padding="10")
         self.main_frame.grid(column=0, row=0, sticky=(tk.W, tk.E, tk.N, tk.S))
@@ -18,13 +51,17 @@ class SchedulerApp:
         self.create_input_widgets()
         self.create_output_widgets()
 
+        self.status = StatusBar(self.main_frame)
+        self.status.grid(column=0, row=4, columnspan=2, sticky=(tk.W, tk.E))
+
     def create_input_widgets(self):
         ttk.Label(self.main_frame, text="Tasks and Burst Times (e.g., T1:10, T2:8, T3:12):").grid(column=0, row=0, columnspan=2, pady=5, padx=5, sticky=tk.W)
         self.tasks_burst_entry = ttk.Entry(self.main_frame, width=50)
         self.tasks_burst_entry.grid(column=0, row=1, columnspan=2, pady=5, padx=5, sticky=tk.W)
 
-        self.start_button = ttk.Button(self.main_frame, text="Generate Schedule", command=self.generate_schedule)
-        self.start_button.grid(column=0, row=2, columnspan=2, pady=10)
+        self.controls = RunControls(self.main_frame, text="Generate Schedule", command=self.generate_schedule)
+        self.controls.grid(column=0, row=2, columnspan=2, pady=10)
+        self.start_button = self.controls.start_button
 
     def create_output_widgets(self):
         self.output_frame_left = ttk.Frame(self.main_frame)
@@ -34,126 +71,81 @@ class SchedulerApp:
         self.output_frame_right.grid(column=1, row=3, padx=10, pady=10, sticky='nsew')
 
         # FCFS Table and Gantt Chart
-        self.tree_fcfs = ttk.Treeview(self.output_frame_left, columns=('Task', 'Burst Time', 'Start Time', 'End Time'), show='headings')
-        self.tree_fcfs.heading('Task', text='Task')
-        self.tree_fcfs.heading('Burst Time', text='Burst Time')
-        self.tree_fcfs.heading('Start Time', text='Start Time')
-        self.tree_fcfs.heading('End Time', text='End Time')
+        self.tree_fcfs = VirtualTable(self.output_frame_left, columns=('Task', 'Burst Time', 'Start Time', 'End Time'))
         self.tree_fcfs.pack(side='top', expand=True, fill='both')
 
-        self.fig_fcfs = Figure(figsize=(5, 4))
-        self.ax_fcfs = self.fig_fcfs.add_subplot(111)
-        self.canvas_fcfs = FigureCanvasTkAgg(self.fig_fcfs, master=self.output_frame_left)
+        # the charts import matplotlib when they are first drawn
+        self.canvas_fcfs = LazyCanvas(self.output_frame_left, figsize=(5, 4))
         self.canvas_fcfs.get_tk_widget().pack(side='top', expand=True, fill='both')
 
         # SJF Table and Gantt Chart
-        self.tree_sjf = ttk.Treeview(self.output_frame_right, columns=('Task', 'Burst Time', 'Start Time', 'End Time'), show='headings')
-        self.tree_sjf.heading('Task', text='Task')
-        self.tree_sjf.heading('Burst Time', text='Burst Time')
-        self.tree_sjf.heading('Start Time', text='Start Time')
-        self.tree_sjf.heading('End Time', text='End Time')
+        self.tree_sjf = VirtualTable(self.output_frame_right, columns=('Task', 'Burst Time', 'Start Time', 'End Time'))
         self.tree_sjf.pack(side='top', expand=True, fill='both')
 
-        self.fig_sjf = Figure(figsize=(5, 4))
-        self.ax_sjf = self.fig_sjf.add_subplot(111)
-        self.canvas_sjf = FigureCanvasTkAgg(self.fig_sjf, master=self.output_frame_right)
+        self.canvas_sjf = LazyCanvas(self.output_frame_right, figsize=(5, 4))
         self.canvas_sjf.get_tk_widget().pack(side='top', expand=True, fill='both')
 
     def generate_schedule(self):
-        # Clear previous data
-        self.clear_output()
-
-        # Parse input for tasks and burst times
-        input_text = self.tasks_burst_entry.get().strip()
-        if not input_text:
-            messagebox.showerror("Error", "Please enter tasks and burst times.")
-            return
-
-        try:
-            task_burst_pairs = [pair.strip() for pair in input_text.split(',')]
-            self.tasks = []
-            self.burst_times = []
-
-            for pair in task_burst_pairs:
-                task, burst_time = pair.split(':')
-                self.tasks.append(task.strip())
-                self.burst_times.append(int(burst_time.strip()))
-
-        except ValueError:
-            messagebox.showerror("Error", "Invalid input format. Use 'Task: Burst Time' format (e.g., T1:10, T2:8).")
-            return
-
-        # Generate FCFS and SJF schedules
-        fcfs_schedule = self.schedule_fcfs()
-        sjf_schedule = self.schedule_sjf()
-
-        # Update FCFS table and chart
-        self.populate_table(self.tree_fcfs, fcfs_schedule)
-        self.plot_gantt_chart(self.ax_fcfs, fcfs_schedule, "FCFS Gantt Chart")
-
-        # Update SJF table and chart
-        self.populate_table(self.tree_sjf, sjf_schedule)
-        self.plot_gantt_chart(self.ax_sjf, sjf_schedule, "SJF Gantt Chart")
-
-    def schedule_fcfs(self):
-        schedule = []
-        current_time = 0
-
-        for task, burst_time in zip(self.tasks, self.burst_times):
-            start_time = current_time
-            end_time = current_time + burst_time
-            schedule.append((task, burst_time, start_time, end_time))
-            current_time = end_time
-
-        return schedule
-
-    def schedule_sjf(self):
-        tasks_with_burst = sorted(list(zip(self.tasks, self.burst_times)), key=lambda x: x[1])
-        schedule = []
-        current_time = 0
-
-        for task, burst_time in tasks_with_burst:
-            start_time = current_time
-            end_time = current_time + burst_time
-            schedule.append((task, burst_time, start_time, end_time))
-            current_time = end_time
-
-        return schedule
+        # Parse and schedule in the background; a second click supersedes the running job
+        self.profile = Profile()
+        self.controls.submit(compute_schedules, self.tasks_burst_entry.get(), self.tasks, self.schedules,
+                             self.profile, on_done=self.show_schedules)
+
+    def show_schedules(self, result):
+        self.tasks, self.burst_times, results = result
+        views = {
+            'fcfs': (self.tree_fcfs, self.canvas_fcfs, "FCFS Gantt Chart"),
+            'sjf': (self.tree_sjf, self.canvas_sjf, "SJF Gantt Chart"),
+        }
+        for policy, (schedule, changed) in results.items():
+            tree, canvas, title = views[policy]
+            tree.profile = self.profile
+            self.schedules[policy] = schedule
+            if changed is None or policy not in self.renderers:
+                # Update table and chart from scratch
+                with self.profile.phase('table'):
+                    self.populate_table(tree, schedule)
+                with self.profile.phase('draw'):
+                    self.renderers[policy] = self.plot_gantt_chart(canvas, schedule.segments(), title)
+            elif changed.stop > changed.start:
+                self.renderers[policy].profile = self.profile
+                with self.profile.phase('patch'):
+                    self.patch_schedule(tree, self.renderers[policy], schedule, changed)
+        self.status.show_profile(self.profile)
 
     def populate_table(self, tree, schedule):
-        for item in tree.get_children():
-            tree.delete(item)
-
-        for data in schedule:
-            tree.insert('', 'end', values=data)
-
-    def plot_gantt_chart(self, ax, schedule, title):
+        tasks = schedule.order
+        tree.set_data([np.asarray(self.tasks)[tasks], np.asarray(self.burst_times)[tasks],
+                       schedule.starts, schedule.finishes])
+
+    def patch_schedule(self, tree, renderer, schedule, changed):
+        tasks = schedule.order[changed]
+        names = np.asarray(self.tasks, dtype=object)[tasks]
+        starts, ends = schedule.starts[changed], schedule.finishes[changed]
+        tree.patch(changed.start, [names.astype(str), np.asarray(self.burst_times)[tasks], starts, ends])
+        renderer.patch(changed.start, starts, ends, names)
+        renderer.ax.figure.canvas.draw_idle()
+
+    def plot_gantt_chart(self, canvas, segments, title):
+        from scheduler.gantt import plot_gantt
+
+        ax = canvas.figure.gca()
         ax.clear()
 
-        task_names = [data[0] for data in schedule]
-        start_times = [data[2] for data in schedule]
-        durations = [data[1] for data in schedule]
-
-        colors = [self.get_random_color() for _ in task_names]  # Generate random colors for tasks
-
-        ax.barh(task_names, durations, left=start_times, color=colors)
-        ax.set_xlabel('Time')
-        ax.set_title(title)
+        renderer = plot_gantt(ax, self.tasks, segments, title, row_per_segment=True, profile=self.profile)
         ax.invert_yaxis()
 
-        ax.figure.canvas.draw()
-
-    def get_random_color(self):
-        return "#{:06x}".format(random.randint(0, 0xFFFFFF))
+        canvas.draw()
+        return renderer
 
     def clear_output(self):
-        self.tree_fcfs.delete(*self.tree_fcfs.get_children())
-        self.ax_fcfs.clear()
-        self.canvas_fcfs.draw()
-
-        self.tree_sjf.delete(*self.tree_sjf.get_children())
-        self.ax_sjf.clear()
-        self.canvas_sjf.draw()
+        self.schedules = {}
+        self.renderers = {}
+        for tree, canvas in ((self.tree_fcfs, self.canvas_fcfs), (self.tree_sjf, self.canvas_sjf)):
+            tree.clear()
+            if canvas.loaded:
+                canvas.figure.gca().clear()
+                canvas.draw()
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -1,8 +1,96 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import random
+from tkinter import ttk
+
+from scheduler import run_sjf, run_srtf
+from scheduler.cache import cached
+from scheduler.core import simulate_fcfs, simulate_mlfq, simulate_priority, simulate_round_robin
+from scheduler.profiling import Profile
+from scheduler.smp import CoreSegmentList, core_utilization, simulate_fcfs_smp, simulate_sjf_smp, simulate_srtf_smp
+from scheduler.tkcanvas import LazyCanvas
+from scheduler.tkrunner import RunControls, StatusBar
+from scheduler.metrics import describe_schedule, format_summary, task_arrays
+from scheduler.vtable import VirtualTable
+
+
+# every engine goes through the result cache, like run_sjf/run_srtf
+ENGINES = {
+    'SJF': run_sjf,
+    'SRTF': run_srtf,
+    'FCFS': cached('fcfs', simulate_fcfs),
+    'Round Robin': cached('rr', simulate_round_robin),
+    'Priority': cached('priority', simulate_priority),
+    'MLFQ': cached('mlfq', simulate_mlfq),
+}
+
+# policies that can also run on several cores
+SMP_ENGINES = {
+    'SJF': cached('sjf_smp', simulate_sjf_smp),
+    'SRTF': cached('srtf_smp', simulate_srtf_smp),
+    'FCFS': cached('fcfs_smp', simulate_fcfs_smp),
+}
+
+
+def compute_schedules(tasks_text, burst_times_text, policies, quantum_text, priorities_text, cores_text, profile,
+                      progress):
+    # runs on the worker thread: validation errors are raised and shown by RunControls
+    with profile.phase('parse'):
+        tasks = tasks_text.split(',')
+        try:
+            burst_times = [int(time.strip()) for time in burst_times_text.split(',')]
+        except ValueError:
+            raise ValueError("Invalid input. Please enter numbers for burst times.")
+
+    if not all(tasks) or not all(burst_times):
+        raise ValueError("All input fields must be non-empty.")
+
+    if len(tasks) != len(burst_times):
+        raise ValueError("Number of tasks and burst times must be the same.")
+
+    try:
+        quantum = int(quantum_text)
+    except ValueError:
+        raise ValueError("Invalid input. Please enter a number for the time quantum.")
+    if quantum <= 0:
+        raise ValueError("The time quantum must be positive.")
+
+    priorities = None
+    if priorities_text.strip():
+        try:
+            priorities = [int(priority.strip()) for priority in priorities_text.split(',')]
+        except ValueError:
+            raise ValueError("Invalid input. Please enter numbers for priorities.")
+        if len(priorities) != len(tasks):
+            raise ValueError("Number of tasks and priorities must be the same.")
+
+    try:
+        cores = int(cores_text)
+    except ValueError:
+        raise ValueError("Invalid input. Please enter a number for the cores.")
+    if cores <= 0:
+        raise ValueError("The number of cores must be positive.")
+    for name in policies:
+        if cores > 1 and name not in SMP_ENGINES:
+            raise ValueError(f"{name} runs on a single core; choose {', '.join(SMP_ENGINES)} for more cores.")
+
+    # re-running an unchanged workload is answered from the result cache
+    schedules = []
+    for k, name in enumerate(policies):
+        params = {}
+        engine = ENGINES[name]
+        if cores > 1:
+            engine = SMP_ENGINES[name]
+            params['cores'] = cores
+        if name == 'Round Robin':
+            params['quantum'] = quantum
+        elif name == 'Priority':
+            params['priorities'] = priorities
+        if name != 'FCFS':
+            params['progress'] = lambda fraction, k=k: progress((k + fraction) / len(policies))
+        with profile.phase('schedule'):
+            segments = engine(burst_times, **params)
+        profile.count_schedule(segments)
+        schedules.append((name, segments))
+    return tasks, burst_times, cores, schedules
 
 class SchedulerApp:
     def __init__(self, root):
@@ -11,21 +99,32 @@ class SchedulerApp:
 
         self.tasks = []
         self.burst_times = []
+        self.profile = None
 
         self.main_frame = ttk.Frame(self.root, padding="10")
         self.main_frame.grid(column=0, row=0, sticky=(tk.W, tk.E, tk.N, tk.S))
 
         self.create_input_widgets()
 
-        self.gantt_canvas_sjf = FigureCanvasTkAgg(self.create_gantt_chart(), master=self.main_frame)
-        self.gantt_canvas_sjf.get_tk_widget().grid(column=0, row=3, pady=10)
-        self.gantt_canvas_srtf = FigureCanvasTkAgg(self.create_gantt_chart(), master=self.main_frame)
-        self.gantt_canvas_srtf.get_tk_widget().grid(column=1, row=3, pady=10)
+        self.gantt_canvas_left = self.create_gantt_chart()
+        self.gantt_canvas_left.get_tk_widget().grid(column=0, row=6, pady=10)
+        self.gantt_canvas_right = self.create_gantt_chart()
+        self.gantt_canvas_right.get_tk_widget().grid(column=1, row=6, pady=10)
 
         self.create_table()
 
-        self.start_button = ttk.Button(self.main_frame, text="Generate Gantt Charts", command=self.generate_gantt_charts)
-        self.start_button.grid(column=0, row=4, columnspan=2, pady=10)
+        # tail percentiles of the schedule under each table
+        self.summary_left = ttk.Label(self.main_frame, wraplength=500)
+        self.summary_left.grid(column=0, row=9, sticky=tk.W)
+        self.summary_right = ttk.Label(self.main_frame, wraplength=500)
+        self.summary_right.grid(column=1, row=9, sticky=tk.W)
+
+        self.controls = RunControls(self.main_frame, text="Generate Gantt Charts", command=self.generate_gantt_charts)
+        self.controls.grid(column=0, row=7, columnspan=2, pady=10)
+        self.start_button = self.controls.start_button
+
+        self.status = StatusBar(self.main_frame)
+        self.status.grid(column=0, row=10, columnspan=2, sticky=(tk.W, tk.E))
 
     def create_input_widgets(self):
         ttk.Label(self.main_frame, text="Tasks (comma-separated):").grid(column=0, row=0, pady=5, padx=5, sticky=tk.W)
@@ -36,129 +135,85 @@ class SchedulerApp:
         self.burst_times_entry = ttk.Entry(self.main_frame, width=30)
         self.burst_times_entry.grid(column=1, row=1, pady=5, padx=5, sticky=tk.W)
 
+        ttk.Label(self.main_frame, text="Priorities (optional, lower runs first):").grid(column=0, row=2, pady=5, padx=5, sticky=tk.W)
+        self.priorities_entry = ttk.Entry(self.main_frame, width=30)
+        self.priorities_entry.grid(column=1, row=2, pady=5, padx=5, sticky=tk.W)
+
+        ttk.Label(self.main_frame, text="Time Quantum (Round Robin):").grid(column=0, row=3, pady=5, padx=5, sticky=tk.W)
+        self.quantum_entry = ttk.Entry(self.main_frame, width=30)
+        self.quantum_entry.insert(0, "4")
+        self.quantum_entry.grid(column=1, row=3, pady=5, padx=5, sticky=tk.W)
+
+        ttk.Label(self.main_frame, text="Cores (FCFS, SJF, SRTF):").grid(column=0, row=4, pady=5, padx=5, sticky=tk.W)
+        self.cores_entry = ttk.Entry(self.main_frame, width=30)
+        self.cores_entry.insert(0, "1")
+        self.cores_entry.grid(column=1, row=4, pady=5, padx=5, sticky=tk.W)
+
+        # the two panels compare any pair of policies; SJF against SRTF by default
+        self.policy_left = ttk.Combobox(self.main_frame, values=list(ENGINES), state='readonly')
+        self.policy_left.set('SJF')
+        self.policy_left.grid(column=0, row=5, pady=5)
+        self.policy_right = ttk.Combobox(self.main_frame, values=list(ENGINES), state='readonly')
+        self.policy_right.set('SRTF')
+        self.policy_right.grid(column=1, row=5, pady=5)
+
     def create_gantt_chart(self):
-        fig = Figure(figsize=(8, 4), tight_layout=True)
-        ax = fig.add_subplot(111)
-        return fig
+        # matplotlib is only imported once the first chart is drawn
+        return LazyCanvas(self.main_frame, figsize=(8, 4), tight_layout=True)
 
     def create_table(self):
-        self.tree_sjf = ttk.Treeview(self.main_frame, columns=('Task', 'Burst Time', 'Turnaround Time', 'Waiting Time'), show='headings')
-        self.tree_sjf.heading('Task', text='Task')
-        self.tree_sjf.heading('Burst Time', text='Burst Time')
-        self.tree_sjf.heading('Turnaround Time', text='Turnaround Time')
-        self.tree_sjf.heading('Waiting Time', text='Waiting Time')
-        self.tree_sjf.grid(column=0, row=5, pady=10)
+        self.tree_left = VirtualTable(self.main_frame, columns=('Task', 'Burst Time', 'Turnaround Time', 'Waiting Time'))
+        self.tree_left.grid(column=0, row=8, pady=10)
         
-        self.tree_srtf = ttk.Treeview(self.main_frame, columns=('Task', 'Burst Time', 'Turnaround Time', 'Waiting Time'), show='headings')
-        self.tree_srtf.heading('Task', text='Task')
-        self.tree_srtf.heading('Burst Time', text='Burst Time')
-        self.tree_srtf.heading('Turnaround Time', text='Turnaround Time')
-        self.tree_srtf.heading('Waiting Time', text='Waiting Time')
-        self.tree_srtf.grid(column=1, row=5, pady=10)
+        self.tree_right = VirtualTable(self.main_frame, columns=('Task', 'Burst Time', 'Turnaround Time', 'Waiting Time'))
+        self.tree_right.grid(column=1, row=8, pady=10)
 
     def generate_gantt_charts(self):
-        self.clear_gantt_charts()
+        policies = (self.policy_left.get(), self.policy_right.get())
+        self.profile = Profile()
+        self.controls.submit(compute_schedules, self.tasks_entry.get(), self.burst_times_entry.get(), policies,
+                             self.quantum_entry.get(), self.priorities_entry.get(), self.cores_entry.get(),
+                             self.profile, on_done=self.show_schedules)
 
-        tasks = self.tasks_entry.get().split(',')
-        burst_times_str = self.burst_times_entry.get().split(',')
-
-        try:
-            self.tasks = tasks
-            self.burst_times = [int(time.strip()) for time in burst_times_str]
-        except ValueError:
-            messagebox.showerror("Error", "Invalid input. Please enter numbers for burst times.")
-            return
-
-        if not all(self.tasks) or not all(self.burst_times):
-            messagebox.showerror("Error", "All input fields must be non-empty.")
-            return
-
-        if len(self.tasks) != len(self.burst_times):
-            messagebox.showerror("Error", "Number of tasks and burst times must be the same.")
-            return
-
-        self.run_sjf()
-        self.run_srtf()
-
-    def run_sjf(self):
-        current_time = 0
-        remaining_burst_times = self.burst_times.copy()
-        tasks_completed = 0
-        gantt_chart_data = []
-
-        while tasks_completed < len(self.tasks):
-            remaining_tasks = [(i, burst_time) for i, burst_time in enumerate(remaining_burst_times) if burst_time > 0]
-            shortest_task_index, shortest_burst_time = min(remaining_tasks, key=lambda x: x[1])
-            task = self.tasks[shortest_task_index]
-            gantt_chart_data.append((current_time, task))
-            current_time += 1
-            remaining_burst_times[shortest_task_index] -= 1
-
-            if remaining_burst_times[shortest_task_index] == 0:
-                tasks_completed += 1
-
-        self.plot_gantt_chart(gantt_chart_data, self.gantt_canvas_sjf)
-        self.update_table(gantt_chart_data, self.tree_sjf)
-
-    def run_srtf(self):
-        current_time = 0
-        remaining_burst_times = self.burst_times.copy()
-        tasks_completed = 0
-        gantt_chart_data = []
-
-        while tasks_completed < len(self.tasks):
-            remaining_tasks = [(i, burst_time) for i, burst_time in enumerate(remaining_burst_times) if burst_time > 0]
-            shortest_task_index, shortest_burst_time = min(remaining_tasks, key=lambda x: x[1])
-            task = self.tasks[shortest_task_index]
-            gantt_chart_data.append((current_time, task))
-            current_time += 1
-            remaining_burst_times[shortest_task_index] -= 1
-
-            if remaining_burst_times[shortest_task_index] == 0:
-                tasks_completed += 1
-
-        self.plot_gantt_chart(gantt_chart_data, self.gantt_canvas_srtf)
-        self.update_table(gantt_chart_data, self.tree_srtf)
-
-    def plot_gantt_chart(self, gantt_chart_data, canvas):
-        ax = canvas.figure.add_subplot(111)
-        gantt_colors = {task: self.get_random_color() for _, task in gantt_chart_data}
-        prev_task = None
-        for time, task in gantt_chart_data:
-            if task != prev_task:
-                ax.barh(task, width=1, left=time, color=gantt_colors[task], label=task)
-            else:
-                ax.barh(task, width=1, left=time, color=gantt_colors[task])
-            prev_task = task
-
-        ax.set_xlabel('Time')
-        ax.set_title('Gantt Chart')
-        ax.legend(loc='upper right')
+    def show_schedules(self, result):
+        self.clear_gantt_charts()
+        self.tasks, self.burst_times, cores, schedules = result
+        panels = ((self.gantt_canvas_left, self.tree_left, self.summary_left),
+                  (self.gantt_canvas_right, self.tree_right, self.summary_right))
+
+        for (name, segments), (canvas, tree, summary) in zip(schedules, panels):
+            title = f"{name} Gantt Chart"
+            if isinstance(segments, CoreSegmentList):
+                utilization = core_utilization(segments, cores)
+                title += f" ({cores} cores, {sum(utilization) / cores:.0%} busy)"
+            with self.profile.phase('draw'):
+                self.plot_gantt_chart(segments, canvas, title)
+            tree.profile = self.profile
+            with self.profile.phase('table'):
+                self.update_table(segments, tree)
+            with self.profile.phase('metrics'):
+                summary['text'] = format_summary(describe_schedule(segments, self.burst_times, cores=cores))
+        self.status.show_profile(self.profile)
+
+    def plot_gantt_chart(self, segments, canvas, title='Gantt Chart'):
+        from scheduler.gantt import plot_gantt
+
+        ax = canvas.figure.gca()
+        # multi-core schedules get one lane per core
+        plot_gantt(ax, self.tasks, segments, title, cores=getattr(segments, 'cores', None), profile=self.profile)
         canvas.draw()
 
-    def get_random_color(self):
-        return "#{:06x}".format(random.randint(0, 0xFFFFFF))
-
     def clear_gantt_charts(self):
-        self.gantt_canvas_sjf.figure.clear()
-        self.gantt_canvas_sjf.draw()
-        self.gantt_canvas_srtf.figure.clear()
-        self.gantt_canvas_srtf.draw()
-
-    def update_table(self, gantt_chart_data, tree):
-        for item in tree.get_children():
-            tree.delete(item)
-
-        task_completion_times = {}
-        for time, task in gantt_chart_data:
-            if task not in task_completion_times:
-                task_completion_times[task] = time
-
-        for task in self.tasks:
-            finish_time = task_completion_times.get(task, 0)
-            turnaround_time = finish_time
-            waiting_time = turnaround_time - self.burst_times[self.tasks.index(task)]
-            tree.insert('', 'end', values=(task, self.burst_times[self.tasks.index(task)], turnaround_time, waiting_time))
+        for canvas in (self.gantt_canvas_left, self.gantt_canvas_right):
+            # a chart that was never drawn has nothing to clear
+            if canvas.loaded:
+                canvas.figure.clear()
+                canvas.draw()
+
+    def update_table(self, segments, tree):
+        # every task arrives at 0, so turnaround is the finish time of its last run
+        metrics = task_arrays(segments, self.burst_times)
+        tree.set_data([self.tasks, self.burst_times, metrics['turnaround'], metrics['waiting']])
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -1,8 +1,35 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import random
+from tkinter import ttk
+
+from scheduler.incremental import reschedule
+from scheduler.metrics import describe_schedule, format_summary
+from scheduler.profiling import Profile
+from scheduler.tkcanvas import LazyCanvas
+from scheduler.tkrunner import RunControls, StatusBar
+from scheduler.vtable import VirtualTable
+
+
+def compute_schedule(tasks_text, durations_text, previous_tasks, previous, profile, progress):
+    # Runs on the worker thread: parse, validate and schedule without touching Tk
+    with profile.phase('parse'):
+        tasks = tasks_text.split(',')
+        durations = [int(duration.strip()) if duration.strip() else 0 for duration in durations_text.split(',')]
+
+    if not all(tasks) or not all(durations):
+        raise ValueError("All input fields must be non-empty.")
+
+    if len(tasks) != len(durations):
+        raise ValueError("Number of tasks and durations must be the same.")
+
+    progress(0.25)
+    # tasks run back to back, so the chart is the FCFS schedule; when only some
+    # durations changed the previous schedule is shifted instead of rebuilt
+    if tasks != previous_tasks:
+        previous = None
+    with profile.phase('schedule'):
+        schedule, changed = reschedule(previous, durations, policy='fcfs')
+    profile.count_schedule(schedule.segments())
+    return tasks, durations, schedule, changed
 
 class GanttChartApp:
     def __init__(self, root):  # Correcting the initialization method name
@@ -13,6 +40,10 @@ class GanttChartApp:
         self.start_times = []
         self.durations = []
         self.finish_times = []
+        self.schedule = None
+        self.renderer = None
+        self.replay_window = None
+        self.profile = None
 
         # Create a frame for the GUI
         self.main_frame = ttk.Frame(self.root, padding="10")
@@ -22,15 +53,24 @@ class GanttChartApp:
         self.create_input_widgets()
 
         # Create a canvas to display the Gantt chart
-        self.gantt_canvas = FigureCanvasTkAgg(self.create_gantt_chart(), master=self.main_frame)
+        self.gantt_canvas = self.create_gantt_chart()
         self.gantt_canvas.get_tk_widget().grid(column=0, row=4, columnspan=3, pady=10)
 
         # Create a table to display waiting time and turnaround time
         self.create_table()
 
-        # Create a button to start the animation
-        self.start_button = ttk.Button(self.main_frame, text="Generate Gantt Chart", command=self.generate_gantt_chart)
-        self.start_button.grid(column=0, row=5, columnspan=3, pady=10)
+        # Create a button to start the animation, plus Cancel and a progress bar for long runs
+        self.controls = RunControls(self.main_frame, text="Generate Gantt Chart", command=self.generate_gantt_chart)
+        self.controls.grid(column=0, row=5, columnspan=3, pady=10)
+        self.start_button = self.controls.start_button
+
+        # Tail percentiles, utilization and throughput of the schedule
+        self.summary = ttk.Label(self.main_frame)
+        self.summary.grid(column=0, row=7, columnspan=3, sticky=tk.W)
+
+        # Timings and counts of the last run
+        self.status = StatusBar(self.main_frame)
+        self.status.grid(column=0, row=8, columnspan=3, sticky=(tk.W, tk.E))
 
     def create_input_widgets(self):
         ttk.Label(self.main_frame, text="Tasks (comma-separated):").grid(column=0, row=1, pady=5, padx=5, sticky=tk.W)
@@ -41,87 +81,72 @@ class GanttChartApp:
         self.durations_entry = ttk.Entry(self.main_frame, width=30)
         self.durations_entry.grid(column=1, row=2, pady=5, padx=5, sticky=tk.W)
 
+        # Replays the last schedule with a moving cursor and the ready queue
+        self.replay_button = ttk.Button(self.main_frame, text="Replay", command=self.open_replay, state='disabled')
+        self.replay_button.grid(column=1, row=3, pady=5, padx=5, sticky=tk.W)
+
     def create_gantt_chart(self):
-        fig = Figure(figsize=(8, 4), tight_layout=True)
-        ax = fig.add_subplot(111)
-        return fig
+        # matplotlib is only imported once the first chart is drawn
+        return LazyCanvas(self.main_frame, figsize=(8, 4), tight_layout=True)
 
     def create_table(self):
         # Create a treeview widget for the table
-        self.tree = ttk.Treeview(self.main_frame, columns=('Task', 'Waiting Time', 'Turnaround Time'), show='headings')
-        self.tree.heading('Task', text='Task')
-        self.tree.heading('Waiting Time', text='Waiting Time')
-        self.tree.heading('Turnaround Time', text='Turnaround Time')
+        self.tree = VirtualTable(self.main_frame, columns=('Task', 'Waiting Time', 'Turnaround Time'))
         self.tree.grid(column=0, row=6, columnspan=3, pady=10)
 
     def generate_gantt_chart(self):
-        self.clear_gantt_chart()
-
-        # Get user input for tasks and durations
-        tasks = self.tasks_entry.get().split(',')
-        durations_str = self.durations_entry.get().split(',')
-
-        # Clean and validate input
-        durations = [int(duration.strip()) if duration.strip() else 0 for duration in durations_str]
-
-        if not all(tasks) or not all(durations):
-            messagebox.showerror("Error", "All input fields must be non-empty.")
-            return
-
-        if len(tasks) != len(durations):
-            messagebox.showerror("Error", "Number of tasks and durations must be the same.")
-            return
-
-        self.tasks = tasks
-        self.durations = durations
-
-        self.finish_times = self.calculate_finish_times()
-
-        # Plot Gantt chart bars
-        for i, task in enumerate(self.tasks):
-            self.gantt_canvas.figure.gca().barh(task, width=self.durations[i], left=self.finish_times[i - 1] if i > 0 else 0,
-                                                 color=self.get_random_color())
-
-        # Set labels and title
-        self.gantt_canvas.figure.gca().set_xlabel('Time')
-        self.gantt_canvas.figure.gca().set_title('Gantt Chart')
-
-        self.update_table()
-
-        self.gantt_canvas.draw()
-
-    def calculate_finish_times(self):
-        finish_times = [0]
-        for i in range(len(self.durations)):
-            finish_times.append(finish_times[-1] + self.durations[i])
-        return finish_times[1:]
-
-    def get_random_color(self):
-        return "#{:06x}".format(random.randint(0, 0xFFFFFF))
+        # Get user input for tasks and durations; parsing and scheduling run in the background
+        self.profile = Profile()
+        self.controls.submit(compute_schedule, self.tasks_entry.get(), self.durations_entry.get(),
+                             self.tasks, self.schedule, self.profile, on_done=self.show_schedule)
+
+    def show_schedule(self, result):
+        self.tasks, self.durations, self.schedule, changed = result
+        # Tasks run in input order, so waiting time is the start and turnaround the finish
+        self.start_times, self.finish_times = self.schedule.starts, self.schedule.finishes
+
+        self.tree.profile = self.profile
+        if changed is None or self.renderer is None:
+            from scheduler.gantt import plot_gantt
+
+            self.clear_gantt_chart()
+
+            # Plot Gantt chart bars
+            with self.profile.phase('draw'):
+                self.renderer = plot_gantt(self.gantt_canvas.figure.gca(), self.tasks, self.schedule.segments(),
+                                           row_per_segment=True, profile=self.profile)
+
+            with self.profile.phase('table'):
+                self.update_table(self.start_times, self.finish_times)
+
+            with self.profile.phase('draw'):
+                self.gantt_canvas.draw()
+        elif changed.stop > changed.start:
+            # Only the tasks from the first edited duration onward moved
+            self.renderer.profile = self.profile
+            with self.profile.phase('patch'):
+                self.renderer.patch(changed.start, self.start_times[changed], self.finish_times[changed])
+                self.tree.patch(changed.start, [None, self.start_times[changed], self.finish_times[changed]])
+            self.gantt_canvas.draw_idle()
+        with self.profile.phase('metrics'):
+            self.summary['text'] = format_summary(describe_schedule(self.schedule.segments(), self.durations))
+        self.replay_button.configure(state='normal')
+        self.status.show_profile(self.profile)
+
+    def open_replay(self):
+        # matplotlib is already loaded by now, but the replay module is only needed here
+        from scheduler.tkreplay import ReplayWindow
+
+        self.replay_window = ReplayWindow(tk.Toplevel(self.root), self.tasks, self.schedule.segments(),
+                                          self.durations, title="Replay")
 
     def clear_gantt_chart(self):
         # Clear previous Gantt chart bars
-        for patch in self.gantt_canvas.figure.gca().patches:
-            patch.remove()
-
-    def update_table(self):
-        # Clear previous table data
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        waiting_times, turnaround_times = self.calculate_waiting_and_turnaround_times()
-
-        # Update table with new data
-        for i, task in enumerate(self.tasks):
-            self.tree.insert('', 'end', values=(task, waiting_times[i], turnaround_times[i]))
-
-    def calculate_waiting_and_turnaround_times(self):
-        waiting_times = [0]
-        turnaround_times = [self.durations[0]]
-        for i in range(1, len(self.durations)):
-            waiting_times.append(turnaround_times[i - 1])
-            turnaround_times.append(waiting_times[i] + self.durations[i])
-        return waiting_times, turnaround_times
+        self.gantt_canvas.figure.gca().clear()
+
+    def update_table(self, waiting_times, turnaround_times):
+        # Only the visible rows are materialized; the table keeps the columns
+        self.tree.set_data([self.tasks, waiting_times, turnaround_times])
 
 if __name__ == "__main__":  # Correcting the condition to check if the script is executed directly
     root = tk.Tk()
@@ -0,0 +1,50 @@
+import pytest
+
+from scheduler.importer import ImportReport, csv_columns, import_trace, parse_csv_chunk, parse_csv_lines
+from scheduler.stream import read_jobs
+
+HEADER = b"task,arrival,burst,priority\n"
+
+
+def parse_both(rows):
+    columns, width = csv_columns(HEADER)
+    results = []
+    for parse in (parse_csv_lines, lambda *a: parse_csv_chunk(*a, width)):
+        report = ImportReport()
+        tasks, arrivals, bursts, priorities = parse(rows, 2, report, columns)
+        results.append(((list(tasks), list(arrivals), list(bursts), list(priorities)),
+                        (report.jobs, report.skipped, report.malformed)))
+    return results
+
+
+def test_csv_skips_non_positive_bursts_and_negative_arrivals():
+    lines_result, chunk_result = parse_both(b"A,0,5,1\nB,3,0,1\nC,-1,4,1\nD,2,-3,1\nE,4,6,2\n")
+    assert lines_result == chunk_result
+    columns, counts = lines_result
+    assert columns == (['A', 'E'], [0, 4], [5, 6], [1, 2])
+    assert counts == (2, 3, 0)
+
+
+@pytest.mark.parametrize('row', [b"B,1,12345678901234567890,1", b"B,1,4,99999999999999999999", b"\xff\xfe,1,3,1"])
+def test_csv_reports_unusable_fields_as_malformed(row):
+    lines_result, chunk_result = parse_both(b"A,0,5,1\n" + row + b"\nC,2,4,1\n")
+    assert lines_result == chunk_result
+    columns, counts = lines_result
+    assert columns[0] == ['A', 'C']
+    assert counts == (2, 0, 1)
+
+
+def test_import_trace_skips_bad_csv_rows(tmp_path):
+    path = tmp_path / 'trace.csv'
+    path.write_bytes(HEADER + b"A,0,5,1\nB,3,0,1\nC,2,123456789012345678901,1\nD,4,6,2\n")
+    report = ImportReport(str(path))
+    workload = import_trace(str(path), report)
+    assert list(workload.burst_times) == [5, 6]
+    assert (report.jobs, report.skipped, report.malformed) == (2, 1, 1)
+
+
+def test_stream_csv_skips_non_positive_bursts_and_negative_arrivals():
+    report = ImportReport()
+    jobs = list(read_jobs(["task,arrival,burst\n", "A,0,5\n", "B,3,-2\n", "C,-1,4\n", "D,4,6\n"], report))
+    assert jobs == [('A', 0, 5), ('D', 4, 6)]
+    assert (report.jobs, report.skipped) == (2, 2)
@@ -0,0 +1,22 @@
+import pytest
+
+from scheduler.core import simulate_mlfq, simulate_round_robin
+from scheduler.predict import simulate_psjf
+from scheduler.sweep import check_params
+
+
+def test_check_params_converts_to_the_defaults_types():
+    assert check_params(simulate_mlfq, {'quanta': 4, 'cores': 2}) == {'quanta': (4,)}
+    assert check_params(simulate_mlfq, {'quanta': [2, 4], 'boost': 10}) == {'quanta': (2, 4), 'boost': 10}
+    assert check_params(simulate_psjf, {'alpha': 1}) == {'alpha': 1.0}
+
+
+@pytest.mark.parametrize('engine, params', [
+    (simulate_round_robin, {'quantum': 'a'}),
+    (simulate_round_robin, {'quantum': 2.5}),
+    (simulate_mlfq, {'quanta': (2, 'a')}),
+    (simulate_psjf, {'alpha': 'high'}),
+])
+def test_check_params_rejects_wrong_types(engine, params):
+    with pytest.raises(ValueError):
+        check_params(engine, params)
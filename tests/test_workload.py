@@ -0,0 +1,34 @@
+import json
+
+import pytest
+
+from scheduler.cli import main
+from scheduler.workload import load_workload
+
+
+def test_csv_rejects_zero_burst(tmp_path):
+    path = tmp_path / 'jobs.csv'
+    path.write_text("task,arrival,burst\nA,0,3\nB,1,0\n")
+    with pytest.raises(ValueError, match="line 3: burst time must be positive, got 0"):
+        load_workload(str(path))
+
+
+def test_json_columns_reject_zero_burst(tmp_path):
+    path = tmp_path / 'jobs.json'
+    path.write_text(json.dumps({'tasks': ['A', 'B'], 'burst_times': [2, 0]}))
+    with pytest.raises(ValueError, match="job 2: burst time must be positive"):
+        load_workload(str(path))
+
+
+def test_json_records_reject_negative_burst(tmp_path):
+    path = tmp_path / 'jobs.json'
+    path.write_text(json.dumps([{'task': 'A', 'burst': 2}, {'task': 'B', 'burst': -1}]))
+    with pytest.raises(ValueError, match="job 2: burst time must be positive, got -1"):
+        load_workload(str(path))
+
+
+def test_cli_reports_zero_burst_as_load_error(tmp_path, capsys):
+    path = tmp_path / 'jobs.csv'
+    path.write_text("task,arrival,burst\nA,0,3\nB,1,0\n")
+    assert main([str(path), '-a', 'srtf', 'priority', 'mlfq', '-o', str(tmp_path)]) == 1
+    assert "burst time must be positive" in capsys.readouterr().err